@@ -1,15 +1,14 @@
 
 import streamlit as st
 import pandas as pd
-import numpy as np
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent / "utils"))
 
-from utils.data_loader import load_data, get_available_years
-from utils.preprocessing import preprocess_financial_data, calculate_financial_metrics
+from utils.data_loader import get_available_years, get_default_year_index
+from utils.cube import get_cube
 from utils.styling import (
     format_currency, format_percentage, create_metric_card,
     plot_bar_chart, plot_pie_chart, format_table_currency
@@ -27,33 +26,38 @@ EXPENSE_TYPES = [
 def balanco_view():
     st.header("📊 Balanço Financeiro")
 
-    anos = sorted(get_available_years(), key=lambda x: int(x))
-    ano = st.selectbox("🗓️ Selecione o ano", anos, index=min(1, len(anos)-1))
+    anos = get_available_years()
+    ano = st.selectbox("🗓️ Selecione o ano", anos, index=get_default_year_index(anos))
 
     try:
-        df = preprocess_financial_data(load_data(ano))
+        # Cubo pré-agregado do ano: as somas abaixo não percorrem os lançamentos
+        cube = get_cube(ano)
 
-        if 'Conta' not in df.columns or 'Valor' not in df.columns:
+        if 'Conta' not in cube.dimensions:
             st.error("Colunas obrigatórias ausentes: Conta, Valor")
             return
 
-        df['Conta'] = df['Conta'].astype(str).str.strip().str.title()
-        df['GASTOS'] = df['GASTOS'].astype(str).str.strip().str.title()
+        # Lançamentos das contas de medição são receitas; os demais, despesas
+        def is_receita(conta):
+            return conta.astype(str).str.contains("Medição", case=False, na=False)
 
-        df['Receita'] = np.where(df['Conta'].str.contains("Medição", case=False, na=False), df['Valor'], 0)
-        df['Valor'] = np.where(~df['Conta'].str.contains("Medição", case=False, na=False), df['Valor'], 0)
+        def is_despesa(conta):
+            return ~is_receita(conta)
 
-        df['Receita'] = pd.to_numeric(df['Receita'], errors='coerce').fillna(0)
-        df['Valor'] = pd.to_numeric(df['Valor'], errors='coerce').fillna(0)
+        total_receitas = cube.sum(where={'Conta': is_receita})
 
-        total_receitas = df['Receita'].sum()
-        df_despesas = df[df['GASTOS'].isin(EXPENSE_TYPES)]
-        total_despesas = df_despesas['Valor'].sum()
+        # Tipos de despesa presentes no ano, inclusive os que só aparecem em contas de medição
+        tipos = cube.sum('GASTOS', where={'GASTOS': EXPENSE_TYPES}).index
+        despesas_por_tipo = cube.sum(
+            'GASTOS', where={'GASTOS': EXPENSE_TYPES, 'Conta': is_despesa}
+        ).reindex(tipos, fill_value=0)
+
+        total_despesas = despesas_por_tipo.sum()
         balanco = total_receitas - total_despesas
         margem_lucro = (balanco / total_receitas * 100) if total_receitas > 0 else 0
 
-        despesas_fixas = df_despesas[df_despesas['GASTOS'] == "Fixo"]['Valor'].sum()
-        despesas_variaveis = df_despesas[df_despesas['GASTOS'] == "Variável"]['Valor'].sum()
+        despesas_fixas = despesas_por_tipo.get("Fixo", 0)
+        despesas_variaveis = despesas_por_tipo.get("Variável", 0)
 
         margem_contrib = (total_receitas - despesas_variaveis) / total_receitas if total_receitas > 0 else 0
         ponto_eq = despesas_fixas / margem_contrib if margem_contrib > 0 else 0
@@ -79,7 +83,7 @@ def balanco_view():
         st.plotly_chart(fig, use_container_width=True)
 
         st.markdown("## 🧾 Distribuição das Despesas")
-        df_pizza = df_despesas.groupby('GASTOS')['Valor'].sum().reset_index()
+        df_pizza = despesas_por_tipo.reset_index()
         fig = plot_pie_chart(df_pizza, values="Valor", names="GASTOS", title="Tipos de Despesas")
         st.plotly_chart(fig, use_container_width=True)
 
@@ -98,9 +102,10 @@ def balanco_view():
         st.markdown("## 🧠 Indicadores Estratégicos")
         st.info("📊 *Métricas para decisões de investimento e avaliação de performance financeira.*")
 
-        investimento_total = df_despesas[df_despesas['GASTOS'] == "Investimento"]['Valor'].sum()
+        investimento_total = despesas_por_tipo.get("Investimento", 0)
         roi = (balanco / investimento_total) * 100 if investimento_total > 0 else 0
-        lucro_mensal = df.groupby('Mes')['Receita'].sum().mean()
+        receita_mensal = cube.sum('Mes', where={'Conta': is_receita}).reindex(cube.sum('Mes').index, fill_value=0)
+        lucro_mensal = receita_mensal.mean()
         payback = investimento_total / lucro_mensal if lucro_mensal > 0 else 0
         ebitda = total_receitas - (despesas_fixas + despesas_variaveis)
 
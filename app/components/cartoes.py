@@ -8,30 +8,16 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent / "utils"))
 
-from utils.data_loader import load_data
-from utils.preprocessing import preprocess_financial_data, calculate_financial_metrics
+from utils.data_loader import get_available_years, get_default_year_index
+from utils.cards import get_card_transactions, get_card_spend, get_card_table_index
+from utils.audit import get_card_audit, MAD_THRESHOLD, MIN_HISTORY
 from utils.styling import (
-    format_currency, format_percentage, create_metric_card,
-    plot_bar_chart, plot_pie_chart, plot_line_chart, format_table_currency
+    format_percentage, create_metric_card,
+    plot_bar_chart, plot_pie_chart, plot_line_chart, format_table_currency, paginated_table,
+    export_button
 )
 from config import COLORS, MONTHS
 
-# Add these month mappings at the top of the file after imports
-MONTH_MAP = {
-    'January': 'Janeiro',
-    'February': 'Fevereiro',
-    'March': 'Março',
-    'April': 'Abril',
-    'May': 'Maio',
-    'June': 'Junho',
-    'July': 'Julho',
-    'August': 'Agosto',
-    'September': 'Setembro',
-    'October': 'Outubro',
-    'November': 'Novembro',
-    'December': 'Dezembro'
-}
-
 def validate_cartoes_data(df):
     """Validates corporate card data requirements"""
     required_columns = ['Usuário', 'Conta', 'Valor', 'Data']
@@ -52,41 +38,29 @@ def cartoes_view():
     st.header("💳 Cartões Corporativos")
     
     # Seletor de ano
-    available_years = [2023, 2024, 2025]
-    selected_year = st.selectbox("Selecione o ano", available_years, index=1)  # 2024 como padrão
+    available_years = get_available_years()
+    selected_year = st.selectbox("Selecione o ano", available_years, index=get_default_year_index(available_years))
     
     try:
-        # Carrega e processa os dados
-        df = load_data(selected_year)
-        df_processed = preprocess_financial_data(df)
+        # Apenas despesas com cartões (valores numéricos na coluna 'Conta'): consulta
+        # com filtro em Cartão e só as colunas usadas na página, executada uma vez
+        # enquanto os arquivos do ano não mudam (ver cards.get_card_transactions)
+        df_cartoes_ano = get_card_transactions(selected_year)
+        df_cartoes = df_cartoes_ano
         
-        # Add validation
-        if not validate_cartoes_data(df_processed):
+        if df_cartoes.empty:
+            st.warning("Não há registros de cartões corporativos para este ano.")
             return
         
-        # Verifica se há dados de cartões (coluna Conta)
-        if 'Usuário' not in df_processed.columns or 'Conta' not in df_processed.columns:
-            st.warning("Este conjunto de dados não contém informações de cartões corporativos.")
+        # Add validation
+        if not validate_cartoes_data(df_cartoes):
             return
         
-        # Função para verificar se o valor é numérico
-        def is_numeric(val):
-            try:
-                # Tenta converter para float e verifica se é um número
-                float(val)
-                return True
-            except (ValueError, TypeError):
-                return False
-        
-        # Filtra apenas despesas com cartões (valores numéricos na coluna 'Conta')
-        df_cartoes = df_processed[df_processed['Conta'].apply(is_numeric)]
-        
-        if df_cartoes.empty:
-            st.warning("Não há registros de cartões corporativos para este ano.")
-            return
+        # Matriz de gastos por funcionário × mês × categoria (uma por recorte de cartão)
+        card_spend = get_card_spend(selected_year)
         
         # Obtém lista de funcionários
-        usuarios = df_cartoes['Usuário'].unique().tolist()
+        usuarios = card_spend.users.tolist()
         
         # Layout em colunas para filtros
         col1, col2 = st.columns(2)
@@ -103,20 +77,10 @@ def cartoes_view():
                 selected_usuario = usuarios
         
         with col2:
-            # Verifica qual coluna usar para meses (Mes ou Mês Ano)
-            mes_column = 'Mês Ano' if 'Mês Ano' in df_cartoes.columns else 'Mes'
-            
-            if mes_column in df_cartoes.columns:
-                # Extrai o mês de 'Mês Ano' se necessário
-                if mes_column == 'Mês Ano':
-                    # Supondo que 'Mês Ano' seja algo como "Janeiro 2024"
-                    df_cartoes['Mes'] = df_cartoes[mes_column].apply(
-                        lambda x: MONTHS.index(MONTH_MAP.get(x.split()[0], x.split()[0])) + 1 
-                        if isinstance(x, str) and ' ' in x else 0
-                    )
-                
-                months_in_data = sorted(df_cartoes['Mes'].unique().tolist())
-                month_names = [MONTHS[m-1] for m in months_in_data if 1 <= m <= 12]
+            # Mes (número do mês) é derivado de Data no pré-processamento
+            if 'Mes' in df_cartoes.columns:
+                months_in_data = card_spend.select().by_month()['Mes'].tolist()
+                month_names = [MONTHS[m-1] for m in months_in_data]
                 
                 selected_month = st.multiselect(
                     "Filtrar por mês:",
@@ -127,25 +91,26 @@ def cartoes_view():
                 st.warning("Dados de mês não disponíveis para filtragem.")
                 selected_month = ["Todos"]
         
-        # Aplicar filtros
-        if "Todos" not in selected_usuario:
-            df_cartoes = df_cartoes[df_cartoes['Usuário'].isin(selected_usuario)]
-        
-        if "Todos" not in selected_month and 'Mes' in df_cartoes.columns:
+        # Aplicar filtros (recortes da matriz e posições das linhas dos funcionários)
+        filtro_usuarios = None if "Todos" in selected_usuario else selected_usuario
+        filtro_meses = None
+        if "Todos" not in selected_month:
             # Converte nomes dos meses para números
-            month_numbers = [
-                MONTHS.index(MONTH_MAP.get(m, m)) + 1 
-                for m in selected_month if m != "Todos"
-            ]
-            df_cartoes = df_cartoes[df_cartoes['Mes'].isin(month_numbers)]
+            filtro_meses = [MONTHS.index(m) + 1 for m in selected_month if m != "Todos"]
+        
+        gastos = card_spend.select(filtro_usuarios, filtro_meses)
+        posicoes_filtradas = None
+        if filtro_usuarios is not None or filtro_meses is not None:
+            posicoes_filtradas = card_spend.positions(filtro_usuarios, filtro_meses)
+            df_cartoes = df_cartoes.iloc[posicoes_filtradas]
         
         # Métricas
         st.subheader("Métricas de Cartões Corporativos")
         
         # Calcula métricas de cartões
-        total_gasto = df_cartoes['Valor'].sum()
-        media_por_cartao = df_cartoes.groupby('Usuário')['Valor'].sum().mean()
-        total_transacoes = len(df_cartoes)
+        total_gasto = gastos.total()
+        media_por_cartao = gastos.by_user().mean()
+        total_transacoes = gastos.transactions()
         valor_medio_transacao = total_gasto / total_transacoes if total_transacoes > 0 else 0
         
         # Exibe métricas em cards
@@ -188,7 +153,7 @@ def cartoes_view():
             # Gráfico de gastos por funcionário
             st.subheader("Gastos por Funcionário")
             
-            df_por_Usuário = df_cartoes.groupby('Usuário')['Valor'].sum().reset_index()
+            df_por_Usuário = gastos.by_user().reset_index()
             df_por_Usuário = df_por_Usuário.sort_values('Valor', ascending=False)
             
             fig = plot_bar_chart(
@@ -205,7 +170,7 @@ def cartoes_view():
             st.subheader("Distribuição por Categoria")
             
             if 'Categoria' in df_cartoes.columns:
-                df_categorias = df_cartoes.groupby('Categoria')['Valor'].sum().reset_index()
+                df_categorias = gastos.by_category().reset_index()
                 df_categorias = df_categorias.sort_values('Valor', ascending=False)
                 
                 # Limitando para top 5 + Outros
@@ -229,16 +194,9 @@ def cartoes_view():
         st.subheader("Evolução de Gastos Mensais")
         
         if 'Mes' in df_cartoes.columns:
-            # Add transaction count to monthly analysis
-            df_mensal = df_cartoes.groupby('Mes').agg({
-                'Valor': 'sum',
-                'Usuário': 'count'  # Counts transactions
-            }).reset_index()
-            
-            df_mensal = df_mensal.rename(columns={'Usuário': 'Transações'})
-            df_mensal['Mes_Nome'] = df_mensal['Mes'].apply(
-                lambda x: MONTHS[x-1] if 1 <= x <= 12 else f'Mês {x}'
-            )
+            # Valor e número de transações por mês
+            df_mensal = gastos.by_month()
+            df_mensal['Mes_Nome'] = df_mensal['Mes'].map(dict(enumerate(MONTHS, start=1)))
             
             # Create two charts in columns
             col1, col2 = st.columns(2)
@@ -274,28 +232,25 @@ def cartoes_view():
         display_columns = ['Data', 'Usuário', 'Categoria', 'Valor', 'Descrição']
         columns_to_show = [col for col in display_columns if col in df_cartoes.columns]
         
-        # Ordenação da tabela
-        df_table = df_cartoes[columns_to_show].sort_values('Data', ascending=False)
-        
-        # Formata valores monetários
-        if 'Valor' in columns_to_show:
-            df_table = format_table_currency(df_table, ['Valor'])
-        
-        # Exibe tabela com paginação
-        st.dataframe(
-            df_table,
-            use_container_width=True
+        # Exibe tabela com paginação: ordenada por Data (mais recentes primeiro) pelo
+        # índice do ano, com busca na descrição; só a página exibida é formatada
+        linhas_tabela = paginated_table(
+            df_cartoes_ano,
+            get_card_table_index(selected_year),
+            columns_to_show,
+            positions=posicoes_filtradas,
+            money_columns=['Valor'],
+            key='cartoes_transacoes',
+            search_label="Buscar na descrição:"
         )
         
-        # Add export button
-        if not df_table.empty:
-            csv = df_table.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                "📥 Exportar Transações",
-                csv,
-                f"transacoes_cartao_{selected_year}.csv",
-                "text/csv",
-                key='download-csv'
+        # Exporta as linhas selecionadas (filtros e busca) apenas quando solicitado
+        if len(linhas_tabela) > 0:
+            export_button(
+                lambda: df_cartoes_ano.iloc[linhas_tabela][columns_to_show],
+                f"transacoes_cartao_{selected_year}",
+                key='cartoes_exportar',
+                label="📥 Exportar Transações"
             )
         
         # Gráfico de análise comparativa
@@ -303,13 +258,10 @@ def cartoes_view():
             st.subheader("Análise Comparativa por Funcionário")
             
             # Top 3 categorias
-            top_categorias = df_cartoes.groupby('Categoria')['Valor'].sum().nlargest(3).index.tolist()
-            
-            # Filtra apenas as top categorias
-            df_top_categorias = df_cartoes[df_cartoes['Categoria'].isin(top_categorias)]
+            top_categorias = gastos.by_category().nlargest(3).index.tolist()
             
-            # Agrupa por funcionário e categoria
-            df_Usuário_categoria = df_top_categorias.groupby(['Usuário', 'Categoria'])['Valor'].sum().reset_index()
+            # Soma por funcionário e categoria, apenas das top categorias
+            df_Usuário_categoria = gastos.by_user_category(top_categorias)
             
             # Cria gráfico
             fig = plot_bar_chart(
@@ -325,20 +277,29 @@ def cartoes_view():
         # Relatório de auditoria
         st.subheader("Relatório de Auditoria")
         
-        # Identifica transações atípicas (acima de 2 desvios padrão)
-        media = df_cartoes['Valor'].mean()
-        desvio = df_cartoes['Valor'].std()
-        limite = media + 2 * desvio
+        # Transações atípicas para o funcionário na categoria, avaliadas uma vez por
+        # recorte de cartão; os filtros só escolhem quais delas são exibidas
+        posicoes_atipicas, limites = get_card_audit(selected_year)
+        if posicoes_filtradas is not None:
+            selecionadas = np.isin(posicoes_atipicas, posicoes_filtradas)
+            posicoes_atipicas, limites = posicoes_atipicas[selecionadas], limites[selecionadas]
         
-        df_atipicas = df_cartoes[df_cartoes['Valor'] > limite]
+        df_atipicas = df_cartoes_ano.iloc[posicoes_atipicas][columns_to_show].assign(Limite=limites)
         
         if not df_atipicas.empty:
-            st.warning(f"Foram identificadas {len(df_atipicas)} transações com valores atípicos (acima de {format_currency(limite)}).")
+            st.warning(
+                f"Foram identificadas {len(df_atipicas)} transações com valores atípicos "
+                "em relação ao histórico do funcionário na categoria."
+            )
+            st.caption(
+                f"Limite: mediana + {str(MAD_THRESHOLD).replace('.', ',')} × MAD normalizado dos valores do funcionário "
+                f"na categoria (ou da categoria inteira, com menos de {MIN_HISTORY} lançamentos)."
+            )
             
             # Formata valores monetários
             df_atipicas_formatada = format_table_currency(
-                df_atipicas[columns_to_show].sort_values('Valor', ascending=False),
-                ['Valor']
+                df_atipicas.sort_values('Valor', ascending=False),
+                ['Valor', 'Limite']
             )
             
             # Exibe transações atípicas
@@ -349,7 +310,7 @@ def cartoes_view():
         else:
             st.success("Não foram identificadas transações com valores atípicos.")
         
-        st.write("Colunas disponíveis:", df_processed.columns.tolist())
+        st.write("Colunas disponíveis:", df_cartoes_ano.columns.tolist())
     
     except Exception as e:
         st.error(f"Erro ao carregar os dados: {e}")
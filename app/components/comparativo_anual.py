@@ -8,13 +8,14 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent / "utils"))
 
-from utils.data_loader import load_data, load_all_data, get_available_years
-from utils.preprocessing import preprocess_financial_data, calculate_financial_metrics
+from utils.data_loader import get_available_years
+from utils.comparison import get_year_comparison
+from utils.money import to_reais
 from utils.styling import (
-    format_currency, format_percentage, create_metric_card,
+    format_currency_array, format_percentage_array, create_metric_card,
     plot_bar_chart, plot_pie_chart, plot_line_chart, format_table_currency
 )
-from config import COLORS, EXPENSE_TYPES
+from config import COLORS
 
 def comparativo_anual_view():
     """
@@ -30,10 +31,6 @@ def comparativo_anual_view():
         return
     
     try:
-        # Carrega todos os dados disponíveis
-        df_all = load_all_data()
-        df_processed = preprocess_financial_data(df_all)
-        
         # Seletor de anos para comparação
         selected_years = st.multiselect(
             "Selecione os anos para comparação:",
@@ -45,28 +42,20 @@ def comparativo_anual_view():
             st.warning("Selecione pelo menos dois anos para comparação.")
             return
         
-        # Filtra dados pelos anos selecionados
-        df_selected = df_processed[df_processed['Ano'].isin(selected_years)]
-        
-        # Cálculo de métricas para cada ano
-        metrics_by_year = {}
-        for year in selected_years:
-            df_year = df_processed[df_processed['Ano'] == year]
-            metrics_by_year[year] = calculate_financial_metrics(df_year)
+        # Comparativo dos anos selecionados: totais por ano, tipo, categoria e mês
+        # saem de uma única agregação dos cubos dos anos, memorizada enquanto os
+        # dados não mudam
+        comparison = get_year_comparison(selected_years)
         
         # Comparativo de despesas totais por ano
         st.subheader("Despesas Totais por Ano")
         
         # Prepara dados para o gráfico
-        total_despesas = []
-        
-        for year in selected_years:
-            total_despesas.append({
-                "Ano": str(year),
-                "Valor": metrics_by_year[year].get('total_despesas', 0)
-            })
-        
-        df_total_despesas = pd.DataFrame(total_despesas)
+        total_despesas = comparison.total_expenses()
+        df_total_despesas = pd.DataFrame({
+            "Ano": total_despesas.index.astype(str),
+            "Valor": total_despesas.to_numpy()
+        })
         
         # Cria gráfico
         fig = plot_bar_chart(
@@ -81,50 +70,22 @@ def comparativo_anual_view():
         # Tabela comparativa
         st.subheader("Tabela Comparativa")
         
-        # Prepara dados para a tabela
-        comparativo_data = []
-        
-        # Adiciona despesas totais
-        row_total = {"Métrica": "Despesa Total"}
-        for year in selected_years:
-            row_total[str(year)] = metrics_by_year[year].get('total_despesas', 0)
-        comparativo_data.append(row_total)
-        
-        # Adiciona despesas por tipo
-        for tipo in EXPENSE_TYPES:
-            tipo_lower = tipo.lower()
-            row_tipo = {"Métrica": f"Despesas {tipo}"}
-            for year in selected_years:
-                row_tipo[str(year)] = metrics_by_year[year].get(f'total_{tipo_lower}', 0)
-            comparativo_data.append(row_tipo)
-        
-        # Adiciona percentuais por tipo
-        for tipo in EXPENSE_TYPES:
-            tipo_lower = tipo.lower()
-            row_percentual = {"Métrica": f"% {tipo}"}
-            for year in selected_years:
-                row_percentual[str(year)] = metrics_by_year[year].get(f'percentual_{tipo_lower}', 0)
-            comparativo_data.append(row_percentual)
-        
-        # Cria dataframe da tabela
-        df_comparativo = pd.DataFrame(comparativo_data)
+        # Despesa total, despesas e percentual por tipo, uma coluna por ano
+        df_comparativo = comparison.expense_table()
         
         # Formata valores monetários
         year_columns = [str(year) for year in selected_years]
         
-        # Cria uma cópia formatada
-        df_formatado = df_comparativo.copy()
-        
-        # Formata valores
-        for idx, row in df_formatado.iterrows():
-            if "%" in row["Métrica"]:
-                # Formata percentuais
-                for year in year_columns:
-                    df_formatado.at[idx, year] = format_percentage(row[year])
-            else:
-                # Formata valores monetários
-                for year in year_columns:
-                    df_formatado.at[idx, year] = format_currency(row[year])
+        # Formata a tabela inteira de uma vez: linhas de percentual ("%" na
+        # métrica) como percentual, as demais como moeda
+        valores = df_comparativo[year_columns].to_numpy(dtype=float)
+        linhas_percentuais = df_comparativo["Métrica"].str.contains("%", regex=False).to_numpy()
+        df_formatado = df_comparativo.copy(deep=False)
+        df_formatado[year_columns] = np.where(
+            linhas_percentuais[:, None],
+            format_percentage_array(valores),
+            format_currency_array(valores)
+        )
         
         # Exibe tabela
         st.dataframe(
@@ -136,8 +97,8 @@ def comparativo_anual_view():
         st.subheader("Comparativo por Categoria")
         
         # Obtém lista de categorias
-        if 'Categoria' in df_selected.columns:
-            categorias = df_selected['Categoria'].unique().tolist()
+        if comparison.has_categories:
+            categorias = comparison.categories
             
             # Seletor de categorias
             selected_categorias = st.multiselect(
@@ -147,11 +108,8 @@ def comparativo_anual_view():
             )
             
             if selected_categorias:
-                # Filtra dados pelas categorias selecionadas
-                df_categorias = df_selected[df_selected['Categoria'].isin(selected_categorias)]
-                
-                # Agrupa por ano e categoria
-                df_ano_categoria = df_categorias.groupby(['Ano', 'Categoria'])['Valor'].sum().reset_index()
+                # Agrupa por ano e categoria, só nas categorias selecionadas
+                df_ano_categoria = comparison.by_category(selected_categorias)
                 
                 # Converte ano para string para o gráfico
                 df_ano_categoria['Ano'] = df_ano_categoria['Ano'].astype(str)
@@ -185,11 +143,11 @@ def comparativo_anual_view():
                     df_pivot[var_col] = ((df_pivot[ano_atual] - df_pivot[ano_anterior]) / df_pivot[ano_anterior]) * 100
                 
                 # Formata valores
-                df_pivot_formatado = df_pivot.copy()
+                df_pivot_formatado = df_pivot.copy(deep=False)
                 
                 # Formata colunas de valor
                 for year in [str(year) for year in selected_years]:
-                    df_pivot_formatado[year] = df_pivot_formatado[year].apply(lambda x: format_currency(x))
+                    df_pivot_formatado[year] = format_currency_array(df_pivot_formatado[year])
                 
                 # Formata colunas de variação
                 for i in range(1, len(selected_years)):
@@ -197,10 +155,12 @@ def comparativo_anual_view():
                     ano_atual = str(selected_years[i])
                     var_col = f"Var {ano_anterior}-{ano_atual}"
                     
-                    # Aplica formatação e indicadores
-                    df_pivot_formatado[var_col] = df_pivot[var_col].apply(
-                        lambda x: f"↑ {format_percentage(x)}" if x > 0 else 
-                                 (f"↓ {format_percentage(abs(x))}" if x < 0 else "→ 0,00%")
+                    # Aplica formatação e indicadores (sem variação ou sem valor: →)
+                    variacao = df_pivot[var_col].to_numpy(dtype=float)
+                    texto = format_percentage_array(np.abs(variacao))
+                    df_pivot_formatado[var_col] = np.where(
+                        variacao > 0, "↑ " + texto,
+                        np.where(variacao < 0, "↓ " + texto, "→ 0,00%")
                     )
                 
                 # Exibe tabela
@@ -235,11 +195,11 @@ def comparativo_anual_view():
             st.warning("Dados de categoria não disponíveis para comparativo.")
         
         # Comparativo de despesas mensais
-        if 'Mes' in df_selected.columns:
+        if comparison.has_months:
             st.subheader("Comparativo Mensal")
             
             # Agrupa por ano e mês
-            df_mensal = df_selected.groupby(['Ano', 'Mes'])['Valor'].sum().reset_index()
+            df_mensal = comparison.by_month()
             
             # Adiciona nome do mês
             meses = {
@@ -280,12 +240,12 @@ def comparativo_anual_view():
             import plotly.figure_factory as ff
             
             # Formata valores para o heatmap
-            z = df_heatmap.values
+            z = to_reais(df_heatmap.values)
             x = df_heatmap.columns.tolist()
             y = df_heatmap.index.tolist()
             
             # Formata valores para exibição no hover
-            text = [[format_currency(val) for val in row] for row in z]
+            text = format_currency_array(df_heatmap.values).tolist()
             
             # Cria figura
             fig = ff.create_annotated_heatmap(
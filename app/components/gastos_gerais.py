@@ -8,8 +8,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent / "utils"))
 
-from utils.data_loader import load_data
-from utils.preprocessing import preprocess_financial_data, calculate_financial_metrics
+from utils.data_loader import get_financial_metrics, get_available_years, get_default_year_index
+from utils.cube import get_cube
 from utils.styling import (
     format_currency, format_percentage, create_metric_card,
     plot_bar_chart, plot_pie_chart, format_table_currency
@@ -23,16 +23,15 @@ def gastos_gerais_view():
     st.header("📊 Gastos Gerais")
     
     # Seletor de ano
-    available_years = [2023, 2024, 2025]
-    selected_year = st.selectbox("Selecione o ano", available_years, index=1)  # 2024 como padrão
+    available_years = get_available_years()
+    selected_year = st.selectbox("Selecione o ano", available_years, index=get_default_year_index(available_years))
     
     try:
-        # Carrega e processa os dados
-        df = load_data(selected_year)
-        df_processed = preprocess_financial_data(df)
+        # Cubo pré-agregado do ano (memorizado enquanto os dados não mudam)
+        cube = get_cube(selected_year)
         
-        # Calcula métricas
-        metrics = calculate_financial_metrics(df_processed)
+        # Métricas memorizadas (só as linhas novas são somadas quando o arquivo cresce)
+        metrics = get_financial_metrics(selected_year)
         
         # Layout em colunas
         st.subheader("Métricas Financeiras")
@@ -119,9 +118,9 @@ def gastos_gerais_view():
             # Gráfico de pizza por categoria
             st.subheader("Despesas por Categoria")
             
-            if 'Categoria' in df_processed.columns and 'Valor' in df_processed.columns:
+            if 'Categoria' in cube.dimensions:
                 # Agrupa por categoria
-                df_by_category = df_processed.groupby('Categoria')['Valor'].sum().reset_index()
+                df_by_category = cube.sum('Categoria').reset_index()
                 
                 # Ordena e pega as top 5, o resto agrupado como "Outros"
                 df_by_category = df_by_category.sort_values('Valor', ascending=False)
@@ -146,9 +145,9 @@ def gastos_gerais_view():
         # Tabela detalhada
         st.subheader("Tabela Detalhada de Despesas")
         
-        if 'Tipo' in df_processed.columns and 'Categoria' in df_processed.columns and 'Valor' in df_processed.columns:
+        if 'Tipo' in cube.dimensions and 'Categoria' in cube.dimensions:
             # Agrupa dados por tipo e categoria
-            df_table = df_processed.groupby(['Tipo', 'Categoria'])['Valor'].sum().reset_index()
+            df_table = cube.sum(['Tipo', 'Categoria']).reset_index()
             
             # Ordena por tipo e valor
             df_table = df_table.sort_values(['Tipo', 'Valor'], ascending=[True, False])
@@ -170,11 +169,11 @@ def gastos_gerais_view():
             st.warning("Dados insuficientes para gerar a tabela detalhada.")
         
         # Análise mensal se houver dados de mês
-        if 'Mes' in df_processed.columns and 'Valor' in df_processed.columns:
+        if 'Mes' in cube.dimensions:
             st.subheader("Análise Mensal")
             
             # Agrupa por mês
-            monthly_data = df_processed.groupby('Mes')['Valor'].sum().reset_index()
+            monthly_data = cube.sum('Mes').reset_index()
             
             # Adiciona nome do mês
             months_names = {
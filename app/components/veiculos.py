@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import sys
 from pathlib import Path
 
@@ -8,56 +7,19 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent / "utils"))
 
-from utils.data_loader import load_data
-from utils.preprocessing import preprocess_financial_data, calculate_financial_metrics
+from utils.data_loader import get_available_years, get_default_year_index
+from utils.vehicles import get_vehicle_series
 from utils.styling import (
-    format_currency, format_percentage, create_metric_card,
-    plot_bar_chart, plot_pie_chart, plot_line_chart, format_table_currency
+    format_currency, create_metric_card,
+    plot_bar_chart, plot_pie_chart, plot_line_chart, paginated_table
 )
-from config import COLORS, MONTHS
+from utils.tables import top_positions, with_others
+from config import COLORS, FLEET_CHART_VEHICLES, FLEET_CHART_CATEGORIES
 
-def calculate_vehicle_metrics(df):
-    """Calculate vehicle metrics with validation"""
-    metrics = {}
-    
-    # Total expenses
-    metrics['total_gasto'] = df['Valor'].sum()
-    
-    # Average expense per vehicle
-    metrics['gasto_medio'] = df.groupby('Veículos')['Valor'].sum().mean()
-    
-    # Total mileage (max - min per vehicle)
-    if 'KM' in df.columns:
-        km_por_veiculo = df.groupby('Veículos')['KM'].agg(['min', 'max'])
-        km_por_veiculo['km_rodados'] = km_por_veiculo['max'] - km_por_veiculo['min']
-        metrics['km_total'] = km_por_veiculo['km_rodados'].sum()
-        
-        # Cost per km
-        metrics['custo_por_km'] = (
-            metrics['total_gasto'] / metrics['km_total'] 
-            if metrics['km_total'] > 0 else 0
-        )
-    
-    return metrics
-
-def plot_monthly_analysis(df):
+def plot_monthly_analysis(df_mensal):
     """Plot monthly trends"""
-    if 'Data' not in df.columns:
+    if df_mensal.empty:
         return
-        
-    df['Mês'] = pd.to_datetime(df['Data']).dt.to_period('M')
-    df_mensal = df.groupby('Mês').agg({
-        'Valor': 'sum',
-        'KM': lambda x: x.max() - x.min() if 'KM' in df.columns else 0,
-        'Litros': 'sum'
-    }).reset_index()
-    
-    df_mensal['Mês'] = df_mensal['Mês'].astype(str)
-    df_mensal['Custo_por_KM'] = np.where(
-        df_mensal['KM'] > 0,
-        df_mensal['Valor'] / df_mensal['KM'],
-        0
-    )
     
     # Plot monthly trends
     st.subheader("Análise Mensal")
@@ -77,30 +39,26 @@ def veiculos_view():
     st.header("🚗 Análise de Veículos")
     
     # Seletor de ano
-    available_years = [2023, 2024, 2025]
-    selected_year = st.selectbox("Selecione o ano", available_years, index=1)  # 2024 como padrão
+    available_years = get_available_years()
+    selected_year = st.selectbox("Selecione o ano", available_years, index=get_default_year_index(available_years))
     
     try:
-        # Carrega e processa os dados
-        df = load_data(selected_year)
-        
-        # Ajuste para garantir que as colunas sejam corretamente processadas
-        df_processed = preprocess_financial_data(df)
+        # Séries de hodômetro, abastecimentos e custos por veículo, ordenadas e
+        # resumidas uma vez por versão dos dados
+        series = get_vehicle_series(selected_year)
         
         # Verifica se há dados de veículos
-        if 'Veículos' not in df_processed.columns:
+        if not series.has_vehicles:
             st.warning("Este conjunto de dados não contém informações de veículos.")
             return
         
-        # Filtra apenas despesas com veículos
-        df_veiculos = df_processed[df_processed['Veículos'].notna()]
-        
-        if df_veiculos.empty:
+        if len(series.vehicles) == 0:
             st.warning("Não há registros de veículos para este ano.")
             return
         
         # Obtém lista de veículos
-        veiculos = df_veiculos['Veículos'].unique().tolist()
+        veiculos = series.vehicles.tolist()
+        filtro_veiculos = None
         
         # Improved vehicle filter
         if len(veiculos) > 1:
@@ -117,16 +75,14 @@ def veiculos_view():
                     st.session_state.vehicle_filter = veiculos
                     
             # Apply filter
-            df_veiculos = (
-                df_veiculos if not selected_veiculo 
-                else df_veiculos[df_veiculos['Veículos'].isin(selected_veiculo)]
-            )
+            if selected_veiculo:
+                filtro_veiculos = selected_veiculo
         
         # Verifica se há dados de abastecimento
-        tem_abastecimento = all(col in df_veiculos.columns for col in ['KM', 'Litros'])
+        tem_abastecimento = series.has_fuel
         
         # Cria métricas gerais
-        metrics = calculate_vehicle_metrics(df_veiculos)
+        metrics = series.metrics(filtro_veiculos)
         
         # Layout em colunas para métricas
         st.subheader("Métricas Gerais")
@@ -148,7 +104,7 @@ def veiculos_view():
             )
         
         with col3:
-            if 'KM' in df_veiculos.columns:
+            if series.has_km:
                 create_metric_card(
                     "Quilometragem Total", 
                     metrics['km_total'],
@@ -177,14 +133,20 @@ def veiculos_view():
             # Gráfico de gastos por veículo
             st.subheader("Gastos por Veículo")
             
-            df_por_veiculo = df_veiculos.groupby('Veículos')['Valor'].sum().reset_index()
-            df_por_veiculo = df_por_veiculo.sort_values('Valor', ascending=False)
+            # Frotas grandes: os veículos de maior gasto e uma barra com os demais
+            resumo = series.summary(filtro_veiculos)
+            maiores = top_positions(resumo['Valor'], FLEET_CHART_VEHICLES)
+            df_por_veiculo = with_others(resumo, maiores, 'Veículos', 'Valor', label="Outros veículos")
+            
+            titulo = "Gastos Totais por Veículo"
+            if len(maiores) < len(resumo):
+                titulo = f"Gastos Totais - {FLEET_CHART_VEHICLES} Maiores Veículos e Demais"
             
             fig = plot_bar_chart(
                 df_por_veiculo,
                 x="Veículos",
                 y="Valor",
-                title="Gastos Totais por Veículo",
+                title=titulo,
                 color_discrete_sequence=[COLORS["primary"]]
             )
             st.plotly_chart(fig, use_container_width=True)
@@ -193,17 +155,19 @@ def veiculos_view():
             # Gráfico de categorias de gastos
             st.subheader("Gastos por Categoria")
             
-            if 'Categoria' in df_veiculos.columns:
-                # Filter out "Medição" entries and standardize category names
-                df_categorias = df_veiculos[df_veiculos['Conta'] != 'Medição'].copy()
-                df_categorias['Categoria'] = df_categorias['Categoria'].str.strip().str.title()
+            if series.has_categories:
+                # Soma por categoria (nomes padronizados, sem medições) pré-calculada
+                # por veículo; o filtro só escolhe os veículos
+                df_categorias = series.by_category(filtro_veiculos)
                 
                 if df_categorias.empty:
                     st.warning("Sem dados de categoria após filtrar medições.")
                 else:
-                    # Group and sort by value
-                    df_categorias = df_categorias.groupby('Categoria')['Valor'].sum().reset_index()
-                    df_categorias = df_categorias.sort_values('Valor', ascending=False)
+                    # Muitas categorias: as de maior gasto e uma fatia com as demais
+                    maiores = top_positions(df_categorias['Valor'], FLEET_CHART_CATEGORIES)
+                    df_categorias = with_others(
+                        df_categorias, maiores, 'Categoria', 'Valor', label="Outras categorias"
+                    )
                     
                     fig = plot_pie_chart(
                         df_categorias,
@@ -219,21 +183,23 @@ def veiculos_view():
         if tem_abastecimento:
             st.subheader("Análise de Eficiência de Combustível")
             
-            # Cálculo de eficiência
-            df_abastecimentos = df_veiculos[df_veiculos['Litros'] > 0].copy()
-            
-            # Agrupa por veículo
-            df_eficiencia = df_abastecimentos.groupby('Veículos').agg({
-                'KM': 'max',
-                'Litros': 'sum',
-                'Valor': 'sum'
-            }).reset_index()
+            # Eficiência por veículo: km rodados entre abastecimentos por litro e
+            # gasto com abastecimentos por km rodado (ver VehicleTimeSeries)
+            posicoes_eficiencia = series.efficiency_positions(filtro_veiculos)
+            df_eficiencia = series.efficiency
+            if posicoes_eficiencia is not None:
+                df_eficiencia = df_eficiencia.iloc[posicoes_eficiencia]
             
-            # Calcula eficiência (km/l)
-            df_eficiencia['Eficiencia'] = df_eficiencia['KM'] / df_eficiencia['Litros']
-            
-            # Calcula custo por km
-            df_eficiencia['Custo_por_KM'] = df_eficiencia['Valor'] / df_eficiencia['KM']
+            # Frotas grandes: ranking dos N maiores ou menores valores em cada gráfico
+            ranking_maiores = True
+            if len(df_eficiencia) > FLEET_CHART_VEHICLES:
+                ranking = st.radio(
+                    f"Exibir nos gráficos ({len(df_eficiencia)} veículos):",
+                    [f"{FLEET_CHART_VEHICLES} maiores valores", f"{FLEET_CHART_VEHICLES} menores valores"],
+                    horizontal=True,
+                    key="vehicle_ranking"
+                )
+                ranking_maiores = ranking.endswith("maiores valores")
             
             # Layout em colunas
             col1, col2 = st.columns(2)
@@ -241,7 +207,7 @@ def veiculos_view():
             with col1:
                 # Gráfico de eficiência
                 fig = plot_bar_chart(
-                    df_eficiencia,
+                    df_eficiencia.iloc[top_positions(df_eficiencia['Eficiencia'], FLEET_CHART_VEHICLES, ranking_maiores)],
                     x="Veículos",
                     y="Eficiencia",
                     title="Eficiência de Combustível (km/l)",
@@ -252,7 +218,7 @@ def veiculos_view():
             with col2:
                 # Gráfico de custo por km
                 fig = plot_bar_chart(
-                    df_eficiencia,
+                    df_eficiencia.iloc[top_positions(df_eficiencia['Custo_por_KM'], FLEET_CHART_VEHICLES, ranking_maiores)],
                     x="Veículos",
                     y="Custo_por_KM",
                     title="Custo por Quilômetro (R$/km)",
@@ -263,27 +229,33 @@ def veiculos_view():
             # Tabela de eficiência
             st.subheader("Tabela de Eficiência")
             
-            # Prepara tabela formatada
-            df_eficiencia_formatada = df_eficiencia.copy()
-            df_eficiencia_formatada['Eficiencia'] = df_eficiencia_formatada['Eficiencia'].apply(lambda x: f"{x:.2f} km/l")
-            df_eficiencia_formatada['Custo_por_KM'] = df_eficiencia_formatada['Custo_por_KM'].apply(lambda x: format_currency(x))
-            df_eficiencia_formatada['Valor'] = df_eficiencia_formatada['Valor'].apply(lambda x: format_currency(x))
-            
-            st.dataframe(
-                df_eficiencia_formatada,
+            # Tabela paginada: mais eficientes primeiro, com busca por placa; só a
+            # página exibida é formatada. Sem km entre abastecimentos (ex.: um só
+            # abastecimento) não há consumo nem custo por km
+            paginated_table(
+                series.efficiency,
+                series.efficiency_index,
+                ['Veículos', 'KM', 'Litros', 'Valor', 'Eficiencia', 'Custo_por_KM'],
+                positions=posicoes_eficiencia,
+                money_columns=['Valor'],
+                formatters={
+                    'Eficiencia': lambda x: f"{x:.2f} km/l" if pd.notna(x) else "-",
+                    'Custo_por_KM': lambda x: format_currency(x) if pd.notna(x) else "-",
+                },
                 column_config={
                     "Veículos": st.column_config.TextColumn("Veículo"),
-                    "KM": st.column_config.NumberColumn("Quilometragem", format="%d km"),
+                    "KM": st.column_config.NumberColumn("Km Rodados", format="%d km"),
                     "Litros": st.column_config.NumberColumn("Combustível", format="%.2f L"),
                     "Valor": st.column_config.TextColumn("Custo Total"),
                     "Eficiencia": st.column_config.TextColumn("Eficiência"),
                     "Custo_por_KM": st.column_config.TextColumn("Custo por KM")
                 },
-                use_container_width=True
+                key="veiculos_eficiencia",
+                search_label="Buscar veículo:"
             )
         
         # Análise Mensal
-        plot_monthly_analysis(df_veiculos)
+        plot_monthly_analysis(series.monthly(filtro_veiculos))
         
     except Exception as e:
         st.error(f"Erro ao carregar os dados: {e}")
@@ -12,16 +12,53 @@ BASE_DIR = Path(__file__).parent.parent.absolute()
 APP_TITLE = os.getenv("APP_TITLE", "Sistema de Gestão Financeira")
 APP_THEME = os.getenv("APP_THEME", "light")
 
-# Caminhos de arquivos - com fallback para paths diretos caso o .env falhe
+# Diretório dos arquivos de dados. Os arquivos lgd<ano>.csv (ou lgd<ano>-<mês>.csv)
+# são descobertos automaticamente; caminhos DATA_<ano> no .env continuam aceitos
 DATA_PATH = os.getenv("DATA_PATH", str(BASE_DIR / "data"))
-DATA_2023 = os.getenv("DATA_2023", str(BASE_DIR / "data" / "lgd2023.csv"))
-DATA_2024 = os.getenv("DATA_2024", str(BASE_DIR / "data" / "lgd2024.csv"))
-DATA_2025 = os.getenv("DATA_2025", str(BASE_DIR / "data" / "lgd2025.csv"))
+
+# Cache colunar (Parquet) gravado ao lado de cada CSV
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_SUFFIX = os.getenv("CACHE_SUFFIX", ".cache.parquet")
+
+# Número máximo de DataFrames pré-processados mantidos em memória (LRU)
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "8"))
+
+# Intervalo mínimo (segundos) entre verificações de mudanças no diretório de dados
+CATALOG_REFRESH_SECONDS = float(os.getenv("CATALOG_REFRESH_SECONDS", "2"))
+
+# Número de threads usadas para carregar vários anos em paralelo
+LOAD_WORKERS = int(os.getenv("LOAD_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Linhas por bloco na leitura em streaming de arquivos grandes
+STREAM_CHUNKSIZE = int(os.getenv("STREAM_CHUNKSIZE", "200000"))
+
+# Anos cujos arquivos somam ao menos este tamanho (bytes) e que ainda não estão
+# em memória têm as métricas e o cubo de Gastos Gerais calculados em blocos, sem
+# carregar o ano inteiro; 0 desativa
+STREAM_MIN_BYTES = int(os.getenv("STREAM_MIN_BYTES", str(1024 ** 3)))
+
+# Linhas por bloco na gravação dos arquivos exportados (CSV, Parquet, Excel)
+EXPORT_CHUNKSIZE = int(os.getenv("EXPORT_CHUNKSIZE", "50000"))
+
+# Valores monetários em centavos inteiros (int64) em vez de reais (float64): somas
+# exatas, sem erro de arredondamento; a conversão para reais só ocorre na exibição
+MONEY_AS_CENTAVOS = os.getenv("MONEY_AS_CENTAVOS", "false").lower() in ("1", "true", "yes")
 
 # Configurações de visualização
 DEFAULT_CURRENCY = os.getenv("DEFAULT_CURRENCY", "R$")
 DEFAULT_YEAR = int(os.getenv("DEFAULT_YEAR", "2024"))
 
+# Linhas por página nas tabelas paginadas (a primeira opção é o padrão)
+TABLE_PAGE_SIZES = [int(size) for size in os.getenv("TABLE_PAGE_SIZES", "50,100,500").split(",")]
+
+# Máximo de veículos por gráfico; frotas maiores mostram um ranking (os N
+# maiores ou menores) e, nos gastos, uma barra "Outros" com os demais
+FLEET_CHART_VEHICLES = int(os.getenv("FLEET_CHART_VEHICLES", "20"))
+
+# Máximo de fatias no gráfico de categorias dos veículos; as demais categorias
+# são somadas em uma fatia "Outras categorias"
+FLEET_CHART_CATEGORIES = int(os.getenv("FLEET_CHART_CATEGORIES", "10"))
+
 # Cores para visualizações
 COLORS = {
     "primary": "#7FB3D5",     # azul suave
@@ -50,8 +87,4 @@ MONTHS = [
 
 # Informações de debug
 print(f"Diretório base: {BASE_DIR}")
-print(f"Diretório de dados: {DATA_PATH}")
-print(f"Arquivos:")
-print(f"2023: {DATA_2023} (existe: {Path(DATA_2023).exists()})")
-print(f"2024: {DATA_2024} (existe: {Path(DATA_2024).exists()})")
-print(f"2025: {DATA_2025} (existe: {Path(DATA_2025).exists()})")
\ No newline at end of file
+print(f"Diretório de dados: {DATA_PATH} (existe: {Path(DATA_PATH).exists()})")
\ No newline at end of file
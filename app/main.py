@@ -11,7 +11,7 @@ sys.path.append(str(Path(__file__).parent / "components"))
 # Importando configurações e utilitários
 from config import APP_TITLE
 from utils.styling import set_page_config
-from utils.data_loader import get_available_years
+from utils.data_loader import get_available_years, describe_partitions
 
 # Importando componentes
 from components.gastos_gerais import gastos_gerais_view
@@ -36,10 +36,10 @@ def main():
     if not available_years:
         st.error("⚠️ Nenhum arquivo de dados encontrado!")
         st.info(
-            "Por favor, verifique se os arquivos CSV estão disponíveis no diretório 'data':"
-            "\n- lgd2023.csv"
+            "Por favor, verifique se os arquivos CSV estão disponíveis no diretório 'data' "
+            "(ou em DATA_PATH), um por ano ou por mês:"
             "\n- lgd2024.csv"
-            "\n- lgd2025.csv"
+            "\n- lgd2025-01.csv, lgd2025-02.csv, ..."
         )
         return
     
@@ -62,6 +62,21 @@ def main():
         
         st.markdown("---")
         
+        # Arquivos de dados encontrados, com linhas e período de cada partição
+        # (calculado só quando solicitado; os metadados ficam memorizados por arquivo)
+        if st.toggle("Mostrar arquivos de dados", key="mostrar_particoes"):
+            st.dataframe(
+                describe_partitions(available_years),
+                hide_index=True,
+                column_config={
+                    "Mes": st.column_config.NumberColumn("Mês"),
+                    "Bytes": st.column_config.NumberColumn("Tamanho (bytes)"),
+                    "Modificado em": st.column_config.DatetimeColumn("Modificado em", format="DD/MM/YYYY HH:mm"),
+                },
+            )
+        
+        st.markdown("---")
+        
         # Informações da aplicação
         st.markdown("### Sobre")
         st.markdown("Sistema de Análise Financeira v1.0")
@@ -0,0 +1,338 @@
+import pandas as pd
+import numpy as np
+import sys
+import threading
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from config import CACHE_MAX_ENTRIES
+from utils.cache import LRUCache
+from utils.data_loader import ledger_key
+from utils.cards import get_card_transactions
+
+# Erro relativo máximo das medianas estimadas pelo sketch de quantis
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Uma transação é atípica se Valor > mediana + MAD_THRESHOLD * MAD normalizado
+MAD_THRESHOLD = 3.5
+
+# Fator que torna o MAD comparável ao desvio padrão em dados normais
+MAD_SCALE = 1.4826
+
+# Lançamentos mínimos de um funcionário em uma categoria para usar o histórico
+# dele; com menos, vale o histórico da categoria (todos os funcionários)
+MIN_HISTORY = 8
+
+# Auditorias por ano, válidas enquanto o recorte de cartão do ano é o mesmo
+_audits = LRUCache(CACHE_MAX_ENTRIES)
+_audits_lock = threading.Lock()
+
+class _GroupIndex:
+    """Ids inteiros estáveis para combinações de valores; novas combinações recebem os próximos ids"""
+
+    def __init__(self):
+        self._ids = {}
+
+    def __len__(self):
+        return len(self._ids)
+
+    def codes(self, *columns):
+        """Id de cada linha (cada combinação distinta é consultada uma única vez)"""
+        codes, uniques = zip(*(pd.factorize(column) for column in columns))
+        shape = tuple(len(u) + 1 for u in uniques)
+        # Código -1 (valor ausente) vira 0; os demais são deslocados em 1
+        combined, distinct = pd.factorize(np.ravel_multi_index([c + 1 for c in codes], shape))
+        labels = zip(*(
+            [None if c == 0 else u[c - 1] for c in part]
+            for u, part in zip(uniques, np.unravel_index(distinct, shape))
+        ))
+        ids = np.array([self._ids.setdefault(label, len(self._ids)) for label in labels], dtype=np.int64)
+        return ids[combined]
+
+class GroupedQuantileSketch:
+    """
+    Sketch de quantis (no estilo DDSketch) para muitos grupos ao mesmo tempo
+
+    Cada valor cai em um balde logarítmico de razão gamma = (1 + a) / (1 - a);
+    o sketch guarda apenas a contagem de cada (grupo, balde), de modo que
+    lotes novos são somados sem rever os anteriores e os quantis estimados
+    têm erro relativo de no máximo `a`.
+    """
+
+    # Baldes por sinal: índices de -_MAX_BUCKET a _MAX_BUCKET (de ~1e-36 a ~1e36 com a = 1%)
+    _MAX_BUCKET = 4096
+    _KEY_SPAN = 2 * (2 * _MAX_BUCKET + 1) + 1
+
+    def __init__(self, relative_accuracy=SKETCH_RELATIVE_ACCURACY):
+        """
+        Args:
+            relative_accuracy (float): Erro relativo máximo dos quantis
+        """
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        # Chaves (grupo, balde) combinadas em um inteiro, ordenadas, e suas contagens
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def _bucket_keys(self, values):
+        """Balde com sinal de cada valor: negativo, 0 (zero) ou positivo, crescente com o valor"""
+        magnitude = np.abs(values)
+        with np.errstate(divide='ignore'):
+            bucket = np.ceil(np.log(magnitude) / self._log_gamma)
+        bucket = np.clip(np.nan_to_num(bucket, neginf=-self._MAX_BUCKET), -self._MAX_BUCKET, self._MAX_BUCKET)
+        key = bucket.astype(np.int64) + self._MAX_BUCKET + 1
+        key = np.where(magnitude < self.gamma ** -self._MAX_BUCKET, 0, key)
+        return np.where(values < 0, -key, key)
+
+    def _bucket_values(self, keys):
+        """Valor representativo de cada balde (ponto de erro relativo mínimo)"""
+        bucket = np.abs(keys) - self._MAX_BUCKET - 1
+        value = 2 * np.power(self.gamma, bucket.astype(float)) / (self.gamma + 1)
+        return np.where(keys == 0, 0.0, np.sign(keys) * value)
+
+    def add(self, groups, values):
+        """
+        Acrescenta valores ao sketch
+
+        Args:
+            groups (numpy.ndarray): Id do grupo de cada valor
+            values (numpy.ndarray): Valores
+        """
+        offset = 2 * self._MAX_BUCKET + 1
+        new_keys, new_counts = np.unique(
+            groups.astype(np.int64) * self._KEY_SPAN + self._bucket_keys(values) + offset,
+            return_counts=True,
+        )
+        # Baldes já existentes têm a contagem somada; os novos são inseridos em ordem
+        position = np.searchsorted(self.keys, new_keys)
+        exists = np.zeros(len(new_keys), dtype=bool)
+        if len(self.keys):
+            exists = self.keys[np.minimum(position, len(self.keys) - 1)] == new_keys
+        counts = self.counts.copy()
+        counts[position[exists]] += new_counts[exists]
+        self.keys = np.insert(self.keys, position[~exists], new_keys[~exists])
+        self.counts = np.insert(counts, position[~exists], new_counts[~exists])
+
+    def _entries(self, groups):
+        """Posição do grupo em `groups` e valor representativo de cada balde desses grupos"""
+        offset = 2 * self._MAX_BUCKET + 1
+        start = np.searchsorted(self.keys, groups * self._KEY_SPAN)
+        end = np.searchsorted(self.keys, (groups + 1) * self._KEY_SPAN)
+        lengths = end - start
+        # Posições dos baldes de cada grupo, que ficam contíguos em self.keys
+        index = np.repeat(start - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        keys = self.keys[index] % self._KEY_SPAN - offset
+        return np.repeat(np.arange(len(groups)), lengths), self._bucket_values(keys), self.counts[index]
+
+    @staticmethod
+    def _weighted_quantile(groups, values, counts, n_groups, q):
+        """Quantil q por grupo de valores ordenados por (grupo, valor) com pesos inteiros"""
+        totals = np.bincount(groups, weights=counts, minlength=n_groups)
+        if not len(values):
+            return np.full(n_groups, np.nan)
+        cumulative = np.cumsum(counts)
+        before = np.concatenate([[0], np.cumsum(totals)[:-1]])
+        position = np.searchsorted(cumulative, before + q * np.maximum(totals - 1, 0), side='right')
+        position = np.minimum(position, len(values) - 1)
+        return np.where(totals > 0, values[position], np.nan)
+
+    def median_mad(self, groups):
+        """
+        Mediana e MAD (desvio absoluto mediano) estimados de alguns grupos
+
+        O MAD é a mediana das distâncias entre os valores representativos dos
+        baldes e a mediana do grupo, ponderadas pelas contagens. Só os baldes
+        dos grupos pedidos são percorridos.
+
+        Args:
+            groups (numpy.ndarray): Ids dos grupos, em ordem crescente
+
+        Returns:
+            tuple: (medianas, MADs) alinhados com `groups` (NaN sem valores)
+        """
+        groups = np.asarray(groups, dtype=np.int64)
+        positions, values, counts = self._entries(groups)
+        median = self._weighted_quantile(positions, values, counts, len(groups), 0.5)
+
+        deviation = np.abs(values - median[positions])
+        order = np.lexsort((deviation, positions))
+        mad = self._weighted_quantile(positions[order], deviation[order], counts[order], len(groups), 0.5)
+        return median, mad
+
+class RunningGroupStats:
+    """
+    Estatísticas por grupo atualizadas em lotes: contagem, média e variância
+    (Welford, com a combinação de Chan entre lotes) e mediana/MAD (sketch)
+    """
+
+    def __init__(self):
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.sketch = GroupedQuantileSketch()
+
+    def update(self, groups, values, n_groups):
+        """
+        Incorpora um lote de valores
+
+        Args:
+            groups (numpy.ndarray): Id do grupo de cada valor
+            values (numpy.ndarray): Valores (float)
+            n_groups (int): Número total de grupos conhecidos
+        """
+        grow = n_groups - len(self.count)
+        if grow > 0:
+            self.count = np.concatenate([self.count, np.zeros(grow, dtype=np.int64)])
+            self.mean = np.concatenate([self.mean, np.zeros(grow)])
+            self.m2 = np.concatenate([self.m2, np.zeros(grow)])
+
+        batch_count = np.bincount(groups, minlength=n_groups)
+        batch_mean = np.bincount(groups, weights=values, minlength=n_groups) / np.maximum(batch_count, 1)
+        batch_m2 = np.bincount(groups, weights=(values - batch_mean[groups]) ** 2, minlength=n_groups)
+
+        count = self.count + batch_count
+        delta = batch_mean - self.mean
+        safe_count = np.maximum(count, 1)
+        self.mean = self.mean + delta * batch_count / safe_count
+        self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * batch_count / safe_count
+        self.count = count
+        self.sketch.add(groups, values)
+
+    def limits(self, groups):
+        """
+        Limite acima do qual um valor é atípico em alguns grupos
+
+        mediana + MAD_THRESHOLD * MAD normalizado; se o MAD for 0 (metade ou
+        mais dos valores iguais), média + 2 desvios padrão.
+
+        Args:
+            groups (numpy.ndarray): Ids dos grupos, em ordem crescente
+
+        Returns:
+            numpy.ndarray: Limite de cada grupo (NaN sem dados suficientes)
+        """
+        median, mad = self.sketch.median_mad(groups)
+        count, mean = self.count[groups], self.mean[groups]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2[groups] / (count - 1))
+        std = np.where(count > 1, std, np.nan)
+        return np.where(mad > 0, median + MAD_THRESHOLD * MAD_SCALE * mad, mean + 2 * std)
+
+class CardAuditEngine:
+    """
+    Auditoria de transações de cartão por funcionário e categoria
+
+    Mantém estatísticas de cada par (Usuário, Categoria) e de cada Categoria.
+    Cada lançamento é comparado com o histórico completo: pelo par, se o
+    funcionário tiver ao menos MIN_HISTORY lançamentos na categoria, ou pela
+    categoria. Um lote novo só altera as estatísticas das categorias (e dos
+    pares) em que tem lançamentos, então apenas os lançamentos dessas
+    categorias são reavaliados; o resultado é o mesmo de auditar tudo de uma
+    vez, qualquer que seja a divisão em lotes.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.positions = np.zeros(0, dtype=np.int64)
+        self.limits = np.zeros(0)
+        self._pairs = _GroupIndex()
+        self._categories = _GroupIndex()
+        self._pair_stats = RunningGroupStats()
+        self._category_stats = RunningGroupStats()
+        # Valor e grupos de cada lançamento, para reavaliar as categorias alteradas
+        self._values = np.zeros(0)
+        self._pair_ids = np.zeros(0, dtype=np.int64)
+        self._category_ids = np.zeros(0, dtype=np.int64)
+
+    def update(self, df):
+        """
+        Incorpora um lote de lançamentos de cartão e reavalia as categorias afetadas
+
+        Args:
+            df (pandas.DataFrame): Lançamentos seguintes aos já incorporados
+                (colunas Usuário, Valor e, se houver, Categoria)
+        """
+        if not len(df):
+            return
+        values = np.nan_to_num(df['Valor'].to_numpy(dtype=float))
+        # Sem a coluna Categoria, todos os lançamentos ficam na mesma categoria
+        categorias = df['Categoria'] if 'Categoria' in df.columns else pd.Series(np.nan, index=df.index)
+        pair_ids = self._pairs.codes(df['Usuário'], categorias)
+        category_ids = self._categories.codes(categorias)
+        self._pair_stats.update(pair_ids, values, len(self._pairs))
+        self._category_stats.update(category_ids, values, len(self._categories))
+
+        # Arrays novos (não alterados no lugar): resultados anteriores continuam válidos
+        self._values = np.concatenate([self._values, values])
+        self._pair_ids = np.concatenate([self._pair_ids, pair_ids])
+        self._category_ids = np.concatenate([self._category_ids, category_ids])
+        self.rows += len(df)
+
+        # Todo par do lote pertence a uma categoria do lote: basta reavaliar essas categorias
+        touched = np.unique(category_ids)
+        affected = np.flatnonzero(np.isin(self._category_ids, touched))
+        pairs, pair_rows = np.unique(self._pair_ids[affected], return_inverse=True)
+        categories, category_rows = np.unique(self._category_ids[affected], return_inverse=True)
+        limits = np.where(
+            self._pair_stats.count[self._pair_ids[affected]] >= MIN_HISTORY,
+            self._pair_stats.limits(pairs)[pair_rows],
+            self._category_stats.limits(categories)[category_rows],
+        )
+        flagged = self._values[affected] > limits
+
+        # Atípicos das demais categorias continuam valendo
+        kept = ~np.isin(self._category_ids[self.positions], touched)
+        positions = np.concatenate([self.positions[kept], affected[flagged]])
+        order = np.argsort(positions, kind='stable')
+        self.positions = positions[order]
+        self.limits = np.concatenate([self.limits[kept], limits[flagged]])[order]
+
+def _starts_with(df, prefix):
+    """Se as primeiras linhas de df têm o Usuário, a Categoria e o Valor das linhas de prefix"""
+    if len(df) < len(prefix) or list(df.columns) != list(prefix.columns):
+        return False
+    head = df.iloc[:len(prefix)]
+    return all(
+        head[column].astype(object).reset_index(drop=True).equals(
+            prefix[column].astype(object).reset_index(drop=True)
+        )
+        for column in ('Usuário', 'Categoria', 'Valor') if column in df.columns
+    )
+
+def get_card_audit(year, months=None):
+    """
+    Retorna as transações de cartão atípicas do ano (ver CardAuditEngine)
+
+    O resultado fica memorizado enquanto o recorte de cartão
+    (get_card_transactions) não muda; quando o recorte novo começa pelas
+    linhas do anterior (arquivos que só ganharam linhas), apenas os
+    lançamentos novos são incorporados, e só as categorias em que eles caem
+    são reavaliadas.
+
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+
+    Returns:
+        tuple: (posições em get_card_transactions, limite de cada uma), arrays
+            em ordem crescente de posição
+    """
+    year_key = ledger_key(year, months)
+
+    with _audits_lock:
+        df_cartoes = get_card_transactions(year, months)
+        cached = _audits.get(year_key)
+        if cached is not None and cached[0] is df_cartoes:
+            return cached[2]
+
+        if cached is not None and _starts_with(df_cartoes, cached[0]):
+            engine = cached[1]
+        else:
+            engine = CardAuditEngine()
+        engine.update(df_cartoes.iloc[engine.rows:])
+
+        result = (engine.positions, engine.limits)
+        # O recorte fica guardado junto, para a comparação na próxima chamada
+        _audits.put(year_key, (df_cartoes, engine, result))
+        return result
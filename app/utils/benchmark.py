@@ -0,0 +1,841 @@
+import pandas as pd
+import numpy as np
+import sys
+import time
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from config import EXPENSE_TYPES
+from utils.data_loader import (
+    concat_ledgers, read_ledger, get_cache_path, get_available_years, load_all_processed_data, PARQUET_AVAILABLE
+)
+from utils.catalog import get_catalog
+from utils.schema import read_ledger_csv
+from utils.money import parse_brl
+from utils.preprocessing import preprocess_financial_data, calculate_financial_metrics, FinancialMetricsAccumulator
+from utils.streaming import iter_file_chunks
+from utils.query import scan
+from utils.dates import parse_dates, derive_date_columns
+from utils.cards import CardSpendMatrix
+from utils.audit import CardAuditEngine
+from utils.tables import TableIndex, page_rows, top_positions, with_others
+from utils.styling import (
+    format_table_currency, format_currency, format_percentage,
+    format_currency_array, format_percentage_array
+)
+from utils.export import EXPORT_FORMATS, export_bytes
+from utils.vehicles import VehicleTimeSeries
+from utils.cube import LedgerCube
+from utils.comparison import YearComparison
+
+# pyarrow é opcional (ver data_loader): sem ele os benchmarks do cache Parquet
+# são pulados e os tamanhos em Arrow não são medidos
+if PARQUET_AVAILABLE:
+    import pyarrow as pa
+
+def generate_synthetic_ledger(filepath, n_rows, year=2024, seed=42):
+    """
+    Gera um arquivo CSV sintético no formato dos arquivos lgd{ano}.csv
+
+    Args:
+        filepath (str | Path): Caminho do arquivo CSV a ser criado
+        n_rows (int): Número de lançamentos
+        year (int): Ano dos lançamentos
+        seed (int): Semente do gerador aleatório
+
+    Returns:
+        Path: Caminho do arquivo criado
+    """
+    rng = np.random.default_rng(seed)
+
+    dias = pd.Timestamp(f"{year}-01-01") + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D')
+    valores = rng.gamma(2.0, 400.0, n_rows).round(2)
+
+    # Valores no formato brasileiro, como exportados da planilha (R$ 1.234,56)
+    valores_brl = pd.Series(valores).map(
+        lambda v: f"R$ {v:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+    )
+
+    contas = np.array(['Itaú', 'Bradesco', 'Medição', '4321', '8765', '1122', 'caixa '], dtype=object)
+    categorias = np.array(['Combustível', 'Manutenção', 'Aluguel', 'Salários', 'Alimentação',
+                           'Impostos', 'Pedágio', 'Material', 'Viagem', 'Energia'], dtype=object)
+    gastos = np.array(list(EXPENSE_TYPES) + ['Receita', 'fixo ', 'variável'], dtype=object)
+    usuarios = np.array([f"Funcionário {i:02d}" for i in range(1, 21)], dtype=object)
+    veiculos = np.array([f"ABC{i:04d}" for i in range(1, 31)] + [None], dtype=object)
+
+    veiculo = rng.choice(veiculos, n_rows)
+    com_veiculo = pd.notna(veiculo)
+    litros = np.where(com_veiculo & (rng.random(n_rows) < 0.5), rng.uniform(20, 80, n_rows).round(2), np.nan)
+    km = np.where(com_veiculo, rng.integers(10_000, 200_000, n_rows), np.nan)
+
+    df = pd.DataFrame({
+        'Data': dias.strftime('%Y-%m-%d'),
+        'Valor': valores_brl,
+        'Tipo': rng.choice(np.array(['Fixo', 'Variável', 'Não Operacional', None], dtype=object), n_rows),
+        'Categoria': rng.choice(categorias, n_rows),
+        'Conta': rng.choice(contas, n_rows),
+        'GASTOS': rng.choice(gastos, n_rows),
+        'Usuário': rng.choice(usuarios, n_rows),
+        'Veículos': veiculo,
+        'KM': km,
+        'Litros': litros,
+        'Descrição': [f"Lançamento {i}" for i in range(n_rows)],
+    })
+
+    filepath = Path(filepath)
+    df.to_csv(filepath, index=False)
+    return filepath
+
+def _best_time(func, repeat=3):
+    """Executa a função algumas vezes e retorna o menor tempo em segundos"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def _peak_memory(func):
+    """Executa a função e retorna (tempo em segundos, pico de memória em MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+def _parse_money_replace_chain(series):
+    """Conversão de Valor anterior a utils.money: três str.replace e pd.to_numeric"""
+    series = series.astype(str)
+    series = series.str.replace('R\\$', '', regex=True)
+    series = series.str.replace('.', '', regex=False)
+    series = series.str.replace(',', '.', regex=False)
+    return pd.to_numeric(series, errors='coerce').fillna(0)
+
+def benchmark_parse_money(n_rows=3_000_000, repeat=3):
+    """
+    Compara a conversão de valores em reais (R$ 1.234,56) por encadeamento de
+    str.replace com a conversão vetorizada de utils.money.parse_brl
+
+    Args:
+        n_rows (int): Número de valores a converter
+        repeat (int): Número de repetições de cada medição
+
+    Returns:
+        dict: Tempos em segundos de cada conversão
+    """
+    rng = np.random.default_rng(42)
+    centavos = rng.gamma(2.0, 40_000.0, n_rows).astype(np.int64)
+    reais = pd.Series(centavos // 100).map('{:,}'.format).str.replace(',', '.', regex=False)
+    series = 'R$ ' + reais + ',' + pd.Series(centavos % 100).map('{:02d}'.format)
+
+    results = {
+        'str.replace': _best_time(lambda: _parse_money_replace_chain(series), repeat),
+        'parse_brl': _best_time(lambda: parse_brl(series), repeat),
+        'parse_brl (centavos)': _best_time(lambda: parse_brl(series, centavos=True), repeat),
+    }
+    assert (parse_brl(series, centavos=True).to_numpy() == centavos).all()
+
+    baseline = results['str.replace']
+    print(f"conversão de Valor ({n_rows} linhas, {series.nunique()} valores distintos): " + " | ".join(
+        f"{name} {elapsed:.3f}s ({baseline / elapsed:.1f}x)" for name, elapsed in results.items()
+    ))
+    return results
+
+def _date_columns_dt_accessor(series):
+    """Derivação das colunas de data por Series.dt sobre todas as linhas (implementação anterior)"""
+    datas = pd.to_datetime(series, errors='coerce')
+    return {
+        'Mes': datas.dt.month,
+        'Mes_Nome': datas.dt.month_name(),
+        'Ano': datas.dt.year,
+        'Mês Ano': datas.dt.strftime('%B %Y'),
+    }
+
+def benchmark_date_columns(n_rows=1_000_000, repeat=3):
+    """
+    Compara a derivação das colunas de data linha a linha e por data distinta
+
+    Args:
+        n_rows (int): Número de datas (de um ano, em texto AAAA-MM-DD)
+        repeat (int): Repetições de cada medição (vale a menor)
+
+    Returns:
+        dict: Tempo em segundos de cada implementação
+    """
+    rng = np.random.default_rng(42)
+    dias = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 366, n_rows), unit='D')
+    series = pd.Series(dias.strftime('%Y-%m-%d'))
+
+    results = {
+        'Series.dt': _best_time(lambda: _date_columns_dt_accessor(series), repeat),
+        'datas distintas': _best_time(lambda: derive_date_columns(parse_dates(series)), repeat),
+    }
+    baseline = results['Series.dt']
+    print(f"colunas de data ({n_rows} linhas): " + " | ".join(
+        f"{name} {elapsed:.3f}s ({baseline / elapsed:.1f}x)" for name, elapsed in results.items()
+    ))
+    return results
+
+def _synthetic_processed_frame(n_rows, seed=42):
+    """DataFrame já no formato de preprocess_financial_data, gerado direto em memória"""
+    rng = np.random.default_rng(seed)
+    gastos = list(EXPENSE_TYPES) + ['Receita']
+    categorias = [f"Categoria {i:02d}" for i in range(40)]
+    return pd.DataFrame({
+        'Valor': rng.gamma(2.0, 400.0, n_rows).round(2),
+        'Mes': rng.integers(1, 13, n_rows).astype(np.int32),
+        'GASTOS': pd.Categorical.from_codes(rng.integers(0, len(gastos), n_rows), sorted(gastos)),
+        'Categoria': pd.Categorical.from_codes(rng.integers(0, len(categorias), n_rows), categorias),
+    })
+
+def _metrics_mask_per_type(df):
+    """Métricas como eram calculadas antes: uma máscara por tipo e um groupby por dimensão"""
+    df_filtered = df[df['GASTOS'].isin(EXPENSE_TYPES)]
+    metrics = {'total_despesas': df_filtered['Valor'].sum()}
+    for tipo in EXPENSE_TYPES:
+        metrics[tipo] = df_filtered[df_filtered['GASTOS'] == tipo]['Valor'].sum()
+    metrics['despesas_por_mes'] = df_filtered.groupby('Mes')['Valor'].sum().to_dict()
+    metrics['despesas_por_categoria'] = df_filtered.groupby('Categoria', observed=True)['Valor'].sum().to_dict()
+    return metrics
+
+def benchmark_metrics_scaling(sizes=(100_000, 300_000, 1_000_000, 3_000_000), repeat=3):
+    """
+    Mede como calculate_financial_metrics escala com o número de linhas,
+    comparando com o cálculo anterior (uma máscara por tipo de despesa)
+
+    Args:
+        sizes (tuple): Números de linhas a medir
+        repeat (int): Número de repetições de cada medição
+
+    Returns:
+        pandas.DataFrame: Tempos em segundos por número de linhas
+    """
+    rows = []
+    for n_rows in sizes:
+        df = _synthetic_processed_frame(n_rows)
+        rows.append({
+            'Linhas': n_rows,
+            'Máscara por tipo (s)': _best_time(lambda: _metrics_mask_per_type(df), repeat),
+            'Agregação única (s)': _best_time(lambda: calculate_financial_metrics(df), repeat),
+        })
+
+    report = pd.DataFrame(rows).set_index('Linhas')
+    report['Ganho'] = report['Máscara por tipo (s)'] / report['Agregação única (s)']
+    print(report.round(4).to_string())
+    return report
+
+def _card_filters_pandas(df, usuarios, meses):
+    """Filtros e agrupamentos da página de cartões com pandas (implementação anterior)"""
+    df = df[df['Usuário'].isin(usuarios) & df['Mes'].isin(meses)]
+    por_categoria = df.groupby('Categoria', observed=True)['Valor'].sum()
+    top_categorias = por_categoria.nlargest(3).index
+    return (
+        df['Valor'].sum(),
+        df.groupby('Usuário', observed=True)['Valor'].sum(),
+        por_categoria,
+        df.groupby('Mes').agg({'Valor': 'sum', 'Usuário': 'count'}),
+        df[df['Categoria'].isin(top_categorias)].groupby(['Usuário', 'Categoria'], observed=True)['Valor'].sum(),
+        df.index,
+    )
+
+def _card_filters_matrix(matrix, usuarios, meses):
+    """Os mesmos resultados de _card_filters_pandas a partir da CardSpendMatrix"""
+    gastos = matrix.select(usuarios, meses)
+    return (
+        gastos.total(),
+        gastos.by_user(),
+        gastos.by_category(),
+        gastos.by_month(),
+        gastos.by_user_category(gastos.by_category().nlargest(3).index),
+        matrix.positions(usuarios, meses),
+    )
+
+def benchmark_card_filters(n_rows=1_000_000, n_users=500, repeat=3):
+    """
+    Compara uma troca de filtro da página de cartões com pandas e com a matriz
+
+    Args:
+        n_rows (int): Número de lançamentos de cartão
+        n_users (int): Número de funcionários
+        repeat (int): Repetições de cada medição (vale a menor)
+
+    Returns:
+        dict: Tempo em segundos de cada implementação e da montagem da matriz
+    """
+    rng = np.random.default_rng(42)
+    usuarios = [f"Funcionário {i:03d}" for i in range(n_users)]
+    df = _synthetic_processed_frame(n_rows).assign(
+        Usuário=pd.Categorical.from_codes(rng.integers(0, n_users, n_rows), usuarios)
+    )
+    selecionados, meses = usuarios[:5], [3, 4, 5]
+
+    matrix = CardSpendMatrix(df)
+    results = {
+        'montagem da matriz': _best_time(lambda: CardSpendMatrix(df), repeat),
+        'pandas': _best_time(lambda: _card_filters_pandas(df, selecionados, meses), repeat),
+        'matriz': _best_time(lambda: _card_filters_matrix(matrix, selecionados, meses), repeat),
+    }
+    print(f"filtro de cartões ({n_rows} linhas, {n_users} funcionários): " + " | ".join(
+        f"{name} {elapsed:.4f}s" for name, elapsed in results.items()
+    ))
+    return results
+
+def benchmark_card_audit(n_rows=1_000_000, n_appended=1_000, n_users=500, repeat=3):
+    """
+    Compara a auditoria de cartões refeita do zero com a atualização incremental
+
+    Args:
+        n_rows (int): Número de lançamentos de cartão já auditados
+        n_appended (int): Número de lançamentos acrescentados
+        n_users (int): Número de funcionários
+        repeat (int): Repetições de cada medição (vale a menor)
+
+    Returns:
+        dict: Tempo em segundos de cada modo
+    """
+    rng = np.random.default_rng(42)
+    usuarios = [f"Funcionário {i:03d}" for i in range(n_users)]
+    total = n_rows + n_appended
+    df = _synthetic_processed_frame(total).assign(
+        Usuário=pd.Categorical.from_codes(rng.integers(0, n_users, total), usuarios)
+    )
+    historico, novos = df.iloc[:n_rows], df.iloc[n_rows:]
+
+    def full():
+        CardAuditEngine().update(df)
+
+    def incremental():
+        engine = CardAuditEngine()
+        engine.update(historico)
+        start = time.perf_counter()
+        engine.update(novos)
+        return time.perf_counter() - start
+
+    results = {
+        'auditoria completa': _best_time(full, repeat),
+        'incremental': min(incremental() for _ in range(repeat)),
+    }
+    print(f"auditoria de cartões ({n_rows} + {n_appended} linhas): " + " | ".join(
+        f"{name} {elapsed:.4f}s" for name, elapsed in results.items()
+    ))
+    return results
+
+def _synthetic_card_table(n_rows, seed=42):
+    """Lançamentos com as colunas da tabela de transações de cartão"""
+    rng = np.random.default_rng(seed)
+    return _synthetic_processed_frame(n_rows, seed).assign(
+        Data=pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n_rows), unit='D'),
+        Descrição=[f"Lançamento {i}" for i in range(n_rows)],
+    )
+
+def benchmark_card_table(n_rows=200_000, page_size=50, repeat=3):
+    """
+    Compara a tabela de transações completa com a paginada pelo TableIndex
+
+    Mede o tempo de uma execução da página (ordenar/selecionar e formatar) e o
+    tamanho em Arrow do que é enviado ao navegador.
+
+    Args:
+        n_rows (int): Número de lançamentos de cartão
+        page_size (int): Linhas por página
+        repeat (int): Repetições de cada medição (vale a menor)
+
+    Returns:
+        dict: Tempo em segundos e bytes enviados de cada modo
+    """
+    columns = ['Data', 'Categoria', 'Valor', 'Descrição']
+    df = _synthetic_card_table(n_rows)
+    index = TableIndex(df, 'Data', ascending=False, search_column='Descrição')
+
+    def full():
+        return format_table_currency(df[columns].sort_values('Data', ascending=False), ['Valor'])
+
+    def paged():
+        rows = index.rows(search='lançamento 1')
+        return format_table_currency(df.iloc[page_rows(rows, 2, page_size)][columns], ['Valor'])
+
+    results = {
+        'montagem do índice': _best_time(lambda: TableIndex(df, 'Data', ascending=False, search_column='Descrição'), repeat),
+        'tabela completa': _best_time(full, repeat),
+        'página com busca': _best_time(paged, repeat),
+    }
+    sizes = {}
+    if PARQUET_AVAILABLE:
+        sizes = {
+            'tabela completa': pa.Table.from_pandas(full()).nbytes,
+            'página com busca': pa.Table.from_pandas(paged()).nbytes,
+        }
+    print(f"tabela de transações ({n_rows} linhas, {page_size} por página): " + " | ".join(
+        f"{name} {elapsed:.4f}s" + (f" ({sizes[name] / 1e3:.1f} kB)" if name in sizes else "")
+        for name, elapsed in results.items()
+    ))
+    return {'tempo': results, 'bytes': sizes}
+
+def benchmark_export(n_rows=50_000):
+    """
+    Compara o CSV montado a cada execução da página (texto formatado) com a
+    exportação sob demanda em cada formato
+
+    Args:
+        n_rows (int): Número de lançamentos exportados
+
+    Returns:
+        dict: (tempo em segundos, pico de memória em MB, tamanho em MB) por modo
+    """
+    columns = ['Data', 'Categoria', 'Valor', 'Descrição']
+    df = _synthetic_card_table(n_rows)[columns]
+
+    modes = {'CSV formatado (anterior)': lambda: format_table_currency(df, ['Valor']).to_csv(index=False).encode('utf-8')}
+    modes.update({fmt: (lambda fmt=fmt: export_bytes(df, fmt)) for fmt in EXPORT_FORMATS})
+
+    results = {}
+    for name, func in modes.items():
+        # O tracemalloc deixa o código Python bem mais lento: o tempo é medido sem ele
+        _, peak = _peak_memory(func)
+        results[name] = (_best_time(func, repeat=1), peak, len(func()) / 1e6)
+    print(f"exportação ({n_rows} linhas): " + " | ".join(
+        f"{name} {elapsed:.3f}s, pico {peak:.1f} MB, arquivo {size:.1f} MB"
+        for name, (elapsed, peak, size) in results.items()
+    ))
+    return results
+
+def _vehicle_page_pandas(df):
+    """Agregações da página de veículos como eram feitas antes, a cada execução"""
+    km = df.groupby('Veículos', observed=True)['KM'].agg(['min', 'max'])
+    km_total = (km['max'] - km['min']).sum()
+    por_veiculo = df.groupby('Veículos', observed=True)['Valor'].sum()
+    abastecimentos = df[df['Litros'] > 0].groupby('Veículos', observed=True).agg(
+        {'KM': 'max', 'Litros': 'sum', 'Valor': 'sum'}
+    )
+    mensal = df.groupby(df['Data'].dt.to_period('M')).agg({
+        'Valor': 'sum',
+        'KM': lambda x: x.max() - x.min(),
+        'Litros': 'sum'
+    })
+    return km_total, por_veiculo, abastecimentos, mensal
+
+def _vehicle_page_series(series):
+    """Os mesmos resultados a partir da VehicleTimeSeries já montada"""
+    return series.metrics(), series.summary(), series.monthly()
+
+def benchmark_vehicle_series(n_rows=1_000_000, n_vehicles=500, repeat=3):
+    """
+    Compara as agregações da página de veículos com pandas e com a
+    VehicleTimeSeries memorizada
+
+    Args:
+        n_rows (int): Número de lançamentos de veículos
+        n_vehicles (int): Número de veículos
+        repeat (int): Repetições de cada medição (vale a menor)
+
+    Returns:
+        dict: Tempo em segundos de cada implementação e da montagem das séries
+    """
+    rng = np.random.default_rng(42)
+    placas = [f"ABC{i:04d}" for i in range(n_vehicles)]
+    df = _synthetic_card_table(n_rows).assign(
+        Veículos=pd.Categorical.from_codes(rng.integers(0, n_vehicles, n_rows), placas),
+        KM=rng.integers(10_000, 200_000, n_rows).astype(float),
+        Litros=np.where(rng.random(n_rows) < 0.5, rng.uniform(20, 80, n_rows).round(2), np.nan),
+    )
+
+    series = VehicleTimeSeries(df)
+    results = {
+        'montagem das séries': _best_time(lambda: VehicleTimeSeries(df), repeat),
+        'pandas por execução': _best_time(lambda: _vehicle_page_pandas(df), repeat),
+        'séries memorizadas': _best_time(lambda: _vehicle_page_series(series), repeat),
+    }
+    print(f"página de veículos ({n_rows} linhas, {n_vehicles} veículos): " + " | ".join(
+        f"{name} {elapsed:.4f}s" for name, elapsed in results.items()
+    ))
+    return results
+
+def _fleet_page_full(summary):
+    """Gráficos e tabela da frota com todos os veículos (modo anterior)"""
+    por_veiculo = summary[['Veículos', 'Valor']].sort_values('Valor', ascending=False)
+    tabela = format_table_currency(summary, ['Valor', 'Custo_por_KM'])
+    tabela['Eficiencia'] = tabela['Eficiencia'].apply(lambda x: f"{x:.2f} km/l")
+    return por_veiculo, summary[['Veículos', 'Eficiencia']], tabela
+
+def _fleet_page_ranked(summary, index, n, page_size):
+    """Os N maiores com "Outros", ranking de eficiência e uma página da tabela"""
+    por_veiculo = with_others(summary, top_positions(summary['Valor'], n), 'Veículos', 'Valor')
+    eficiencia = summary.iloc[top_positions(summary['Eficiencia'], n)]
+    pagina = format_table_currency(summary.iloc[page_rows(index.rows(), 1, page_size)], ['Valor', 'Custo_por_KM'])
+    pagina['Eficiencia'] = pagina['Eficiencia'].apply(lambda x: f"{x:.2f} km/l")
+    return por_veiculo, eficiencia, pagina
+
+def benchmark_fleet_ranking(fleet_sizes=(100, 1_000, 10_000, 100_000), n=20, page_size=50, repeat=3):
+    """
+    Compara a página de veículos com todos os veículos e no modo de frota
+    (ranking dos N maiores, barra "Outros" e tabela paginada)
+
+    Args:
+        fleet_sizes (tuple): Números de veículos
+        n (int): Veículos por gráfico no ranking
+        page_size (int): Linhas por página da tabela
+        repeat (int): Repetições de cada medição (vale a menor)
+
+    Returns:
+        dict: Tempos em segundos (todos, ranking) por tamanho de frota
+    """
+    rng = np.random.default_rng(42)
+    results = {}
+    for size in fleet_sizes:
+        summary = pd.DataFrame({
+            'Veículos': [f"ABC{i:06d}" for i in range(size)],
+            'Valor': rng.gamma(2.0, 40_000.0, size).round(2),
+            'Eficiencia': rng.uniform(4, 15, size),
+            'Custo_por_KM': rng.uniform(0.2, 2.0, size),
+        })
+        index = TableIndex(summary, 'Eficiencia', ascending=False, search_column='Veículos')
+        results[size] = (
+            _best_time(lambda: _fleet_page_full(summary), repeat),
+            _best_time(lambda: _fleet_page_ranked(summary, index, n, page_size), repeat),
+        )
+    print(f"frota (top {n}, {page_size} por página): " + " | ".join(
+        f"{size} veículos: todos {full:.4f}s, ranking {ranked:.4f}s" for size, (full, ranked) in results.items()
+    ))
+    return results
+
+def _comparison_per_year(df, years):
+    """Comparativo como era feito antes: uma fatia e um cálculo de métricas por ano"""
+    metrics = {year: calculate_financial_metrics(df[df['Ano'] == year]) for year in years}
+    por_categoria = df.groupby(['Ano', 'Categoria'], observed=True)['Valor'].sum()
+    por_mes = df.groupby(['Ano', 'Mes'])['Valor'].sum()
+    return metrics, por_categoria, por_mes
+
+def _comparison_single_pass(cube, years):
+    """Os mesmos valores em uma única agregação do cubo dos anos"""
+    comparison = YearComparison(cube, years)
+    return comparison.expense_table(), comparison.by_category(), comparison.by_month()
+
+def benchmark_year_comparison(year_counts=(2, 5, 10), rows_per_year=300_000, repeat=3):
+    """
+    Compara o comparativo anual por fatias de cada ano com a agregação única do cubo
+
+    Args:
+        year_counts (tuple): Números de anos comparados
+        rows_per_year (int): Lançamentos por ano
+        repeat (int): Repetições de cada medição (vale a menor)
+
+    Returns:
+        dict: Tempos em segundos (por ano, agregação única) por número de anos
+    """
+    results = {}
+    for n_years in year_counts:
+        years = list(range(2024 - n_years + 1, 2025))
+        frames = [
+            _synthetic_processed_frame(rows_per_year, seed=year).assign(Ano=np.int32(year))
+            for year in years
+        ]
+        df = concat_ledgers(frames)
+        # Cubos por ano, como ficam memorizados por get_cube
+        cube = LedgerCube.from_frame(frames[0])
+        for frame in frames[1:]:
+            cube = cube.combine(LedgerCube.from_frame(frame))
+        results[n_years] = (
+            _best_time(lambda: _comparison_per_year(df, years), repeat),
+            _best_time(lambda: _comparison_single_pass(cube, years), repeat),
+        )
+    print(f"comparativo anual ({rows_per_year} linhas por ano): " + " | ".join(
+        f"{n} anos: por ano {old:.3f}s, agregação única {new:.4f}s" for n, (old, new) in results.items()
+    ))
+    return results
+
+def _format_table_per_cell(values, percent_rows):
+    """Formatação célula a célula, como a tabela comparativa fazia (iterrows e .at[])"""
+    df = pd.DataFrame(values).astype(object)
+    for idx, row in df.iterrows():
+        fmt = format_percentage if percent_rows[idx] else format_currency
+        for col in df.columns:
+            df.at[idx, col] = fmt(row[col])
+    return df
+
+def _format_table_vectorized(values, percent_rows):
+    """Formatação da tabela inteira com format_currency_array/format_percentage_array"""
+    return pd.DataFrame(np.where(
+        percent_rows[:, None], format_percentage_array(values), format_currency_array(values)
+    ))
+
+def benchmark_table_formatting(shapes=((11, 10), (1_000, 10), (10_000, 12)), repeat=3):
+    """
+    Compara a formatação célula a célula (moeda e percentual) com a vetorizada
+
+    Args:
+        shapes (tuple): Formatos (linhas, colunas) das tabelas; um terço das
+            linhas é de percentuais
+        repeat (int): Repetições de cada medição (vale a menor)
+
+    Returns:
+        dict: Tempos em segundos (célula a célula, vetorizada) por formato
+    """
+    rng = np.random.default_rng(42)
+    results = {}
+    for n_rows, n_cols in shapes:
+        values = np.round(rng.lognormal(10, 2, (n_rows, n_cols)) * rng.choice([-1, 1], (n_rows, n_cols)), 2)
+        percent_rows = np.arange(n_rows) % 3 == 2
+        assert _format_table_per_cell(values, percent_rows).equals(_format_table_vectorized(values, percent_rows))
+        results[(n_rows, n_cols)] = (
+            _best_time(lambda: _format_table_per_cell(values, percent_rows), repeat),
+            _best_time(lambda: _format_table_vectorized(values, percent_rows), repeat),
+        )
+    print("formatação de tabelas: " + " | ".join(
+        f"{r}x{c}: célula a célula {old:.4f}s, vetorizada {new:.4f}s ({old / new:.0f}x)"
+        for (r, c), (old, new) in results.items()
+    ))
+    return results
+
+def benchmark_load_data(n_rows=300_000, repeat=3):
+    """
+    Compara a leitura do CSV (cache frio) com a leitura do cache Parquet (cache quente)
+
+    Args:
+        n_rows (int): Número de lançamentos do arquivo sintético
+        repeat (int): Número de repetições de cada medição
+
+    Returns:
+        dict: Tempos em segundos para cada modo de leitura (vazio sem pyarrow)
+    """
+    if not PARQUET_AVAILABLE:
+        print("load_data: pyarrow não instalado, sem cache Parquet para comparar")
+        return {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = generate_synthetic_ledger(Path(tmp_dir) / 'lgd2024.csv', n_rows)
+        cache_path = get_cache_path(filepath)
+
+        def cold():
+            cache_path.unlink(missing_ok=True)
+            read_ledger(filepath, use_cache=False)
+
+        cold_time = _best_time(cold, repeat)
+        read_ledger(filepath)  # grava o cache
+        warm_time = _best_time(lambda: read_ledger(filepath), repeat)
+
+    results = {'csv_frio': cold_time, 'cache_quente': warm_time}
+    print(f"load_data ({n_rows} linhas): CSV {cold_time:.3f}s | "
+          f"cache Parquet {warm_time:.3f}s | {cold_time / warm_time:.1f}x")
+    return results
+
+def benchmark_incremental_append(n_rows=300_000, n_appended=1_000, repeat=3):
+    """
+    Compara a releitura completa com a leitura incremental após acrescentar linhas
+
+    Args:
+        n_rows (int): Número de lançamentos do arquivo sintético
+        n_appended (int): Linhas acrescentadas ao fim do arquivo a cada rodada
+        repeat (int): Número de repetições de cada medição
+
+    Returns:
+        dict: Tempos em segundos para cada modo de leitura (vazio sem pyarrow)
+    """
+    if not PARQUET_AVAILABLE:
+        print("acréscimo de linhas: pyarrow não instalado, sem cache Parquet para a leitura incremental")
+        return {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source = generate_synthetic_ledger(Path(tmp_dir) / 'fonte.csv', n_rows + n_appended * repeat)
+        lines = source.read_bytes().splitlines(keepends=True)
+        filepath = Path(tmp_dir) / 'lgd2024.csv'
+        filepath.write_bytes(b''.join(lines[:n_rows + 1]))
+
+        full_time = _best_time(lambda: read_ledger(filepath, use_cache=False), repeat)
+
+        read_ledger(filepath)  # grava o cache
+        timings = []
+        for i in range(repeat):
+            start = 1 + n_rows + i * n_appended
+            with open(filepath, 'ab') as f:
+                f.write(b''.join(lines[start:start + n_appended]))
+            timings.append(_best_time(lambda: read_ledger(filepath), 1))
+        incremental_time = min(timings)
+
+    results = {'releitura_completa': full_time, 'incremental': incremental_time}
+    print(f"acréscimo de {n_appended} linhas a {n_rows}: releitura {full_time:.3f}s | "
+          f"incremental {incremental_time:.3f}s | {full_time / incremental_time:.1f}x")
+    return results
+
+def benchmark_streaming_metrics(n_rows=300_000, chunksize=50_000):
+    """
+    Compara o pico de memória das métricas com o arquivo inteiro e em streaming
+
+    Args:
+        n_rows (int): Número de lançamentos do arquivo sintético
+        chunksize (int): Linhas por bloco no modo streaming
+
+    Returns:
+        dict: Tempo e pico de memória (MB) de cada modo
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = generate_synthetic_ledger(Path(tmp_dir) / 'lgd2024.csv', n_rows)
+
+        def full():
+            calculate_financial_metrics(preprocess_financial_data(pd.read_csv(filepath)))
+
+        def streaming():
+            accumulator = FinancialMetricsAccumulator()
+            for chunk in iter_file_chunks(filepath, chunksize):
+                accumulator.update(chunk)
+            accumulator.result()
+
+        results = {'completo': _peak_memory(full), 'streaming': _peak_memory(streaming)}
+
+    for mode, (elapsed, peak) in results.items():
+        print(f"métricas {mode} ({n_rows} linhas): {elapsed:.3f}s | pico {peak:.1f} MB")
+    return results
+
+def report_memory_usage(filepaths):
+    """
+    Compara o uso de memória (memory_usage(deep=True)) sem e com o esquema tipado
+
+    Args:
+        filepaths (dict): Mapeamento ano -> caminho do CSV
+
+    Returns:
+        pandas.DataFrame: Memória em MB por ano, lida sem esquema (tudo object)
+            e com esquema, antes e depois do pré-processamento
+    """
+    rows = []
+    for year, filepath in sorted(filepaths.items()):
+        untyped = pd.read_csv(filepath, delimiter=',', encoding='utf-8')
+        typed = read_ledger_csv(filepath)
+        rows.append({
+            'Ano': year,
+            'Linhas': len(typed),
+            'Leitura sem esquema (MB)': untyped.memory_usage(deep=True).sum() / 1e6,
+            'Leitura com esquema (MB)': typed.memory_usage(deep=True).sum() / 1e6,
+            'Processado sem esquema (MB)': preprocess_financial_data(untyped).memory_usage(deep=True).sum() / 1e6,
+            'Processado com esquema (MB)': preprocess_financial_data(typed).memory_usage(deep=True).sum() / 1e6,
+        })
+
+    report = pd.DataFrame(rows).set_index('Ano')
+    print(report.round(1).to_string())
+    return report
+
+def benchmark_memory_usage(n_rows=300_000, years=(2023, 2024, 2025)):
+    """
+    Relatório de memória por ano (ver report_memory_usage) sobre dados sintéticos
+
+    Args:
+        n_rows (int): Número de lançamentos por ano
+        years (tuple): Anos a gerar
+
+    Returns:
+        pandas.DataFrame: Relatório de memória por ano
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepaths = {
+            year: generate_synthetic_ledger(Path(tmp_dir) / f'lgd{year}.csv', n_rows, year=year, seed=year)
+            for year in years
+        }
+        return report_memory_usage(filepaths)
+
+def benchmark_query_pushdown(years=None):
+    """
+    Compara uma consulta de um único funcionário via scan() com a carga completa
+
+    Usa os arquivos de dados configurados. A consulta por scan() roda primeiro,
+    com os anos ainda fora da memória, e lê só as colunas usadas; a alternativa
+    carrega e pré-processa todos os anos (load_all_processed_data) e filtra.
+
+    Args:
+        years (list, optional): Anos a consultar; por padrão, todos os disponíveis
+
+    Returns:
+        dict: Tempo e pico de memória (MB) de cada modo
+    """
+    years = get_available_years() if years is None else years
+    columns = ['Data', 'Valor', 'Categoria', 'Mes']
+    usuario = read_ledger(get_catalog().get_path(years[0]), columns=['Usuário'])['Usuário'].dropna().iloc[0]
+
+    def pushdown():
+        scan(years).filter({'Usuário': usuario}).select(*columns).collect()
+
+    def full():
+        df = load_all_processed_data(years)
+        df[df['Usuário'] == usuario][columns]
+
+    results = {'scan': _peak_memory(pushdown), 'carga_completa': _peak_memory(full)}
+    for mode, (elapsed, peak) in results.items():
+        print(f"consulta de um funcionário em {len(years)} anos, {mode}: {elapsed:.3f}s | pico {peak:.1f} MB")
+    return results
+
+# Páginas do menu lateral de main.py
+PAGES = [
+    "📊 Gastos Gerais",
+    "💳 Cartões Corporativos",
+    "🚗 Análise de Veículos",
+    "📅 Comparativo Anual",
+    "💰 Balanço Financeiro",
+]
+
+def benchmark_page_memory(pages=PAGES, timeout=300):
+    """
+    Mede o pico de memória (tracemalloc) da renderização de cada página do app
+
+    As páginas são renderizadas com streamlit.testing sobre os arquivos de dados
+    configurados (DATA_PATH), no mesmo processo. Cada página é aberta duas vezes:
+    na primeira os dados do ano podem ainda precisar ser lidos e pré-processados,
+    na segunda vêm dos caches e o pico reflete só a montagem da página.
+
+    Args:
+        pages (list): Páginas do menu a renderizar, na ordem
+        timeout (int): Tempo máximo de cada renderização em segundos
+
+    Returns:
+        pandas.DataFrame: Tempo (s) e pico de memória (MB) por página e visita
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(Path(__file__).parent.parent / 'main.py'), default_timeout=timeout)
+
+    # A primeira execução do app já renderiza a página inicial do menu (PAGES[0])
+    elapsed, peak = _peak_memory(app.run)
+    rows = [{'Página': PAGES[0], 'Visita': 'primeira', 'Tempo (s)': elapsed, 'Pico (MB)': peak}]
+
+    for page in pages:
+        for visit in ('primeira', 'repetida'):
+            if visit == 'primeira' and page == PAGES[0]:
+                continue
+            # Passa por outra página antes da repetição, para renderizar esta de novo
+            if visit == 'repetida':
+                app.sidebar.radio[0].set_value(PAGES[0] if page != PAGES[0] else PAGES[-1]).run()
+            elapsed, peak = _peak_memory(lambda: app.sidebar.radio[0].set_value(page).run())
+            rows.append({'Página': page, 'Visita': visit, 'Tempo (s)': elapsed, 'Pico (MB)': peak})
+
+    report = pd.DataFrame(rows).pivot(index='Página', columns='Visita').reindex(list(pages))
+    print(report.round(2).to_string())
+    return report
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    print(f"Executando benchmarks com {n_rows} linhas...")
+
+    benchmark_parse_money(max(n_rows, 3_000_000))
+    benchmark_date_columns()
+    benchmark_load_data(n_rows)
+    benchmark_incremental_append(n_rows)
+    benchmark_streaming_metrics(n_rows)
+    benchmark_metrics_scaling()
+    benchmark_card_filters()
+    benchmark_card_audit()
+    benchmark_card_table()
+    benchmark_export()
+    benchmark_vehicle_series()
+    benchmark_fleet_ranking()
+    benchmark_year_comparison()
+    benchmark_table_formatting()
+    benchmark_memory_usage(n_rows)
+
+    # Relatório de memória também para os arquivos reais, se houver
+    years = get_available_years()
+    if years:
+        print("\nArquivos de dados reais:")
+        report_memory_usage({year: get_catalog().get_path(year) for year in years})
+        benchmark_query_pushdown(years)
+        print("\nMemória por página renderizada:")
+        benchmark_page_memory()
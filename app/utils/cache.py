@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Cache em memória, compartilhado pelo processo, com tamanho limitado e
+    descarte do item menos recentemente usado (LRU)
+
+    O Streamlit executa cada sessão em uma thread própria, por isso todas as
+    operações são protegidas por um lock.
+    """
+
+    def __init__(self, max_entries=8):
+        """
+        Args:
+            max_entries (int): Número máximo de itens mantidos no cache
+        """
+        self.max_entries = max(1, int(max_entries))
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Retorna o item da chave e o marca como recentemente usado"""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Armazena o item, descartando os mais antigos se o limite for excedido"""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def get_or_create(self, key, factory):
+        """
+        Retorna o item da chave, criando-o com factory() se não existir
+
+        Args:
+            key (hashable): Chave do item
+            factory (callable): Função sem argumentos que cria o item
+
+        Returns:
+            object: Item armazenado no cache
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def find(self, predicate, default=None):
+        """Retorna o item mais recente cuja chave satisfaz predicate(chave)"""
+        with self._lock:
+            for key in reversed(self._items):
+                if predicate(key):
+                    return self._items[key]
+            return default
+
+    def discard(self, predicate):
+        """Remove todos os itens cuja chave satisfaz predicate(chave)"""
+        with self._lock:
+            for key in [k for k in self._items if predicate(k)]:
+                del self._items[key]
+
+    def clear(self):
+        """Remove todos os itens do cache"""
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
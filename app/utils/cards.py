@@ -0,0 +1,311 @@
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from config import CACHE_MAX_ENTRIES
+from utils.cache import LRUCache
+from utils.data_loader import ledger_key
+from utils.query import scan
+from utils.streaming import cached_per_files
+from utils.tables import TableIndex
+
+# Lançamentos de cartão por ano, válidos enquanto os arquivos do ano não mudam,
+# e matrizes e índices derivados, válidos enquanto o recorte de cartão é o mesmo
+_card_transactions = LRUCache(CACHE_MAX_ENTRIES)
+_card_spend = LRUCache(CACHE_MAX_ENTRIES)
+_card_table_index = LRUCache(CACHE_MAX_ENTRIES)
+
+# Colunas dos lançamentos de cartão usadas pela página (as ausentes são ignoradas)
+CARD_COLUMNS = ['Data', 'Mes', 'Usuário', 'Conta', 'Categoria', 'Valor', 'Descrição']
+
+# Posição, no eixo de meses da matriz, dos lançamentos sem data válida
+_NO_MONTH = 12
+
+def _codes_with_missing(series):
+    """Códigos por ordem de aparição; valores ausentes vão para a última posição"""
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Index(np.asarray(uniques, dtype=object))
+    return np.where(codes < 0, len(uniques), codes), uniques
+
+class CardSpendSelection:
+    """
+    Recorte da matriz de gastos de cartão para alguns funcionários e meses
+
+    Todas as somas saem dos recortes das matrizes, sem percorrer os lançamentos.
+    Grupos sem lançamentos no recorte não aparecem nos resultados, como em um
+    groupby(observed=True).
+    """
+
+    def __init__(self, spend, count, users, categories):
+        """
+        Args:
+            spend (numpy.ndarray): Soma de Valor por funcionário × mês × categoria
+            count (numpy.ndarray): Número de lançamentos, com o mesmo formato
+            users (pandas.Index): Funcionários do primeiro eixo (o último eixo de
+                cada dimensão, sem rótulo, guarda os valores ausentes)
+            categories (pandas.Index): Categorias do terceiro eixo
+        """
+        self.spend = spend
+        self.count = count
+        self.users = users
+        self.categories = categories
+
+    def total(self):
+        """Soma de Valor no recorte"""
+        return self.spend.sum()
+
+    def transactions(self):
+        """Número de lançamentos no recorte"""
+        return int(self.count.sum())
+
+    def by_user(self):
+        """
+        Soma de Valor por funcionário
+
+        Returns:
+            pandas.Series: Somas indexadas por Usuário
+        """
+        spend = self.spend[:len(self.users)].sum(axis=(1, 2))
+        present = self.count[:len(self.users)].sum(axis=(1, 2)) > 0
+        return pd.Series(spend[present], index=self.users[present], name='Valor').rename_axis('Usuário')
+
+    def by_category(self):
+        """
+        Soma de Valor por categoria
+
+        Returns:
+            pandas.Series: Somas indexadas por Categoria
+        """
+        spend = self.spend[:, :, :len(self.categories)].sum(axis=(0, 1))
+        present = self.count[:, :, :len(self.categories)].sum(axis=(0, 1)) > 0
+        return pd.Series(spend[present], index=self.categories[present], name='Valor').rename_axis('Categoria')
+
+    def by_month(self):
+        """
+        Soma de Valor e número de transações por mês
+
+        Lançamentos sem data válida não entram; as transações contam apenas
+        lançamentos com funcionário informado.
+
+        Returns:
+            pandas.DataFrame: Colunas Mes, Valor e Transações, em ordem de mês
+        """
+        spend = self.spend[:, :_NO_MONTH].sum(axis=(0, 2))
+        present = self.count[:, :_NO_MONTH].sum(axis=(0, 2)) > 0
+        transactions = self.count[:len(self.users), :_NO_MONTH].sum(axis=(0, 2))
+        return pd.DataFrame({
+            'Mes': np.flatnonzero(present) + 1,
+            'Valor': spend[present],
+            'Transações': transactions[present],
+        })
+
+    def by_user_category(self, categories=None):
+        """
+        Soma de Valor por funcionário e categoria
+
+        Args:
+            categories (list, optional): Categorias a incluir; por padrão, todas
+
+        Returns:
+            pandas.DataFrame: Colunas Usuário, Categoria e Valor
+        """
+        spend = self.spend[:len(self.users), :, :len(self.categories)].sum(axis=1)
+        count = self.count[:len(self.users), :, :len(self.categories)].sum(axis=1)
+        present = count > 0
+        if categories is not None:
+            present &= self.categories.isin(categories)[None, :]
+        user_idx, category_idx = np.nonzero(present)
+        return pd.DataFrame({
+            'Usuário': self.users[user_idx],
+            'Categoria': self.categories[category_idx],
+            'Valor': spend[user_idx, category_idx],
+        })
+
+class CardSpendMatrix:
+    """
+    Gastos de cartão corporativo pré-agregados por funcionário × mês × categoria
+
+    Guarda a soma de Valor e o número de lançamentos de cada combinação, além
+    das posições das linhas de cada funcionário (agrupadas por funcionário,
+    em ordem). Os filtros de funcionário e mês viram recortes das matrizes e
+    a tabela de lançamentos é obtida pelas posições, sem comparar as linhas.
+    """
+
+    def __init__(self, df):
+        """
+        Args:
+            df (pandas.DataFrame): Lançamentos de cartão pré-processados
+                (colunas Usuário, Mes, Valor e, se houver, Categoria)
+        """
+        user_codes, self.users = _codes_with_missing(df['Usuário'])
+        # Sem a coluna Categoria, todos os lançamentos ficam na posição de ausentes
+        categorias = df['Categoria'] if 'Categoria' in df.columns else pd.Series(np.nan, index=df.index)
+        category_codes, self.categories = _codes_with_missing(categorias)
+        mes = df['Mes'].to_numpy(dtype=float)
+        self._month_codes = np.where(np.isnan(mes), _NO_MONTH, np.nan_to_num(mes) - 1).astype(np.int64)
+
+        shape = (len(self.users) + 1, _NO_MONTH + 1, len(self.categories) + 1)
+        combined = np.ravel_multi_index((user_codes, self._month_codes, category_codes), shape)
+        size = int(np.prod(shape))
+        self.spend = np.bincount(
+            combined, weights=np.nan_to_num(df['Valor'].to_numpy(dtype=float)), minlength=size
+        ).reshape(shape)
+        if pd.api.types.is_integer_dtype(df['Valor']):
+            # Valores em centavos continuam inteiros
+            self.spend = np.rint(self.spend).astype(np.int64)
+        self.count = np.bincount(combined, minlength=size).reshape(shape)
+
+        # Índice das linhas por funcionário: posições ordenadas por funcionário
+        # e, dentro de cada um, pela posição original
+        self._row_order = np.argsort(user_codes, kind='stable')
+        self._row_offsets = np.concatenate([[0], np.cumsum(np.bincount(user_codes, minlength=shape[0]))])
+
+    def _user_index(self, users):
+        """Posições dos funcionários no primeiro eixo (None: todos, inclusive não informados)"""
+        if users is None:
+            return np.arange(len(self.users) + 1)
+        index = self.users.get_indexer(list(users))
+        return index[index >= 0]
+
+    def _month_index(self, months):
+        """Posições dos meses no segundo eixo (None: todos, inclusive sem data)"""
+        if months is None:
+            return np.arange(_NO_MONTH + 1)
+        return np.array(sorted({int(m) - 1 for m in months if 1 <= m <= 12}), dtype=np.int64)
+
+    def select(self, users=None, months=None):
+        """
+        Recorta a matriz para alguns funcionários e meses
+
+        Args:
+            users (list, optional): Funcionários; por padrão, todos
+            months (list, optional): Meses (1 a 12); por padrão, todos
+
+        Returns:
+            CardSpendSelection: Recorte da matriz
+        """
+        user_index, month_index = self._user_index(users), self._month_index(months)
+        # Mantém o eixo completo de funcionários, zerando os não selecionados,
+        # para que as posições continuem alinhadas com self.users
+        user_mask = np.zeros(self.spend.shape[0], dtype=bool)
+        user_mask[user_index] = True
+        month_mask = np.zeros(self.spend.shape[1], dtype=bool)
+        month_mask[month_index] = True
+        keep = (user_mask[:, None] & month_mask[None, :])[:, :, None]
+        return CardSpendSelection(
+            np.where(keep, self.spend, 0), np.where(keep, self.count, 0), self.users, self.categories
+        )
+
+    def positions(self, users=None, months=None):
+        """
+        Posições (iloc) dos lançamentos de alguns funcionários e meses
+
+        Args:
+            users (list, optional): Funcionários; por padrão, todos
+            months (list, optional): Meses (1 a 12); por padrão, todos
+
+        Returns:
+            numpy.ndarray: Posições em ordem crescente
+        """
+        if users is None:
+            rows = np.arange(len(self._month_codes))
+        else:
+            rows = np.sort(np.concatenate([np.zeros(0, dtype=np.int64)] + [
+                self._row_order[self._row_offsets[i]:self._row_offsets[i + 1]]
+                for i in self._user_index(users)
+            ]))
+        if months is not None:
+            rows = rows[np.isin(self._month_codes[rows], self._month_index(months))]
+        return rows
+
+def get_card_transactions(year, months=None):
+    """
+    Retorna os lançamentos de cartão corporativo do ano (coluna Cartão)
+
+    O recorte é uma consulta (ver query.scan) que filtra a coluna Cartão e
+    projeta apenas CARD_COLUMNS: se o ano ainda não está em memória, só essas
+    colunas (e a Conta, de onde vem Cartão) são lidas dos arquivos. Ela é
+    executada uma vez enquanto os arquivos do ano não mudam (ver
+    streaming.cached_per_files), sem carregar o ano inteiro, e reaproveitada
+    em todas as execuções da página. O DataFrame retornado é compartilhado e
+    não deve ser modificado.
+
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+
+    Returns:
+        pandas.DataFrame: Lançamentos de cartão (índice de 0 a n-1), apenas
+            com as colunas de CARD_COLUMNS
+    """
+    query = scan(year).filter({'Cartão': True}).select(*CARD_COLUMNS)
+    if months is not None:
+        query = query.filter(Mes=list(months))
+    return cached_per_files(_card_transactions, year, months, query.collect)
+
+def _cached_per_card_frame(cache, year, months, build):
+    """
+    Retorna build(df_cartoes) memorizado enquanto o recorte de cartão é o mesmo
+
+    Para objetos derivados de get_card_transactions (matrizes, índices,
+    auditoria), cujas posições de linha se referem ao mesmo DataFrame.
+
+    Args:
+        cache (LRUCache): Cache do objeto derivado
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+        build (callable): Função que recebe os lançamentos de cartão do ano
+
+    Returns:
+        Resultado de build para o recorte de cartão atual
+    """
+    df_cartoes = get_card_transactions(year, months)
+    year_key = ledger_key(year, months)
+
+    cached = cache.get(year_key)
+    if cached is not None and cached[0] is df_cartoes:
+        return cached[1]
+
+    value = build(df_cartoes)
+    # O recorte fica guardado junto, para a comparação por identidade na próxima chamada
+    cache.put(year_key, (df_cartoes, value))
+    return value
+
+def get_card_spend(year, months=None):
+    """
+    Retorna a matriz de gastos de cartão do ano (ver CardSpendMatrix)
+
+    A matriz é montada uma vez por recorte de cartão; as posições de linha
+    se referem ao DataFrame de get_card_transactions.
+
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+
+    Returns:
+        CardSpendMatrix: Matriz de gastos do ano
+    """
+    return _cached_per_card_frame(_card_spend, year, months, CardSpendMatrix)
+
+def get_card_table_index(year, months=None):
+    """
+    Retorna a ordem (Data, mais recentes primeiro) e a busca por Descrição da
+    tabela de lançamentos de cartão do ano (ver tables.TableIndex)
+
+    O índice é montado uma vez por recorte de cartão; as posições se referem
+    ao DataFrame de get_card_transactions.
+
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+
+    Returns:
+        TableIndex: Índice da tabela do ano
+    """
+    return _cached_per_card_frame(
+        _card_table_index, year, months,
+        lambda df: TableIndex(df, 'Data', ascending=False, search_column='Descrição')
+    )
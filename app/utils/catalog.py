@@ -0,0 +1,239 @@
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar o módulo config
+sys.path.append(str(Path(__file__).parent.parent))
+from config import DATA_PATH, BASE_DIR, CATALOG_REFRESH_SECONDS
+
+# Partições anuais (lgd2024.csv) ou mensais (lgd2024-03.csv, lgd2024_03.csv, lgd202403.csv)
+PARTITION_PATTERN = re.compile(r'^lgd(\d{4})(?:[-_]?(\d{2}))?\.csv$', re.IGNORECASE)
+
+# Caminhos explícitos por ano no .env (DATA_2023=..., DATA_2024=...)
+ENV_PATH_PATTERN = re.compile(r'^DATA_(\d{4})$')
+
+@dataclass(frozen=True)
+class Partition:
+    """
+    Arquivo de dados de um ano inteiro ou de um único mês
+
+    Attributes:
+        year (int): Ano dos lançamentos
+        month (int | None): Mês dos lançamentos, ou None para arquivos anuais
+        path (Path): Caminho absoluto do arquivo CSV
+        size (int): Tamanho do arquivo em bytes
+        mtime_ns (int): Data de modificação do arquivo em nanossegundos
+    """
+    year: int
+    month: object
+    path: Path
+    size: int
+    mtime_ns: int
+
+    @property
+    def fingerprint(self):
+        """Identifica a versão do arquivo (caminho, tamanho e mtime)"""
+        return (str(self.path), self.size, self.mtime_ns)
+
+    def refreshed(self):
+        """
+        Retorna a partição com o tamanho e o mtime atuais do arquivo
+
+        Raises:
+            OSError: Se o arquivo não existir mais
+        """
+        stat = self.path.stat()
+        if stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns:
+            return self
+        return replace(self, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+def parse_partition_name(name):
+    """
+    Extrai ano e mês do nome de um arquivo de dados
+
+    Args:
+        name (str): Nome do arquivo (ex.: lgd2024.csv ou lgd2024-03.csv)
+
+    Returns:
+        tuple | None: (ano, mês ou None), ou None se o nome não for de uma partição
+    """
+    match = PARTITION_PATTERN.match(name)
+    if not match:
+        return None
+    month = int(match.group(2)) if match.group(2) else None
+    if month is not None and not 1 <= month <= 12:
+        return None
+    return int(match.group(1)), month
+
+def _explicit_paths_from_env():
+    """Lê os caminhos DATA_<ano> definidos no ambiente/.env"""
+    paths = {}
+    for key, value in os.environ.items():
+        match = ENV_PATH_PATTERN.match(key)
+        if match and value:
+            paths[int(match.group(1))] = Path(value)
+    return paths
+
+class DataCatalog:
+    """
+    Catálogo das partições de dados (arquivos anuais ou mensais)
+
+    Os diretórios de busca são varridos uma única vez e as partições de cada ano
+    ficam em um dicionário. Uma nova varredura só acontece quando o mtime de
+    algum diretório muda (arquivo criado, removido ou renomeado), e esse mtime
+    é consultado no máximo a cada `refresh_seconds` segundos. Acrescentar linhas a
+    um arquivo não muda o mtime do diretório, por isso tamanho e mtime de cada
+    partição são consultados novamente (um stat) sempre que ela é pedida.
+
+    Se um ano tiver arquivo anual e também arquivos mensais, o arquivo anual
+    prevalece e os mensais são ignorados, evitando lançamentos duplicados.
+    """
+
+    def __init__(self, search_dirs, explicit_paths=None, refresh_seconds=CATALOG_REFRESH_SECONDS):
+        """
+        Args:
+            search_dirs (list): Diretórios onde procurar, em ordem de prioridade
+            explicit_paths (dict, optional): Caminhos configurados por ano, usados
+                quando o ano não é encontrado nos diretórios de busca
+            refresh_seconds (float): Intervalo mínimo entre verificações dos diretórios
+        """
+        self.search_dirs = [Path(d) for d in search_dirs]
+        self.explicit_paths = {int(year): Path(p) for year, p in (explicit_paths or {}).items()}
+        self.refresh_seconds = refresh_seconds
+        self._partitions = {}
+        self._signature = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def _directory_signature(self):
+        """Retorna o mtime de cada diretório de busca existente"""
+        signature = []
+        for directory in self.search_dirs:
+            try:
+                signature.append((str(directory.resolve()), directory.stat().st_mtime_ns))
+            except OSError:
+                continue
+        return tuple(signature)
+
+    def _scan(self):
+        """Varre os diretórios de busca e monta o mapa ano -> partições"""
+        found = {}
+        for directory in self.search_dirs:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+
+            # O primeiro diretório em que um ano aparece é o único usado para esse ano
+            in_directory = {}
+            for entry in entries:
+                parsed = parse_partition_name(entry.name)
+                if parsed is None or not entry.is_file():
+                    continue
+                year, month = parsed
+                stat = entry.stat()
+                in_directory.setdefault(year, []).append(Partition(
+                    year, month, Path(entry.path).resolve(), stat.st_size, stat.st_mtime_ns
+                ))
+            for year, partitions in in_directory.items():
+                found.setdefault(year, partitions)
+
+        for year, path in self.explicit_paths.items():
+            if year not in found and path.is_file():
+                stat = path.stat()
+                found[year] = [Partition(year, None, path.resolve(), stat.st_size, stat.st_mtime_ns)]
+
+        partitions = {}
+        for year, candidates in found.items():
+            yearly = [p for p in candidates if p.month is None]
+            partitions[year] = yearly[:1] if yearly else sorted(candidates, key=lambda p: p.month)
+        return partitions
+
+    def refresh(self, force=False):
+        """
+        Atualiza o catálogo se algum diretório de dados mudou
+
+        Args:
+            force (bool): Se deve varrer novamente mesmo sem mudanças detectadas
+        """
+        now = time.monotonic()
+        with self._lock:
+            if (not force and self._checked_at is not None
+                    and now - self._checked_at < self.refresh_seconds):
+                return
+            self._checked_at = now
+
+            signature = self._directory_signature()
+            if force or signature != self._signature:
+                self._partitions = self._scan()
+                self._signature = signature
+
+    def partitions(self, year, months=None):
+        """
+        Retorna as partições de um ano
+
+        Args:
+            year (int): Ano dos dados
+            months (list, optional): Meses desejados; partições mensais de outros
+                meses são descartadas (arquivos anuais são sempre retornados)
+
+        Returns:
+            list: Lista de Partition, vazia se o ano não estiver disponível
+        """
+        self.refresh()
+        partitions = self._partitions.get(int(year), [])
+        if months is not None:
+            months = {int(m) for m in months}
+            partitions = [p for p in partitions if p.month is None or p.month in months]
+
+        current = []
+        for partition in partitions:
+            try:
+                current.append(partition.refreshed())
+            except OSError:
+                # Removido desde a última varredura; a próxima varredura o descarta
+                continue
+        return current
+
+    def get_path(self, year):
+        """
+        Retorna o caminho do arquivo anual do ano (ou da primeira partição mensal)
+
+        Args:
+            year (int): Ano dos dados
+
+        Returns:
+            Path | None: Caminho do arquivo ou None se o ano não estiver disponível
+        """
+        partitions = self.partitions(year)
+        return partitions[0].path if partitions else None
+
+    def years(self):
+        """
+        Retorna os anos disponíveis, em ordem crescente
+
+        Returns:
+            list: Lista de anos
+        """
+        self.refresh()
+        return sorted(self._partitions)
+
+# DATA_PATH tem prioridade; depois o diretório do projeto, caminhos relativos ao
+# diretório atual e, por fim, os caminhos DATA_<ano> do .env
+_catalog = DataCatalog(
+    search_dirs=[Path(DATA_PATH), BASE_DIR / 'data', Path('data'), Path('../data'), Path('.')],
+    explicit_paths=_explicit_paths_from_env(),
+)
+
+def get_catalog():
+    """
+    Retorna o catálogo de dados compartilhado pelo processo
+
+    Returns:
+        DataCatalog: Catálogo de partições de dados
+    """
+    return _catalog
@@ -10,7 +10,7 @@ root_dir = app_dir.parent
 sys.path.append(str(app_dir))
 
 try:
-    from config import DATA_2023, DATA_2024, DATA_2025, BASE_DIR
+    from config import BASE_DIR
     config_loaded = True
 except ImportError:
     print("Não foi possível importar variáveis do config.py")
@@ -0,0 +1,131 @@
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from config import CACHE_MAX_ENTRIES, EXPENSE_TYPES
+from utils.cache import LRUCache
+from utils.cube import get_cube
+
+# Comparativos por conjunto de anos, válidos enquanto o cubo dos anos não muda
+_comparisons = LRUCache(CACHE_MAX_ENTRIES)
+
+class YearComparison:
+    """
+    Valores do comparativo entre anos, tirados de uma única agregação do cubo
+
+    O cubo dos anos (ver cube.get_cube) é agrupado uma vez por Ano, GASTOS,
+    Categoria e Mes; totais por ano e tipo de despesa, somas por categoria e
+    por mês saem dessa soma agrupada, que tem uma linha por combinação e não
+    por lançamento. O custo não depende do número de lançamentos e cresce
+    pouco com o número de anos.
+    """
+
+    def __init__(self, cube, years):
+        """
+        Args:
+            cube (LedgerCube): Cubo com os anos a comparar
+            years (list): Anos, na ordem de exibição
+        """
+        self.years = [int(year) for year in years]
+        self.has_categories = 'Categoria' in cube.dimensions
+        self.has_months = 'Mes' in cube.dimensions
+        keys = ['Ano', 'GASTOS'] + [col for col in ('Categoria', 'Mes') if col in cube.dimensions]
+
+        data = cube.data[cube.data['Ano'].isin(self.years).to_numpy()]
+        # Categorias na ordem em que aparecem nos dados (anos na ordem pedida)
+        self.categories = data['Categoria'].dropna().unique().tolist() if self.has_categories else []
+
+        # Única agregação; mantém Mes/Categoria ausentes, que contam nos totais
+        sums = data.groupby(keys, observed=True, dropna=False)['Valor'].sum()
+
+        expenses = sums[sums.index.get_level_values('GASTOS').isin(EXPENSE_TYPES)]
+        by_type = expenses.groupby(level=['Ano', 'GASTOS'], observed=True).sum().unstack('GASTOS')
+        by_type.columns = by_type.columns.astype(object)
+        self._by_type = by_type.reindex(index=self.years, columns=EXPENSE_TYPES, fill_value=0).fillna(0)
+
+        self._by_category = sums.groupby(level=['Ano', 'Categoria'], observed=True).sum() if self.has_categories else None
+        self._by_month = sums.groupby(level=['Ano', 'Mes'], observed=True).sum() if self.has_months else None
+
+    def total_expenses(self):
+        """
+        Despesas totais (GASTOS em EXPENSE_TYPES) por ano
+
+        Returns:
+            pandas.Series: Totais indexados por ano, na ordem de self.years
+        """
+        return self._by_type.sum(axis=1)
+
+    def expense_table(self):
+        """
+        Tabela comparativa: despesa total, despesas por tipo e percentual de cada tipo
+
+        Returns:
+            pandas.DataFrame: Coluna Métrica e uma coluna numérica por ano
+                ("2024"); valores monetários na representação interna e
+                percentuais de 0 a 100 (0 sem despesas no ano)
+        """
+        by_type = self._by_type.T
+        total = by_type.sum(axis=0)
+        percent = by_type.div(total.where(total > 0), axis=1).mul(100).fillna(0)
+
+        values = pd.concat([total.to_frame().T, by_type, percent], ignore_index=True)
+        values.columns = [str(year) for year in self.years]
+        labels = (
+            ["Despesa Total"]
+            + [f"Despesas {tipo}" for tipo in EXPENSE_TYPES]
+            + [f"% {tipo}" for tipo in EXPENSE_TYPES]
+        )
+        return pd.concat([pd.DataFrame({'Métrica': labels}), values], axis=1)
+
+    def by_category(self, categories=None):
+        """
+        Soma de Valor por ano e categoria (todos os lançamentos)
+
+        Args:
+            categories (list, optional): Categorias a incluir; por padrão, todas
+
+        Returns:
+            pandas.DataFrame: Colunas Ano, Categoria e Valor, em ordem de ano e categoria
+        """
+        sums = self._by_category
+        if categories is not None:
+            sums = sums[sums.index.get_level_values('Categoria').isin(categories)]
+        return sums.reset_index()
+
+    def by_month(self):
+        """
+        Soma de Valor por ano e mês (todos os lançamentos)
+
+        Returns:
+            pandas.DataFrame: Colunas Ano, Mes e Valor, em ordem de ano e mês
+        """
+        return self._by_month.reset_index()
+
+def get_year_comparison(years, months=None):
+    """
+    Retorna o comparativo dos anos (ver YearComparison)
+
+    O comparativo é refeito apenas quando o cubo dos anos muda, isto é, quando
+    os dados de algum dos anos mudam (ver cube.get_cube).
+
+    Args:
+        years (list): Anos a comparar
+        months (list, optional): Meses necessários (ver load_data)
+
+    Returns:
+        YearComparison: Comparativo dos anos
+    """
+    years = [int(year) for year in years]
+    cube = get_cube(years, months)
+
+    key = (tuple(years), None if months is None else tuple(sorted(months)))
+    cached = _comparisons.get(key)
+    if cached is not None and cached[0] is cube:
+        return cached[1]
+
+    comparison = YearComparison(cube, years)
+    # O cubo fica guardado junto, para a comparação por identidade na próxima chamada
+    _comparisons.put(key, (cube, comparison))
+    return comparison
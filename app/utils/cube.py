@@ -0,0 +1,220 @@
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from config import CACHE_MAX_ENTRIES, LOAD_WORKERS
+from utils.cache import LRUCache
+from utils.data_loader import (
+    load_processed_data, get_ledger_version, ledger_key, concat_ledgers, _load_years_parallel
+)
+from utils.streaming import should_stream, cached_per_files, iter_ledger_chunks
+
+# Dimensões do cubo, na ordem em que são agrupadas
+CUBE_DIMENSIONS = ['Ano', 'Mes', 'GASTOS', 'Tipo', 'Categoria', 'Conta']
+
+# Medidas somadas em cada célula do cubo
+CUBE_MEASURES = ['Valor', 'Lancamentos']
+
+# Agregações intermediárias mantidas junto do cubo para as consultas mais comuns
+DEFAULT_ROLLUPS = (
+    ('Ano', 'Mes'),
+    ('Ano', 'GASTOS', 'Conta'),
+    ('Ano', 'Tipo', 'Categoria'),
+)
+
+# Cubos por ano (e por conjunto de anos), válidos enquanto a versão dos dados não muda
+_year_cubes = LRUCache(CACHE_MAX_ENTRIES)
+_combined_cubes = LRUCache(CACHE_MAX_ENTRIES)
+_streamed_cubes = LRUCache(CACHE_MAX_ENTRIES)
+
+def _aggregate(data, dimensions):
+    """Soma as medidas de um DataFrame agrupando pelas dimensões indicadas"""
+    if not dimensions:
+        return data[CUBE_MEASURES].sum().to_frame().T
+    return (
+        data.groupby(dimensions, observed=True, dropna=False, sort=False)[CUBE_MEASURES]
+        .sum()
+        .reset_index()
+    )
+
+class LedgerCube:
+    """
+    Cubo pré-agregado dos lançamentos: soma de Valor e número de lançamentos
+    por Ano, Mes, GASTOS, Tipo, Categoria e Conta
+
+    O cubo tem uma linha por combinação de dimensões presente nos dados, não
+    por lançamento, e responde às somas dos gráficos sem percorrer os dados
+    originais. Agregações intermediárias (rollups) menores são usadas quando
+    a consulta só envolve as dimensões delas.
+    """
+
+    def __init__(self, data, rollups=DEFAULT_ROLLUPS):
+        """
+        Args:
+            data (pandas.DataFrame): Células do cubo (dimensões e medidas)
+            rollups (tuple): Conjuntos de dimensões a pré-agregar
+        """
+        self.data = data
+        self.dimensions = [col for col in data.columns if col not in CUBE_MEASURES]
+        self.rollups = tuple(tuple(dims) for dims in rollups)
+        self._rollups = {
+            frozenset(dims): _aggregate(data, list(dims))
+            for dims in self.rollups
+            if set(dims) <= set(self.dimensions)
+        }
+
+    @classmethod
+    def from_frame(cls, df, dimensions=CUBE_DIMENSIONS, rollups=DEFAULT_ROLLUPS):
+        """
+        Monta o cubo a partir dos dados pré-processados
+
+        Args:
+            df (pandas.DataFrame): Dados pré-processados
+            dimensions (list): Dimensões do cubo (as ausentes em df são ignoradas)
+            rollups (tuple): Conjuntos de dimensões a pré-agregar
+
+        Returns:
+            LedgerCube: Cubo dos dados
+        """
+        dimensions = [col for col in dimensions if col in df.columns]
+        data = (
+            df.groupby(dimensions, observed=True, dropna=False, sort=False)
+            .agg(Valor=('Valor', 'sum'), Lancamentos=('Valor', 'size'))
+            .reset_index()
+        )
+        return cls(data, rollups)
+
+    def combine(self, other):
+        """
+        Soma dois cubos (anos diferentes, ou linhas novas de um mesmo ano)
+
+        Args:
+            other (LedgerCube): Cubo com as mesmas dimensões
+
+        Returns:
+            LedgerCube: Novo cubo com as células dos dois
+        """
+        if self.dimensions != other.dimensions:
+            raise ValueError("Cubos com dimensões diferentes não podem ser combinados")
+        data = _aggregate(concat_ledgers([self.data, other.data]), self.dimensions)
+        return LedgerCube(data, self.rollups)
+
+    def _source(self, dimensions):
+        """Menor agregação que contém todas as dimensões pedidas"""
+        candidates = [data for dims, data in self._rollups.items() if dimensions <= dims]
+        return min(candidates, key=len) if candidates else self.data
+
+    def sum(self, by=None, where=None, measure='Valor'):
+        """
+        Soma uma medida do cubo
+
+        Args:
+            by (str | list, optional): Dimensões de agrupamento; sem elas, retorna o total
+            where (dict, optional): Filtros por dimensão. O valor pode ser um valor
+                único, uma lista de valores aceitos ou uma função que recebe a
+                coluna da dimensão e retorna uma máscara booleana
+            measure (str): 'Valor' (soma dos valores) ou 'Lancamentos' (contagem)
+
+        Returns:
+            pandas.Series | float: Somas indexadas pelas dimensões de `by`, em
+                ordem crescente e sem valores ausentes, ou o total se `by` for vazio
+        """
+        by = [by] if isinstance(by, str) else list(by or [])
+        where = where or {}
+
+        unknown = (set(by) | set(where)) - set(self.dimensions)
+        if unknown:
+            raise KeyError(f"Dimensões fora do cubo: {', '.join(sorted(unknown))}")
+
+        data = self._source(set(by) | set(where))
+        mask = np.ones(len(data), dtype=bool)
+        for dimension, condition in where.items():
+            column = data[dimension]
+            if callable(condition):
+                selected = condition(column)
+            elif isinstance(condition, (list, tuple, set, frozenset, pd.Index, np.ndarray)):
+                selected = column.isin(condition)
+            else:
+                selected = column == condition
+            mask &= np.asarray(selected, dtype=bool)
+
+        data = data[mask]
+        if not by:
+            return data[measure].sum()
+        return data.groupby(by, observed=True)[measure].sum()
+
+def _streamed_cube(year, months=None):
+    """Cubo de um ano montado bloco a bloco (ver streaming.iter_ledger_chunks)"""
+    cube = None
+    for chunk in iter_ledger_chunks(year, months=months):
+        chunk_cube = LedgerCube.from_frame(chunk)
+        cube = chunk_cube if cube is None else cube.combine(chunk_cube)
+    # Arquivos sem linhas não geram blocos
+    return cube if cube is not None else LedgerCube.from_frame(load_processed_data(year, months))
+
+def _year_cube(year, months=None):
+    """Cubo de um ano, atualizado só com as linhas novas quando o arquivo cresce"""
+    # Anos grandes ainda fora da memória: cubo em blocos (ver STREAM_MIN_BYTES)
+    if should_stream(year, months):
+        return cached_per_files(_streamed_cubes, year, months, lambda: _streamed_cube(year, months))
+
+    year_key = ledger_key(year, months)
+    version = get_ledger_version(year, months)
+
+    cached = _year_cubes.get(year_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    df = load_processed_data(year, months)
+    if cached is not None and cached[0].generation == version.generation and cached[0].rows <= version.rows:
+        cube = cached[1].combine(LedgerCube.from_frame(df.iloc[cached[0].rows:]))
+    else:
+        cube = LedgerCube.from_frame(df)
+    _year_cubes.put(year_key, (version, cube))
+    return cube
+
+def get_cube(years, months=None):
+    """
+    Retorna o cubo dos lançamentos de um ou mais anos
+
+    Os cubos ficam memorizados por versão dos dados (ver
+    data_loader.get_ledger_version): só são refeitos quando os arquivos mudam,
+    e quando os arquivos apenas ganham linhas novas só essas linhas são somadas.
+    Com vários anos, os cubos de cada ano são obtidos em paralelo (até
+    LOAD_WORKERS threads); anos cujos dados não podem ser carregados são
+    omitidos com um aviso.
+
+    Args:
+        years (int | list): Ano ou anos dos dados
+        months (list, optional): Meses necessários (ver load_data)
+
+    Returns:
+        LedgerCube: Cubo dos anos pedidos
+
+    Raises:
+        ValueError: Se nenhum dos anos puder ser carregado
+    """
+    if isinstance(years, (int, np.integer)):
+        return _year_cube(years, months)
+
+    years = list(years)
+    cubes = _load_years_parallel(lambda year: _year_cube(year, months), years, LOAD_WORKERS)
+    if not cubes:
+        raise ValueError("Nenhum dado disponível para carregar.")
+    if len(cubes) == 1:
+        return cubes[0]
+
+    key = tuple(id(cube) for cube in cubes)
+    cached = _combined_cubes.get(tuple(years))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    combined = cubes[0]
+    for cube in cubes[1:]:
+        combined = combined.combine(cube)
+    # Os cubos dos anos ficam guardados junto, para que seus ids não sejam reaproveitados
+    _combined_cubes.put(tuple(years), (key, combined, cubes))
+    return combined
@@ -1,133 +1,710 @@
 import pandas as pd
+from pandas.api.types import union_categoricals
 import os
+import json
+import hashlib
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 import sys
 
 # Adiciona o diretório pai ao path para importar o módulo config
 sys.path.append(str(Path(__file__).parent.parent))
-from config import DATA_2023, DATA_2024, DATA_2025, BASE_DIR
+from config import CACHE_ENABLED, CACHE_SUFFIX, CACHE_MAX_ENTRIES, LOAD_WORKERS, DEFAULT_YEAR, MONEY_AS_CENTAVOS
+from utils.cache import LRUCache
+from utils.catalog import get_catalog
+from utils.ingest import IngestState, read_csv_snapshot, is_append, read_appended_rows
+from utils.preprocessing import preprocess_financial_data, FinancialMetricsAccumulator
+from utils.schema import read_ledger_csv
 
-def load_data(year):
+# pyarrow é opcional: sem ele o cache Parquet é desativado e o CSV é lido sempre
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Versão do formato do cache; incrementar invalida todos os caches existentes
+CACHE_VERSION = 3
+CACHE_METADATA_KEY = b'gestao_financeira.cache'
+
+# Unidade dos valores monetários guardados no cache (ver MONEY_AS_CENTAVOS)
+MONEY_UNIT = 'centavos' if MONEY_AS_CENTAVOS else 'reais'
+
+# Cache em memória dos DataFrames pré-processados, compartilhado por todas as sessões
+_processed_cache = LRUCache(CACHE_MAX_ENTRIES)
+
+# Metadados (linhas, intervalo de datas) por versão de partição
+_stats_cache = LRUCache(1024)
+
+# Métricas acumuladas por ano, atualizadas só com as linhas novas
+_metrics_cache = LRUCache(CACHE_MAX_ENTRIES)
+_metrics_lock = threading.Lock()
+
+# Cada recarga completa de um ano recebe uma nova geração
+_generations = itertools.count(1)
+
+@dataclass(frozen=True)
+class LedgerVersion:
     """
-    Carrega os dados financeiros do ano especificado
+    Versão dos dados pré-processados de um ano
+    
+    Enquanto a geração é a mesma, uma versão mais nova só difere da anterior
+    por linhas acrescentadas no fim: as primeiras `rows` linhas da versão
+    anterior continuam idênticas. Uma recarga completa inicia nova geração.
+    
+    Attributes:
+        generation (int): Identificador da última recarga completa
+        rows (int): Número de linhas dos dados
+    """
+    generation: int
+    rows: int
+
+@dataclass(frozen=True, eq=False)
+class _ProcessedEntry:
+    """Item do cache de dados pré-processados"""
+    df: pd.DataFrame
+    version: LedgerVersion
+    states: dict
+
+def get_cache_path(filepath):
+    """
+    Retorna o caminho do cache Parquet associado a um arquivo CSV
     
     Args:
-        year (int): Ano dos dados a serem carregados (2023, 2024 ou 2025)
+        filepath (str | Path): Caminho do arquivo CSV
         
     Returns:
-        pandas.DataFrame: DataFrame com os dados do ano especificado
+        Path: Caminho do arquivo de cache (ex.: lgd2024.cache.parquet)
     """
-    # Determina o caminho do arquivo
-    if year == 2023:
-        filepath_str = DATA_2023
-    elif year == 2024:
-        filepath_str = DATA_2024
-    elif year == 2025:
-        filepath_str = DATA_2025
+    filepath = Path(filepath)
+    return filepath.with_name(f"{filepath.stem}{CACHE_SUFFIX}")
+
+def file_fingerprint(filepath):
+    """
+    Retorna a impressão digital barata de um arquivo (tamanho e mtime)
+    
+    Args:
+        filepath (str | Path): Caminho do arquivo
+        
+    Returns:
+        dict: Dicionário com 'size' e 'mtime_ns'
+    """
+    stat = Path(filepath).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def file_hash(filepath, length=None, chunk_size=1 << 20):
+    """
+    Calcula o hash BLAKE2b do conteúdo de um arquivo, lendo em blocos
+    
+    Args:
+        filepath (str | Path): Caminho do arquivo
+        length (int, optional): Considera apenas os primeiros `length` bytes
+        chunk_size (int): Tamanho de cada bloco lido em bytes
+        
+    Returns:
+        str: Hash hexadecimal do conteúdo
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    remaining = float('inf') if length is None else length
+    with open(filepath, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(int(min(chunk_size, remaining)))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+def _read_cache_metadata(cache_path):
+    """Lê os metadados de validade gravados no esquema do arquivo Parquet"""
+    metadata = pq.read_schema(cache_path).metadata or {}
+    raw = metadata.get(CACHE_METADATA_KEY)
+    return json.loads(raw) if raw else None
+
+def ledger_stats(df):
+    """
+    Calcula os metadados de uma partição a partir do seu DataFrame
+    
+    Args:
+        df (pandas.DataFrame): Dados da partição
+        
+    Returns:
+        dict: Dicionário com 'rows', 'date_min' e 'date_max' (ISO 8601 ou None)
+    """
+    stats = {'rows': int(len(df)), 'date_min': None, 'date_max': None}
+    if 'Data' in df.columns and len(df):
+        datas = pd.to_datetime(df['Data'], errors='coerce')
+        if datas.notna().any():
+            stats['date_min'] = datas.min().date().isoformat()
+            stats['date_max'] = datas.max().date().isoformat()
+    return stats
+
+def _check_parquet_cache(filepath):
+    """
+    Verifica se o cache Parquet de um CSV está atualizado
+    
+    O cache é considerado válido quando tamanho e mtime do CSV coincidem com os
+    gravados. Se apenas o mtime mudou (cópia, touch), o hash do conteúdo decide.
+    
+    Returns:
+        tuple: (metadados gravados ou None se não houver cache utilizável,
+            se o cache está atualizado, fingerprint atual do CSV)
+    """
+    fingerprint = file_fingerprint(filepath)
+    cache_path = get_cache_path(filepath)
+    if not cache_path.exists():
+        return None, False, fingerprint
+    
+    cached = _read_cache_metadata(cache_path)
+    if not cached or cached.get('version') != CACHE_VERSION or cached.get('money_unit', 'reais') != MONEY_UNIT:
+        return None, False, fingerprint
+    if cached.get('size') != fingerprint['size']:
+        return cached, False, fingerprint
+    if cached.get('mtime_ns') != fingerprint['mtime_ns'] and file_hash(filepath) != cached.get('hash'):
+        return cached, False, fingerprint
+    return cached, True, fingerprint
+
+def _read_parquet_cache(filepath, columns=None):
+    """
+    Lê o cache Parquet de um CSV, atualizando-o se o CSV apenas cresceu
+    
+    Se o CSV só ganhou linhas no fim desde a gravação do cache (ver
+    utils.ingest.is_append), apenas essas linhas são lidas do CSV e
+    acrescentadas ao cache, que é regravado.
+    
+    Args:
+        filepath (Path): Caminho do arquivo CSV
+        columns (list, optional): Colunas a ler; por padrão, todas
+    
+    Returns:
+        tuple: (DataFrame ou None se o cache não puder ser usado, IngestState)
+    """
+    cached, valid, fingerprint = _check_parquet_cache(filepath)
+    state = IngestState.from_dict(cached.get('ingest') or {}) if cached else None
+    if state is None:
+        return None, None
+    
+    cache_path = get_cache_path(filepath)
+    if valid:
+        if state.mtime_ns == fingerprint['mtime_ns']:
+            return pq.read_table(cache_path, columns=columns).to_pandas(), state
+        
+        # Conteúdo idêntico com mtime novo: regrava para evitar novo hash na próxima leitura
+        df = pq.read_table(cache_path).to_pandas()
+        state = replace(state, mtime_ns=fingerprint['mtime_ns'])
+        _write_parquet_cache(df, filepath, state, cached.get('hash'))
+    elif is_append(filepath, state, fingerprint['size']):
+        tail, state = read_appended_rows(filepath, state, fingerprint['size'], fingerprint['mtime_ns'])
+        df = pq.read_table(cache_path).to_pandas()
+        if tail is not None:
+            df = concat_ledgers([df, tail])
+            _write_parquet_cache(df, filepath, state)
     else:
-        raise ValueError(f"Ano {year} não disponível. Use 2023, 2024 ou 2025.")
+        return None, None
     
-    # Converte para Path
-    filepath = Path(filepath_str)
-    print(f"DEBUG: Tentando abrir arquivo para {year}. Caminho inicial: {filepath}")
-    print(f"DEBUG: O arquivo existe? {filepath.exists()}")
+    return (df if columns is None else df[columns]), state
+
+def _write_parquet_cache(df, filepath, state, content_hash=None):
+    """
+    Grava o DataFrame no cache Parquet de forma atômica
     
-    # Lista todos os arquivos em diversos caminhos possíveis
-    print("DEBUG: Listando arquivos disponíveis:")
-    try:
-        print(f"Arquivos em data/: {list(Path('data').glob('*.csv'))}")
-    except Exception as e:
-        print(f"Erro ao listar arquivos em data/: {e}")
+    Além da validade (tamanho, mtime e hash do CSV), os metadados guardam o
+    número de linhas e o intervalo de datas da partição, para que o catálogo
+    possa consultá-los sem ler os dados, e o IngestState da leitura, para que
+    linhas acrescentadas depois possam ser lidas sem reler o arquivo todo.
     
+    Falhas de escrita (diretório somente leitura, tipos não suportados) apenas
+    desativam o cache para este arquivo; o carregamento continua pelo CSV.
+    """
+    cache_path = get_cache_path(filepath)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
     try:
-        print(f"Arquivos em {BASE_DIR / 'data'}: {list((BASE_DIR / 'data').glob('*.csv'))}")
+        metadata = {
+            'version': CACHE_VERSION,
+            'size': state.offset,
+            'mtime_ns': state.mtime_ns,
+            'hash': content_hash or file_hash(filepath, length=state.offset),
+            'money_unit': MONEY_UNIT,
+            'ingest': state.to_dict(),
+            **ledger_stats(df),
+        }
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[CACHE_METADATA_KEY] = json.dumps(metadata).encode('utf-8')
+        pq.write_table(table.replace_schema_metadata(schema_metadata), tmp_path)
+        os.replace(tmp_path, cache_path)
     except Exception as e:
-        print(f"Erro ao listar arquivos em {BASE_DIR / 'data'}: {e}")
+        print(f"Aviso: não foi possível gravar o cache {cache_path}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+def _read_ledger_state(filepath, use_cache=CACHE_ENABLED, columns=None):
+    """
+    Lê um arquivo de lançamentos e informa até onde ele foi lido
     
-    # Tenta abrir o arquivo usando path absoluto primeiro
-    try:
-        absolute_path = BASE_DIR / 'data' / f'lgd{year}.csv'
-        print(f"DEBUG: Tentando path absoluto: {absolute_path} (Existe: {absolute_path.exists()})")
-        if absolute_path.exists():
-            print(f"Encontrado arquivo em: {absolute_path}")
-            df = pd.read_csv(absolute_path, delimiter=',', encoding='utf-8')
-            print(f"Arquivo carregado com sucesso: {len(df)} linhas")
-            return df
-    except Exception as e:
-        print(f"DEBUG: Erro ao tentar path absoluto: {e}")
-    
-    # Tenta diversos caminhos relativos
-    relative_paths = [
-        Path('data') / f'lgd{year}.csv',
-        Path('./data') / f'lgd{year}.csv',
-        Path('../data') / f'lgd{year}.csv',
-        Path(f'data/lgd{year}.csv'),
-        Path(f'./data/lgd{year}.csv'),
-        Path(f'../data/lgd{year}.csv'),
-        Path(f'lgd{year}.csv'),
-        Path(f'./lgd{year}.csv'),
+    Args:
+        filepath (str | Path): Caminho do arquivo CSV
+        use_cache (bool): Se deve ler/gravar o cache Parquet ao lado do CSV
+        columns (list, optional): Colunas a retornar; por padrão, todas
+        
+    Returns:
+        tuple: (DataFrame, IngestState da leitura)
+    """
+    filepath = Path(filepath)
+    use_cache = use_cache and PARQUET_AVAILABLE
+    if use_cache:
+        try:
+            df, state = _read_parquet_cache(filepath, columns)
+            if df is not None:
+                return df, state
+        except Exception as e:
+            print(f"Aviso: cache inválido para {filepath}: {e}")
+    
+    # O cache sempre guarda o arquivo completo, mesmo que só algumas colunas sejam pedidas
+    df, state = read_csv_snapshot(filepath)
+    if use_cache:
+        _write_parquet_cache(df, filepath, state)
+    if columns is not None:
+        df = df[columns]
+    return df, state
+
+def read_ledger(filepath, use_cache=CACHE_ENABLED, columns=None):
+    """
+    Lê um arquivo CSV de lançamentos, usando o cache Parquet quando atualizado
+    
+    O CSV é lido com o esquema de utils.schema (datas, números e colunas
+    category já tipados), e é esse DataFrame tipado que o cache guarda.
+    Se o CSV apenas ganhou linhas desde a gravação do cache, só as novas
+    linhas são lidas.
+    
+    Args:
+        filepath (str | Path): Caminho do arquivo CSV
+        use_cache (bool): Se deve ler/gravar o cache Parquet ao lado do CSV
+        columns (list, optional): Colunas a ler; por padrão, todas
+        
+    Returns:
+        pandas.DataFrame: DataFrame com os dados do arquivo
+    """
+    if not (use_cache and PARQUET_AVAILABLE):
+        return read_ledger_csv(filepath, usecols=columns)
+    return _read_ledger_state(filepath, use_cache, columns)[0]
+
+def concat_ledgers(dfs):
+    """
+    Concatena DataFrames de lançamentos preservando as colunas category
+    
+    pd.concat converte para object uma coluna category cujas categorias
+    diferem entre os DataFrames; aqui as categorias são unificadas antes,
+    em ordem alfabética (a mesma ordem dos agrupamentos por texto). Colunas
+    com as mesmas categorias em todos mantêm a ordem delas (ex.: Mes_Nome).
+    
+    Args:
+        dfs (list): Lista de DataFrames
+        
+    Returns:
+        pandas.DataFrame: DataFrame concatenado
+    """
+    if len(dfs) == 1:
+        return dfs[0]
+    
+    # Colunas category em todos os DataFrames, com categorias que diferem entre eles
+    categorical_columns = [
+        col for col in dfs[0].columns
+        if all(col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype) for df in dfs)
+        and not all(df[col].cat.categories.equals(dfs[0][col].cat.categories) for df in dfs)
     ]
+    if categorical_columns:
+        dfs = [df.copy(deep=False) for df in dfs]
+        for col in categorical_columns:
+            categories = union_categoricals([df[col] for df in dfs], sort_categories=True).categories
+            for df in dfs:
+                df[col] = df[col].cat.set_categories(categories)
+    return pd.concat(dfs, ignore_index=True)
+
+def get_partitions(year, months=None):
+    """
+    Retorna as partições (arquivos) de um ano pelo catálogo de dados
+    
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários; partições mensais de outros
+            meses não são retornadas
+        
+    Returns:
+        list: Lista de Partition do ano
+    """
+    partitions = get_catalog().partitions(year, months)
+    if not partitions:
+        raise FileNotFoundError(f"Arquivo para o ano {year} não encontrado.")
+    return partitions
+
+def get_partition_stats(partition):
+    """
+    Retorna os metadados de uma partição: linhas e intervalo de datas
+    
+    Os valores vêm dos metadados do cache Parquet quando ele está atualizado;
+    caso contrário a partição é lida uma vez (o que também grava o cache).
+    O resultado fica memorizado enquanto o arquivo não mudar.
+    
+    Args:
+        partition (Partition): Partição do catálogo
+        
+    Returns:
+        dict: Dicionário com 'rows', 'date_min' e 'date_max'
+    """
+    stats = _stats_cache.get(partition.fingerprint)
+    if stats is not None:
+        return stats
+    
+    if CACHE_ENABLED and PARQUET_AVAILABLE:
+        try:
+            cached, valid, _ = _check_parquet_cache(partition.path)
+            if valid and 'rows' in cached:
+                stats = {key: cached.get(key) for key in ('rows', 'date_min', 'date_max')}
+        except Exception:
+            stats = None
+    
+    if stats is None:
+        stats = ledger_stats(read_ledger(partition.path))
+    
+    _stats_cache.put(partition.fingerprint, stats)
+    return stats
+
+def describe_partitions(years=None):
+    """
+    Lista as partições de dados com seus metadados
+    
+    Args:
+        years (list, optional): Anos a descrever; por padrão, todos os disponíveis
+        
+    Returns:
+        pandas.DataFrame: Uma linha por partição com ano, mês, arquivo, linhas,
+            tamanho em bytes, intervalo de datas e data de modificação
+    """
+    rows = []
+    for year in (get_available_years() if years is None else years):
+        for partition in get_catalog().partitions(year):
+            stats = get_partition_stats(partition)
+            rows.append({
+                'Ano': partition.year,
+                'Mes': partition.month,
+                'Arquivo': partition.path.name,
+                'Linhas': stats['rows'],
+                'Bytes': partition.size,
+                'Data Inicial': stats['date_min'],
+                'Data Final': stats['date_max'],
+                'Modificado em': pd.Timestamp(partition.mtime_ns, unit='ns'),
+            })
+    
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df['Mes'] = df['Mes'].astype('Int64')
+    return df
+
+def load_data(year, months=None):
+    """
+    Carrega os dados financeiros do ano especificado
+    
+    Args:
+        year (int): Ano dos dados a serem carregados
+        months (list, optional): Meses necessários; só as partições mensais
+            desses meses são lidas (arquivos anuais são sempre lidos inteiros)
+        
+    Returns:
+        pandas.DataFrame: DataFrame com os dados do ano especificado
+    """
+    partitions = get_partitions(year, months)
+    if len(partitions) == 1:
+        return read_ledger(partitions[0].path)
+    return concat_ledgers([read_ledger(p.path) for p in partitions])
+
+def ledger_key(year, months=None):
+    """
+    Chave (ano, meses) usada pelos caches de dados por ano
+    
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+        
+    Returns:
+        tuple: (ano, tupla ordenada de meses ou None)
+    """
+    return (int(year), None if months is None else tuple(sorted(int(m) for m in months)))
+
+def _append_to_entry(entry, partitions):
+    """
+    Atualiza um item do cache com as linhas acrescentadas às partições
+    
+    Returns:
+        _ProcessedEntry | None: Item atualizado (o próprio item se nada mudou),
+            ou None se alguma partição foi reescrita, removida ou criada
+    """
+    if [str(p.path) for p in partitions] != list(entry.states):
+        return None
+    
+    states = dict(entry.states)
+    tails = []
+    for partition in partitions:
+        state = states[str(partition.path)]
+        if state.is_current(partition.size, partition.mtime_ns):
+            continue
+        if not is_append(partition.path, state, partition.size):
+            return None
+        tail, states[str(partition.path)] = read_appended_rows(
+            partition.path, state, partition.size, partition.mtime_ns
+        )
+        if tail is not None and len(tail):
+            tails.append(tail)
+    
+    if not tails:
+        return entry if states == entry.states else _ProcessedEntry(entry.df, entry.version, states)
     
-    for path in relative_paths:
+    df = concat_ledgers([entry.df, preprocess_financial_data(concat_ledgers(tails))])
+    return _ProcessedEntry(df, LedgerVersion(entry.version.generation, len(df)), states)
+
+def _get_processed_entry(year, months=None):
+    """
+    Retorna o item do cache de dados pré-processados do ano, atualizando-o
+    
+    A chave do cache é a impressão digital das partições de origem (caminho,
+    tamanho e mtime). Quando ela muda, se as partições apenas ganharam linhas
+    no fim, só essas linhas são lidas, pré-processadas e acrescentadas ao
+    DataFrame já em memória; caso contrário o ano é recarregado por inteiro.
+    """
+    partitions = get_partitions(year, months)
+    year_key = ledger_key(year, months)
+    key = year_key + (tuple(p.fingerprint for p in partitions),)
+    
+    entry = _processed_cache.get(key)
+    if entry is not None:
+        return entry
+    
+    previous = _processed_cache.find(lambda k: k[:2] == year_key)
+    if previous is not None:
         try:
-            print(f"DEBUG: Tentando path relativo: {path} (Existe: {path.exists()})")
-            if path.exists():
-                print(f"Encontrado arquivo em: {path}")
-                df = pd.read_csv(path, delimiter=',', encoding='utf-8')
-                print(f"Arquivo carregado com sucesso: {len(df)} linhas")
-                return df
+            entry = _append_to_entry(previous, partitions)
         except Exception as e:
-            print(f"DEBUG: Erro ao tentar path relativo {path}: {e}")
+            print(f"Aviso: falha ao ler as linhas novas de {year}, recarregando: {e}")
+            entry = None
     
-    # Se chegou aqui, tenta diretamente o filepath original
-    try:
-        print(f"DEBUG: Tentando usar o caminho original: {filepath}")
-        df = pd.read_csv(filepath, delimiter=',', encoding='utf-8')
-        print(f"Arquivo carregado com sucesso: {len(df)} linhas")
-        return df
-    except Exception as e:
-        print(f"DEBUG: Erro ao tentar o caminho original {filepath}: {e}")
+    if entry is None:
+        frames, states = [], {}
+        for partition in partitions:
+            df, states[str(partition.path)] = _read_ledger_state(partition.path)
+            frames.append(df)
+        df = preprocess_financial_data(concat_ledgers(frames))
+        entry = _ProcessedEntry(df, LedgerVersion(next(_generations), len(df)), states)
     
-    # Se chegou aqui, não conseguiu encontrar o arquivo
-    err_msg = (f"Arquivo para o ano {year} não encontrado. "
-              f"Caminhos testados: {filepath_str}, {absolute_path}, {relative_paths}")
-    raise FileNotFoundError(err_msg)
+    # Versões anteriores das mesmas partições não serão mais usadas
+    _processed_cache.discard(lambda k: k[:2] == year_key)
+    _processed_cache.put(key, entry)
+    return entry
 
-def load_all_data():
+def load_processed_data(year, months=None):
     """
-    Carrega os dados de todos os anos disponíveis em um único DataFrame
+    Retorna os dados pré-processados do ano, memorizados para todo o processo
+    
+    Enquanto os arquivos não mudarem, nenhuma troca de página ou filtro refaz a
+    leitura ou a limpeza. Se os arquivos apenas ganharem linhas no fim, só as
+    linhas novas são lidas e pré-processadas. O DataFrame retornado é
+    compartilhado entre sessões e não deve ser modificado pelas views.
     
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+        
     Returns:
-        pandas.DataFrame: DataFrame com dados de todos os anos
+        pandas.DataFrame: DataFrame pré-processado do ano
+    """
+    return _get_processed_entry(year, months).df
+
+def peek_processed_data(year, months=None):
     """
-    dfs = []
+    Retorna os dados pré-processados do ano apenas se já estiverem em memória
     
-    try:
-        df_2023 = load_data(2023)
-        df_2023['Ano'] = 2023
-        dfs.append(df_2023)
-    except (FileNotFoundError, ValueError, IOError) as e:
-        print(f"Aviso: {e}")
+    Se o ano já foi carregado, o DataFrame é atualizado como em
+    load_processed_data (linhas novas ou releitura); se não, nada é lido.
     
-    try:
-        df_2024 = load_data(2024)
-        df_2024['Ano'] = 2024
-        dfs.append(df_2024)
-    except (FileNotFoundError, ValueError, IOError) as e:
-        print(f"Aviso: {e}")
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+        
+    Returns:
+        pandas.DataFrame | None: DataFrame pré-processado do ano, ou None se
+            o ano ainda não foi carregado
+    """
+    year_key = ledger_key(year, months)
+    if _processed_cache.find(lambda k: k[:2] == year_key) is None:
+        return None
+    return load_processed_data(year, months)
+
+def get_ledger_version(year, months=None):
+    """
+    Retorna a versão atual dos dados pré-processados do ano
     
-    try:
-        df_2025 = load_data(2025)
-        df_2025['Ano'] = 2025
-        dfs.append(df_2025)
-    except (FileNotFoundError, ValueError, IOError) as e:
-        print(f"Aviso: {e}")
+    Permite que caches derivados (métricas, agregados) saibam se precisam ser
+    refeitos ou se basta incorporar as linhas novas (ver LedgerVersion).
+    
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+        
+    Returns:
+        LedgerVersion: Geração e número de linhas dos dados
+    """
+    return _get_processed_entry(year, months).version
+
+def cached_per_version(cache, year, months, build):
+    """
+    Retorna build(df) memorizado por versão dos dados do ano
+    
+    Para objetos derivados dos dados pré-processados (recortes, matrizes,
+    índices) que são refeitos por inteiro quando a versão muda.
+    
+    Args:
+        cache (LRUCache): Cache do objeto derivado
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+        build (callable): Função que recebe o DataFrame pré-processado do ano
+        
+    Returns:
+        Resultado de build para a versão atual dos dados
+    """
+    year_key = ledger_key(year, months)
+    version = get_ledger_version(year, months)
+    
+    cached = cache.get(year_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    value = build(load_processed_data(year, months))
+    cache.put(year_key, (version, value))
+    return value
+
+def get_financial_metrics(year, months=None):
+    """
+    Retorna as métricas de calculate_financial_metrics para os dados do ano
+    
+    As somas parciais ficam memorizadas por ano; quando os dados só ganharam
+    linhas novas, apenas elas são incorporadas às somas. Anos grandes que não
+    estão em memória (ver streaming.should_stream) são lidos em blocos.
+    
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+        
+    Returns:
+        dict: Dicionário com métricas financeiras
+    """
+    # Anos grandes ainda fora da memória: métricas em blocos (ver STREAM_MIN_BYTES);
+    # importado aqui porque streaming depende deste módulo
+    from utils.streaming import should_stream, get_streamed_metrics
+    if should_stream(year, months):
+        return get_streamed_metrics(year, months)
+    
+    entry = _get_processed_entry(year, months)
+    year_key = ledger_key(year, months)
+    
+    with _metrics_lock:
+        cached = _metrics_cache.get(year_key)
+        if (cached is not None and cached[0].generation == entry.version.generation
+                and cached[0].rows <= entry.version.rows):
+            version, accumulator = cached
+        else:
+            version, accumulator = LedgerVersion(entry.version.generation, 0), FinancialMetricsAccumulator()
+        
+        if version.rows < entry.version.rows:
+            accumulator.update(entry.df.iloc[version.rows:])
+        _metrics_cache.put(year_key, (entry.version, accumulator))
+        return accumulator.result()
+
+def _load_years_parallel(loader, years, max_workers):
+    """
+    Executa loader(ano) para cada ano em um pool de threads
+    
+    A leitura do CSV/Parquet e as operações vetorizadas do pandas liberam o GIL
+    na maior parte do tempo, então threads bastam e evitam serializar os
+    DataFrames entre processos.
+    
+    Args:
+        loader (callable): Função que recebe o ano e retorna o resultado dele
+            (DataFrame, cubo etc.)
+        years (list): Anos a serem carregados
+        max_workers (int): Número máximo de threads
+        
+    Returns:
+        list: Resultados, na ordem dos anos (anos com falha são omitidos)
+    """
+    years = list(years)
+    workers = max(1, min(int(max_workers or 1), len(years)))
+    
+    def safe_load(year):
+        try:
+            return loader(year)
+        except (FileNotFoundError, ValueError, IOError) as e:
+            print(f"Aviso: {e}")
+            return None
+    
+    if workers == 1:
+        results = [safe_load(year) for year in years]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='load_data') as executor:
+            results = list(executor.map(safe_load, years))
+    
+    return [result for result in results if result is not None]
+
+def load_all_processed_data(years=None, max_workers=LOAD_WORKERS):
+    """
+    Retorna os dados pré-processados de vários anos em um único DataFrame
+    
+    Os anos são carregados e pré-processados em paralelo.
+    
+    Args:
+        years (list, optional): Anos a carregar; por padrão, todos os disponíveis
+        max_workers (int): Número máximo de threads de carregamento
+        
+    Returns:
+        pandas.DataFrame: DataFrame pré-processado com dados de todos os anos
+    """
+    years = get_available_years() if years is None else years
+    dfs = _load_years_parallel(load_processed_data, years, max_workers)
+    
+    if not dfs:
+        raise ValueError("Nenhum dado disponível para carregar.")
+    
+    return concat_ledgers(dfs)
+
+def load_all_data(years=None, max_workers=LOAD_WORKERS):
+    """
+    Carrega os dados de vários anos em um único DataFrame
+    
+    Os arquivos são lidos em paralelo.
+    
+    Args:
+        years (list, optional): Anos a carregar; por padrão, todos os disponíveis
+        max_workers (int): Número máximo de threads de carregamento
+        
+    Returns:
+        pandas.DataFrame: DataFrame com dados de todos os anos
+    """
+    years = get_available_years() if years is None else years
+    
+    def load_with_year(year):
+        return load_data(year).assign(Ano=year)
+    
+    dfs = _load_years_parallel(load_with_year, years, max_workers)
     
     if not dfs:
         raise ValueError("Nenhum dado disponível para carregar.")
     
     # Concatena os DataFrames
-    return pd.concat(dfs, ignore_index=True)
+    return concat_ledgers(dfs)
 
 def get_available_years():
     """
@@ -136,42 +713,19 @@ def get_available_years():
     Returns:
         list: Lista de anos disponíveis
     """
-    years = []
-    
-    # Verifica diretamente com Path.exists()
-    data_dir = BASE_DIR / 'data'
-    
-    if (data_dir / 'lgd2023.csv').exists():
-        years.append(2023)
-    
-    if (data_dir / 'lgd2024.csv').exists():
-        years.append(2024)
-    
-    if (data_dir / 'lgd2025.csv').exists():
-        years.append(2025)
-    
-    # Se não encontrou nada, tenta caminhos relativos
-    if not years:
-        # Lista de caminhos para verificar
-        relative_paths = [
-            Path('data'),
-            Path('./data'),
-            Path('../data')
-        ]
-        
-        for path in relative_paths:
-            if (path / 'lgd2023.csv').exists():
-                years.append(2023)
-            if (path / 'lgd2024.csv').exists():
-                years.append(2024)
-            if (path / 'lgd2025.csv').exists():
-                years.append(2025)
-            
-            if years:  # Se encontrou algum arquivo, para de procurar
-                break
+    return get_catalog().years()
+
+def get_default_year_index(years):
+    """
+    Retorna a posição do ano padrão (DEFAULT_YEAR) em uma lista de anos
     
-    print(f"Anos disponíveis: {years}")
-    return years
+    Args:
+        years (list): Lista de anos disponíveis
+        
+    Returns:
+        int: Posição de DEFAULT_YEAR, ou do ano mais recente se ele não estiver na lista
+    """
+    return years.index(DEFAULT_YEAR) if DEFAULT_YEAR in years else max(len(years) - 1, 0)
 
 if __name__ == "__main__":
     # Teste de carregamento de dados
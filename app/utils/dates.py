@@ -0,0 +1,92 @@
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar o módulo config
+sys.path.append(str(Path(__file__).parent.parent))
+from config import MONTHS
+
+# Formato das datas nos arquivos de lançamentos (ver README)
+DATE_FORMAT = '%Y-%m-%d'
+
+def parse_dates(series, date_format=DATE_FORMAT):
+    """
+    Converte uma coluna de datas em texto para datetime64
+
+    Cada data distinta é convertida uma única vez, no formato explícito
+    `date_format`, e o resultado é distribuído pelas linhas pelos códigos de
+    pd.factorize. As datas distintas fora desse formato (ex.: com horário)
+    ainda são interpretadas pelo pd.to_datetime; as inválidas viram NaT.
+
+    Args:
+        series (pandas.Series): Coluna com as datas
+        date_format (str): Formato esperado das datas
+
+    Returns:
+        pandas.Series: Datas como datetime64[ns], com o mesmo índice da entrada
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.to_datetime(series, errors='coerce')
+
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(np.asarray(uniques, dtype=object))
+    parsed = pd.to_datetime(uniques, format=date_format, errors='coerce')
+
+    others = parsed.isna() & uniques.notna()
+    if others.any():
+        parsed[others] = pd.to_datetime(uniques[others], format='mixed', errors='coerce')
+
+    # Código -1 (valor ausente) aponta para o NaT acrescentado no fim
+    values = np.append(parsed.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'))
+    return pd.Series(values[codes], index=series.index, name=series.name)
+
+def _take(values, codes, missing):
+    """Distribui valores por data distinta pelas linhas (código -1 recebe `missing`)"""
+    return np.append(values, missing)[codes]
+
+def derive_date_columns(dates):
+    """
+    Deriva as colunas de ano e mês de uma coluna de datas
+
+    As partes são calculadas apenas para as datas distintas e os nomes dos
+    meses vêm de config.MONTHS, sem depender do idioma do sistema.
+
+    Args:
+        dates (pandas.Series): Datas (datetime64)
+
+    Returns:
+        dict: Colunas com o índice de `dates`:
+            'Mes' e 'Ano': inteiros (float com NaN se houver datas inválidas)
+            'Mes_Nome': nome do mês, category com os meses em ordem do calendário
+            'Mês Ano': "Janeiro 2024", category com os períodos em ordem cronológica
+    """
+    codes, uniques = pd.factorize(dates)
+    uniques = pd.DatetimeIndex(uniques)
+    years = uniques.year.to_numpy()
+    months = uniques.month.to_numpy()
+
+    # Como em Series.dt: inteiros se todas as datas forem válidas, float com NaN se não
+    if (codes < 0).any():
+        ano = _take(years.astype(float), codes, np.nan)
+        mes = _take(months.astype(float), codes, np.nan)
+    else:
+        ano = years[codes]
+        mes = months[codes]
+
+    # Meses desde o ano 0, para ordenar e nomear os períodos distintos
+    period_codes, periods = pd.factorize(years * 12 + months - 1, sort=True)
+    period_labels = [f"{MONTHS[period % 12]} {period // 12}" for period in periods]
+
+    return {
+        'Mes': pd.Series(mes, index=dates.index),
+        'Mes_Nome': pd.Series(pd.Categorical.from_codes(
+            _take(months - 1, codes, -1), categories=MONTHS
+        ), index=dates.index),
+        'Ano': pd.Series(ano, index=dates.index),
+        'Mês Ano': pd.Series(pd.Categorical.from_codes(
+            _take(period_codes, codes, -1), categories=period_labels
+        ), index=dates.index),
+    }
@@ -0,0 +1,130 @@
+import numpy as np
+import io
+import sys
+from pathlib import Path
+
+from openpyxl import Workbook
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from config import EXPORT_CHUNKSIZE
+from utils.data_loader import PARQUET_AVAILABLE
+from utils.money import MONEY_COLUMNS, to_reais
+
+# pyarrow é opcional (ver data_loader): sem ele o formato Parquet não é oferecido
+if PARQUET_AVAILABLE:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+# Formatos de exportação: nome exibido -> (extensão, tipo MIME)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+if not PARQUET_AVAILABLE:
+    del EXPORT_FORMATS["Parquet"]
+
+def _iter_chunks(df, chunksize):
+    """
+    Percorre o DataFrame em blocos de linhas, com valores monetários em reais
+
+    Os blocos são fatias do DataFrame (sem copiar a tabela inteira); só as
+    colunas monetárias de cada bloco são convertidas (ver money.to_reais).
+    """
+    money = [col for col in df.columns if col in MONEY_COLUMNS]
+    for start in range(0, max(len(df), 1), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        if money:
+            chunk = chunk.assign(**{col: to_reais(chunk[col]) for col in money})
+        yield chunk
+
+def _write_csv(df, sink, chunksize):
+    """Grava CSV (UTF-8, separador vírgula) bloco a bloco"""
+    for i, chunk in enumerate(_iter_chunks(df, chunksize)):
+        sink.write(chunk.to_csv(index=False, header=(i == 0)).encode('utf-8'))
+
+def _parquet_schema(df):
+    """
+    Schema Parquet do DataFrame inteiro, com valores monetários em reais
+
+    O tipo de cada coluna vem do dtype; colunas de objetos (texto, números
+    com ausentes) têm o tipo inferido de todos os valores, para que um
+    primeiro bloco só com ausentes não fixe o tipo nulo para o arquivo.
+    """
+    schema = pa.Schema.from_pandas(next(_iter_chunks(df.iloc[:0], 1)), preserve_index=False)
+    for i, name in enumerate(schema.names):
+        if df[name].dtype == object:
+            schema = schema.set(i, pa.field(name, pa.infer_type(df[name].to_numpy(), from_pandas=True)))
+    return schema
+
+def _write_parquet(df, sink, chunksize):
+    """Grava Parquet com um grupo de linhas por bloco"""
+    schema = _parquet_schema(df)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _iter_chunks(df, chunksize):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+def _excel_cells(chunk):
+    """Linhas de um bloco como valores aceitos pelo openpyxl (ausentes viram células vazias)"""
+    columns = []
+    for col in chunk.columns:
+        values = chunk[col].astype(object)
+        columns.append(np.where(values.isna(), None, values))
+    return zip(*columns)
+
+def _write_excel(df, sink, chunksize):
+    """Grava XLSX no modo somente escrita do openpyxl (linhas gravadas em sequência)"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Dados")
+    sheet.append([str(col) for col in df.columns])
+    for chunk in _iter_chunks(df, chunksize):
+        for row in _excel_cells(chunk):
+            sheet.append(row)
+    workbook.save(sink)
+
+_WRITERS = {
+    fmt: writer for fmt, writer in
+    (("CSV", _write_csv), ("Parquet", _write_parquet), ("Excel", _write_excel))
+    if fmt in EXPORT_FORMATS
+}
+
+def write_export(df, fmt, sink, chunksize=EXPORT_CHUNKSIZE):
+    """
+    Grava um DataFrame em um arquivo de exportação, em blocos de linhas
+
+    As colunas numéricas são exportadas como números (não como texto
+    formatado) e as colunas monetárias (MONEY_COLUMNS) em reais, também com
+    MONEY_AS_CENTAVOS.
+
+    Args:
+        df (pandas.DataFrame): Dados a exportar (não são alterados)
+        fmt (str): Formato, uma das chaves de EXPORT_FORMATS
+        sink: Arquivo binário aberto para escrita
+        chunksize (int): Linhas por bloco
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+    _WRITERS[fmt](df, sink, max(1, int(chunksize)))
+
+def export_bytes(df, fmt, chunksize=EXPORT_CHUNKSIZE):
+    """
+    Gera o conteúdo do arquivo de exportação de um DataFrame
+
+    Pensado para o st.download_button com uma função em `data`: o arquivo só
+    é gerado quando o botão é clicado (ver styling.export_button). O botão
+    recebe bytes, então o arquivo gerado fica inteiro em memória (no pico, o
+    buffer e a cópia retornada); os blocos só evitam uma cópia convertida da
+    tabela. Para gravar em disco sem esse pico, use write_export com um arquivo.
+
+    Args:
+        df (pandas.DataFrame): Dados a exportar
+        fmt (str): Formato, uma das chaves de EXPORT_FORMATS
+        chunksize (int): Linhas por bloco
+
+    Returns:
+        bytes: Conteúdo do arquivo
+    """
+    sink = io.BytesIO()
+    write_export(df, fmt, sink, chunksize)
+    return sink.getvalue()
@@ -0,0 +1,163 @@
+import hashlib
+import io
+import os
+import sys
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.schema import read_ledger_csv
+
+# Bytes do início (cabeçalho) e do fim do trecho já lido que são conferidos
+# para garantir que o arquivo apenas ganhou linhas novas
+DIGEST_WINDOW = 64 * 1024
+
+def _digest(data):
+    """Hash BLAKE2b curto de um bloco de bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+@dataclass(frozen=True)
+class IngestState:
+    """
+    Posição até onde um arquivo CSV de lançamentos já foi lido
+
+    Attributes:
+        offset (int): Bytes já lidos desde o início do arquivo
+        mtime_ns (int): mtime do arquivo quando foi lido até `offset`
+        rows (int): Linhas de dados lidas até `offset`
+        head_digest (str): Hash dos primeiros bytes do arquivo (cabeçalho)
+        tail_digest (str): Hash dos últimos bytes antes de `offset`
+        ends_with_newline (bool): Se o trecho lido termina em uma quebra de linha
+    """
+    offset: int
+    mtime_ns: int
+    rows: int
+    head_digest: str
+    tail_digest: str
+    ends_with_newline: bool
+
+    def to_dict(self):
+        """Converte o estado em dicionário (para os metadados do cache)"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstrói o estado a partir de to_dict()
+
+        Returns:
+            IngestState | None: Estado, ou None se o dicionário estiver incompleto
+        """
+        try:
+            return cls(**{field.name: data[field.name] for field in fields(cls)})
+        except (KeyError, TypeError):
+            return None
+
+    def is_current(self, size, mtime_ns):
+        """Se o arquivo ainda tem o tamanho e o mtime de quando foi lido"""
+        return size == self.offset and mtime_ns == self.mtime_ns
+
+def _state_from_bytes(data, mtime_ns, rows):
+    """Monta o IngestState de um arquivo lido por inteiro em `data`"""
+    offset = len(data)
+    return IngestState(
+        offset=offset,
+        mtime_ns=mtime_ns,
+        rows=rows,
+        head_digest=_digest(data[:DIGEST_WINDOW]),
+        tail_digest=_digest(data[max(0, offset - DIGEST_WINDOW):]),
+        ends_with_newline=data.endswith(b'\n'),
+    )
+
+def _state_from_file(f, offset, mtime_ns, rows):
+    """Monta o IngestState de um arquivo aberto, lido até `offset`"""
+    f.seek(0)
+    head = f.read(min(offset, DIGEST_WINDOW))
+    f.seek(max(0, offset - DIGEST_WINDOW))
+    tail = f.read(offset - max(0, offset - DIGEST_WINDOW))
+    return IngestState(
+        offset=offset,
+        mtime_ns=mtime_ns,
+        rows=rows,
+        head_digest=_digest(head),
+        tail_digest=_digest(tail),
+        ends_with_newline=tail.endswith(b'\n'),
+    )
+
+def read_csv_snapshot(filepath, **kwargs):
+    """
+    Lê um CSV de lançamentos inteiro e registra até onde ele foi lido
+
+    O arquivo é lido uma única vez em memória, de modo que o estado retornado
+    corresponde exatamente aos bytes analisados, mesmo que o arquivo esteja
+    recebendo novas linhas durante a leitura.
+
+    Args:
+        filepath (str | Path): Caminho do arquivo CSV
+        **kwargs: Argumentos adicionais para read_ledger_csv
+
+    Returns:
+        tuple: (DataFrame tipado, IngestState)
+    """
+    mtime_ns = os.stat(filepath).st_mtime_ns
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    df = read_ledger_csv(io.BytesIO(data), **kwargs)
+    return df, _state_from_bytes(data, mtime_ns, len(df))
+
+def is_append(filepath, state, size):
+    """
+    Verifica se o arquivo apenas ganhou linhas depois de `state`
+
+    O arquivo precisa ter crescido, o trecho já lido precisa terminar em uma
+    quebra de linha e o cabeçalho e os últimos bytes lidos precisam estar
+    intactos. Qualquer outra mudança é tratada como reescrita do arquivo.
+
+    Args:
+        filepath (str | Path): Caminho do arquivo CSV
+        state (IngestState): Estado da última leitura
+        size (int): Tamanho atual do arquivo
+
+    Returns:
+        bool: True se basta ler os bytes a partir de state.offset
+    """
+    if state is None or size <= state.offset or state.offset == 0 or not state.ends_with_newline:
+        return False
+    try:
+        with open(filepath, 'rb') as f:
+            head = f.read(min(state.offset, DIGEST_WINDOW))
+            f.seek(max(0, state.offset - DIGEST_WINDOW))
+            tail = f.read(state.offset - max(0, state.offset - DIGEST_WINDOW))
+    except OSError:
+        return False
+    return _digest(head) == state.head_digest and _digest(tail) == state.tail_digest
+
+def read_appended_rows(filepath, state, size, mtime_ns):
+    """
+    Lê apenas as linhas acrescentadas ao arquivo depois de `state`
+
+    Só são lidas linhas completas (até a última quebra de linha antes de
+    `size`); uma linha ainda sendo gravada fica para a próxima leitura.
+    O cabeçalho do arquivo é reaproveitado para que as colunas e o esquema
+    sejam os mesmos da leitura completa.
+
+    Args:
+        filepath (str | Path): Caminho do arquivo CSV
+        state (IngestState): Estado da última leitura (ver is_append)
+        size (int): Tamanho do arquivo a considerar
+        mtime_ns (int): mtime do arquivo com esse tamanho
+
+    Returns:
+        tuple: (DataFrame tipado com as novas linhas ou None se não houver
+            linha completa, novo IngestState)
+    """
+    with open(filepath, 'rb') as f:
+        header = f.readline()
+        f.seek(state.offset)
+        data = f.read(size - state.offset)
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return None, state
+        df = read_ledger_csv(io.BytesIO(header + data[:end]))
+        return df, _state_from_file(f, state.offset + end, mtime_ns, state.rows + len(df))
@@ -0,0 +1,207 @@
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar o módulo config
+sys.path.append(str(Path(__file__).parent.parent))
+from config import MONEY_AS_CENTAVOS
+
+# Colunas monetárias dos dados e das tabelas derivadas exibidas nos gráficos
+MONEY_COLUMNS = ('Valor', 'Receita', 'Custo_por_KM')
+
+# Códigos Unicode dos caracteres aceitos em um valor monetário além dos dígitos:
+# vírgula decimal, ponto de milhar, espaços, "R$", sinais e parênteses (negativo)
+_COMMA = ord(',')
+_MINUS = ord('-')
+_OPEN_PAREN = ord('(')
+_IGNORED = np.array([0, ord('.'), ord(' '), 0xA0, ord('R'), ord('$'), ord('+'), ord(')')], dtype=np.uint32)
+
+# Até este número de dígitos a conta vetorizada em int64 é exata (e o valor cabe
+# com folga em float64); valores mais longos são convertidos pelo Python
+_MAX_DIGITS = 16
+
+# Caracteres (linhas × largura) da matriz de caracteres de cada lote; os textos
+# são agrupados por tamanho, então um texto longo não alarga o lote dos curtos
+_BATCH_CHARS = 1 << 22
+
+# Limite de valores distintos por lote
+_BATCH_SIZE = 1 << 16
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+def _parse_long_value(text, n_decimals, negative, centavos):
+    """
+    Converte um valor com mais de _MAX_DIGITS dígitos com inteiros do Python
+
+    Raises:
+        OverflowError: Se o valor em centavos não couber em int64
+    """
+    number = int(''.join(ch for ch in text if '0' <= ch <= '9'))
+    sign = -1 if negative else 1
+    if not centavos:
+        return sign * (number / 10 ** n_decimals)
+    if n_decimals <= 2:
+        value = number * 10 ** (2 - n_decimals)
+    else:
+        scale = 10 ** (n_decimals - 2)
+        value = (number + scale // 2) // scale
+    if value > _INT64_MAX:
+        raise OverflowError(f"Valor monetário fora do intervalo suportado em centavos: {text!r}")
+    return sign * value
+
+def _parse_unique_values(values, centavos=False):
+    """
+    Converte valores de texto distintos em centavos ou em reais
+
+    Os textos são tratados como uma matriz de caracteres (uma linha por valor),
+    e todos os passos (validação, posição da vírgula, soma dos dígitos e sinal)
+    são operações vetorizadas do numpy sobre essa matriz. Valores com mais de
+    _MAX_DIGITS dígitos são convertidos à parte (ver _parse_long_value).
+
+    Args:
+        values (numpy.ndarray): Textos a converter
+        centavos (bool): Se True, centavos em int64 (arredondando casas além
+            da segunda); se False, reais em float64 com todas as casas
+
+    Returns:
+        tuple: (valores convertidos, máscara de valores válidos)
+
+    Raises:
+        OverflowError: Com centavos=True, se um valor não couber em int64
+    """
+    dtype = np.int64 if centavos else float
+    if len(values) == 0:
+        return np.zeros(0, dtype=dtype), np.zeros(0, dtype=bool)
+
+    text = np.asarray(values, dtype=str)
+    width = max(text.dtype.itemsize // 4, 1)
+    chars = text.view(np.uint32).reshape(len(text), width)
+
+    is_digit = (chars >= ord('0')) & (chars <= ord('9'))
+    is_comma = chars == _COMMA
+    is_minus = chars == _MINUS
+    is_paren = chars == _OPEN_PAREN
+
+    n_digits = is_digit.sum(axis=1)
+    valid = (
+        (is_digit | is_comma | is_minus | is_paren | np.isin(chars, _IGNORED)).all(axis=1)
+        & (n_digits > 0)
+        & (is_comma.sum(axis=1) <= 1)
+    )
+    exact = valid & (n_digits <= _MAX_DIGITS)
+
+    # Dígitos depois da vírgula decimal (casas decimais)
+    has_comma = is_comma.any(axis=1)
+    comma_at = np.where(has_comma, is_comma.argmax(axis=1), width)
+    n_decimals = (is_digit & (np.arange(width) > comma_at[:, None])).sum(axis=1)
+
+    # Valor inteiro formado por todos os dígitos, ignorando pontos e vírgula
+    digits = np.where(is_digit, chars - ord('0'), 0).astype(np.int64)
+    exponent = np.cumsum(is_digit[:, ::-1], axis=1)[:, ::-1] - is_digit
+    exponent = np.where(is_digit & exact[:, None], exponent, 0)
+    number = (digits * np.power(10, exponent, dtype=np.int64)).sum(axis=1)
+
+    if centavos:
+        # Exatamente duas casas decimais (arredondando se houver mais)
+        scale = np.power(10, np.abs(2 - n_decimals), dtype=np.int64)
+        parsed = np.where(n_decimals <= 2, number * scale, (number + scale // 2) // scale)
+    else:
+        # Divisão correta de inteiros exatos: o mesmo float de float("1234.567")
+        parsed = number / np.power(10.0, n_decimals)
+
+    negative = is_minus.any(axis=1) | is_paren.any(axis=1)
+    parsed = np.where(exact, np.where(negative, -parsed, parsed), 0).astype(dtype)
+
+    for i in np.flatnonzero(valid & ~exact):
+        parsed[i] = _parse_long_value(str(text[i]), int(n_decimals[i]), bool(negative[i]), centavos)
+    return parsed, valid
+
+def _parse_in_batches(uniques, centavos):
+    """
+    Converte os textos distintos em lotes de textos de tamanho parecido
+
+    Os textos são ordenados por tamanho, e cada lote tem no máximo
+    _BATCH_CHARS caracteres na matriz: a largura da matriz é a do maior texto
+    do lote, não a do maior texto da coluna.
+    """
+    parsed = np.zeros(len(uniques), dtype=np.int64 if centavos else float)
+    lengths = np.fromiter(map(len, uniques), dtype=np.int64, count=len(uniques))
+    order = np.argsort(lengths, kind='stable')
+
+    start = 0
+    while start < len(order):
+        stop = min(start + _BATCH_SIZE, len(order))
+        # O maior texto do lote é o último (ordem crescente de tamanho)
+        rows = max(1, min(stop - start, _BATCH_CHARS // max(int(lengths[order[stop - 1]]), 1)))
+        batch = order[start:start + rows]
+        parsed[batch] = _parse_unique_values(uniques[batch], centavos)[0]
+        start += rows
+    return parsed
+
+def parse_brl(series, centavos=False):
+    """
+    Converte valores monetários no formato brasileiro para números
+
+    Aceita "R$ 1.234,56", "1234,56", "-R$ 10,00", "(10,00)" (negativo) e
+    valores em branco. Pontos são sempre separadores de milhar e a vírgula é
+    o separador decimal. Cada valor distinto é convertido uma única vez e o
+    resultado é distribuído pelas linhas, de modo que colunas com valores
+    repetidos são convertidas em tempo proporcional ao número de valores
+    distintos. Valores vazios ou que não são números viram 0.
+
+    Em reais, todas as casas decimais são mantidas ("1,234" vira 1.234); em
+    centavos, casas além da segunda são arredondadas ("1,235" vira 124).
+
+    Args:
+        series (pandas.Series): Coluna com os valores em texto
+        centavos (bool): Se True, retorna centavos exatos em int64; se False,
+            retorna reais em float64
+
+    Returns:
+        pandas.Series: Valores convertidos, com o mesmo índice da entrada
+
+    Raises:
+        OverflowError: Com centavos=True, se um valor não couber em int64
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = pd.Series(series.cat.categories).astype(str).to_numpy(dtype=object)
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        uniques = pd.Series(np.asarray(uniques, dtype=object)).astype(str).to_numpy(dtype=object)
+
+    parsed = _parse_in_batches(uniques, centavos)
+
+    # Código -1 indica valor ausente (NaN/None), convertido para 0
+    result = np.where(codes >= 0, parsed[codes] if len(parsed) else 0, 0).astype(parsed.dtype)
+    return pd.Series(result, index=series.index, name=series.name)
+
+def reais_to_centavos(values):
+    """
+    Converte valores em reais (float) para centavos inteiros, arredondando
+
+    Args:
+        values (pandas.Series): Valores em reais
+
+    Returns:
+        pandas.Series: Centavos como int64 (valores ausentes viram 0)
+    """
+    centavos = np.rint(np.nan_to_num(values.to_numpy(dtype=float) * 100)).astype(np.int64)
+    return pd.Series(centavos, index=values.index, name=values.name)
+
+def to_reais(value):
+    """
+    Converte um valor monetário da representação interna para reais
+
+    Com MONEY_AS_CENTAVOS os valores são guardados em centavos e divididos por
+    100 aqui; do contrário, já estão em reais e são retornados sem alteração.
+    Vale também para grandezas proporcionais a Valor (médias, custo por km).
+
+    Args:
+        value (float | int | pandas.Series | numpy.ndarray): Valor monetário
+
+    Returns:
+        Mesmo tipo da entrada, em reais
+    """
+    return value / 100 if MONEY_AS_CENTAVOS else value
@@ -1,95 +1,368 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
 import sys
 from pathlib import Path
 
 # Adiciona o diretório pai ao path para importar o módulo config
 sys.path.append(str(Path(__file__).parent.parent))
-from config import EXPENSE_TYPES
+from config import EXPENSE_TYPES, MONEY_AS_CENTAVOS
+from utils.money import parse_brl, reais_to_centavos
+from utils.dates import parse_dates, derive_date_columns
+
+# Copy-on-write (padrão a partir do pandas 3): cópias rasas e fatias de um
+# DataFrame compartilham os dados com ele até que um dos dois seja alterado,
+# de modo que o pré-processamento e as telas não precisam de cópias completas
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+def parse_money(series):
+    """
+    Converte uma coluna monetária no formato brasileiro (R$ 1.234,56) para float
+    
+    Colunas já numéricas são mantidas; as de texto são convertidas por
+    utils.money.parse_brl. Valores inválidos ou vazios viram 0.
+    
+    Com MONEY_AS_CENTAVOS o resultado fica em centavos (int64): colunas de
+    texto e de float (reais) são convertidas, e colunas inteiras são
+    consideradas já convertidas, o que torna a função idempotente.
+    
+    Args:
+        series (pandas.Series): Coluna com os valores
+        
+    Returns:
+        pandas.Series: Valores como float64 (reais) ou int64 (centavos)
+    """
+    if not pd.api.types.is_numeric_dtype(series):
+        return parse_brl(series, centavos=MONEY_AS_CENTAVOS)
+    if MONEY_AS_CENTAVOS:
+        return series if pd.api.types.is_integer_dtype(series) else reais_to_centavos(series)
+    return pd.to_numeric(series, errors='coerce').fillna(0)
+
+def _apply_text_rule(series, rule):
+    """
+    Aplica uma regra de texto (função de Series de str em Series) a uma coluna
+    
+    Em colunas category a regra roda apenas sobre as categorias distintas e o
+    resultado é remapeado pelos códigos, mantendo o dtype category; categorias
+    que passam a ter o mesmo texto são unificadas.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return rule(series)
+    
+    # sort=True mantém as categorias em ordem alfabética, como a ordenação de texto
+    new_labels = rule(pd.Series(series.cat.categories, dtype=object))
+    new_codes, new_categories = pd.factorize(new_labels, sort=True)
+    codes = series.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, new_codes[codes], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=new_categories),
+        index=series.index,
+        name=series.name,
+    )
+
+def _fill_text(series, value):
+    """Preenche valores ausentes de uma coluna de texto, aceitando dtype category"""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.set_categories(sorted([*series.cat.categories, value]))
+    return series.fillna(value)
+
+@lru_cache(maxsize=4096)
+def classify_gastos(value):
+    """
+    Retorna o tipo de EXPENSE_TYPES de um valor bruto da coluna GASTOS
+    
+    O valor é classificado no tipo cujo nome contém (sem diferenciar
+    maiúsculas); se houver mais de um, vale o primeiro de EXPENSE_TYPES.
+    Valores que não correspondem a nenhum tipo são mantidos como estão.
+    O resultado fica memorizado por valor distinto.
+    
+    Args:
+        value (str): Valor bruto de GASTOS
+        
+    Returns:
+        str: Tipo correspondente ou o próprio valor
+    """
+    if not isinstance(value, str):
+        return value
+    lowered = value.lower()
+    for tipo in EXPENSE_TYPES:
+        if tipo.lower() in lowered:
+            return tipo
+    return value
+
+def _normalize_gastos(series):
+    """
+    Padroniza os valores de GASTOS com base em EXPENSE_TYPES
+    
+    Cada valor distinto é classificado uma única vez (classify_gastos) e o
+    resultado é distribuído pelas linhas pelos códigos de pd.factorize.
+    """
+    codes, uniques = pd.factorize(series)
+    # Código -1 (valor ausente) aponta para o NaN acrescentado no fim
+    labels = np.array([classify_gastos(value) for value in uniques] + [np.nan], dtype=object)
+    return pd.Series(labels[codes], index=series.index, name=series.name)
+
+def is_card_account(value):
+    """
+    Indica se um valor da coluna Conta é de cartão corporativo
+    
+    Cartões são identificados pelo número (ex.: "4321"); contas bancárias e
+    demais origens têm nome.
+    
+    Args:
+        value (str): Valor da coluna Conta
+        
+    Returns:
+        bool: True se o valor é numérico
+    """
+    try:
+        float(value)
+        return True
+    except (ValueError, TypeError):
+        return False
+
+def _flag_card_accounts(series):
+    """
+    Marca as linhas de cartão corporativo a partir da coluna Conta
+    
+    Cada valor distinto é testado uma única vez (is_card_account) e o
+    resultado é distribuído pelas linhas pelos códigos.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series)
+    # Código -1 (valor ausente) aponta para o False acrescentado no fim
+    flags = np.array([is_card_account(value) for value in uniques] + [False], dtype=bool)
+    return pd.Series(flags[codes], index=series.index, name='Cartão')
+
+# Colunas criadas pelo pré-processamento e a coluna dos arquivos de onde vêm
+DERIVED_COLUMNS = {
+    'Mes': 'Data',
+    'Mes_Nome': 'Data',
+    'Ano': 'Data',
+    'Mês Ano': 'Data',
+    'Cartão': 'Conta',
+}
 
 def preprocess_financial_data(df):
     """
     Pré-processa dados financeiros
     
+    Não altera o DataFrame recebido: o resultado é uma cópia rasa em que
+    apenas as colunas transformadas ocupam memória nova. Cada coluna é
+    tratada de forma independente e as ausentes são ignoradas, de modo que
+    um DataFrame lido só com algumas colunas (ver utils.query) tem essas
+    colunas pré-processadas como no DataFrame completo.
+    
     Args:
         df (pandas.DataFrame): DataFrame com dados financeiros
         
     Returns:
         pandas.DataFrame: DataFrame processado
     """
-    df_processed = df.copy()
+    df_processed = df.copy(deep=False)
 
     if 'Conta' in df_processed.columns:
-        df_processed['Conta'] = df_processed['Conta'].fillna('Não Informado')
-        df_processed['Conta'] = df_processed['Conta'].str.strip().str.title()
+        df_processed['Conta'] = _fill_text(df_processed['Conta'], 'Não Informado')
+        df_processed['Conta'] = _apply_text_rule(df_processed['Conta'], lambda s: s.str.strip().str.title())
+        df_processed['Cartão'] = _flag_card_accounts(df_processed['Conta'])
         
     # Convertendo colunas de data
     if 'Data' in df_processed.columns:
-        df_processed['Data'] = pd.to_datetime(df_processed['Data'], errors='coerce')
-        df_processed['Mes'] = df_processed['Data'].dt.month
-        df_processed['Mes_Nome'] = df_processed['Data'].dt.month_name()
-        df_processed['Ano'] = df_processed['Data'].dt.year
-        df_processed['Mês Ano'] = df_processed['Data'].dt.strftime('%B %Y')  # Add this line
+        df_processed['Data'] = parse_dates(df_processed['Data'])
+        for col, values in derive_date_columns(df_processed['Data']).items():
+            df_processed[col] = values
 
     # Convertendo valores monetários
     monetary_columns = ['Valor']
     for col in monetary_columns:
-        if df_processed[col].dtype == object:
-            df_processed[col] = df_processed[col].astype(str)
-            df_processed[col] = df_processed[col].str.replace('R\$', '', regex=True)
-            df_processed[col] = df_processed[col].str.replace('.', '', regex=False)
-            df_processed[col] = df_processed[col].str.replace(',', '.', regex=False)
-        df_processed[col] = pd.to_numeric(df_processed[col], errors='coerce').fillna(0)
+        if col in df_processed.columns:
+            df_processed[col] = parse_money(df_processed[col])
 
     # Preenchendo colunas vazias com padrão
-    df_processed['Tipo'] = df_processed['Tipo'].fillna('Não Classificado')
-    df_processed['Categoria'] = df_processed['Categoria'].fillna('Não Classificada')
+    if 'Tipo' in df_processed.columns:
+        df_processed['Tipo'] = _fill_text(df_processed['Tipo'], 'Não Classificado')
+    if 'Categoria' in df_processed.columns:
+        df_processed['Categoria'] = _fill_text(df_processed['Categoria'], 'Não Classificada')
 
-    # Padroniza os tipos com base em EXPENSE_TYPES
-    for tipo in EXPENSE_TYPES:
-        mask = df_processed['GASTOS'].str.contains(tipo, case=False, na=False)
-        df_processed.loc[mask, 'GASTOS'] = tipo
+    # Padroniza os tipos com base em EXPENSE_TYPES (em colunas category, só as categorias)
+    if 'GASTOS' in df_processed.columns:
+        df_processed['GASTOS'] = _apply_text_rule(df_processed['GASTOS'], _normalize_gastos)
 
     return df_processed
 
-def calculate_financial_metrics(df, year=None):
+def _column_codes(series):
     """
-    Calcula métricas financeiras a partir dos dados
+    Códigos inteiros de uma coluna e os valores correspondentes
+    
+    Em colunas category os códigos já existentes são reaproveitados e em
+    colunas inteiras de faixa pequena (como Mes) o código é o próprio valor
+    deslocado; nas demais é feito um pd.factorize. Valores ausentes recebem um
+    código próprio.
+    """
+    values = series.to_numpy() if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iu' else None
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        uniques = series.cat.categories.astype(object)
+    elif values is not None and len(values) and int(values.max()) - int(values.min()) < 4096:
+        start = int(values.min())
+        codes = values.astype(np.int64) - start
+        uniques = pd.Index(np.arange(start, int(values.max()) + 1, dtype=values.dtype), dtype=object)
+    else:
+        codes, uniques = pd.factorize(series, sort=True)
+        codes = codes.astype(np.int64)
+        uniques = pd.Index(uniques, dtype=object)
+    if (codes < 0).any():
+        codes = np.where(codes < 0, len(uniques), codes)
+        uniques = uniques.append(pd.Index([np.nan], dtype=object))
+    return codes, uniques
+
+def grouped_sum(df, keys, value='Valor'):
+    """
+    Soma uma coluna agrupada por várias colunas em uma única passada
+    
+    Os códigos de cada coluna de agrupamento são combinados em um único
+    inteiro por linha e as somas saem de um np.bincount. Quando o número de
+    combinações possíveis é grande demais para isso, usa DataFrame.groupby.
     
     Args:
-        df (pandas.DataFrame): DataFrame com dados financeiros
-        year (int, optional): Ano específico para filtrar os dados
+        df (pandas.DataFrame): Dados
+        keys (list): Colunas de agrupamento
+        value (str): Coluna a somar
         
     Returns:
-        dict: Dicionário com métricas financeiras
+        pandas.Series: Somas das combinações presentes nos dados, indexadas
+            pelas colunas de agrupamento (ausentes incluídos como NaN)
     """
-    if not isinstance(df, pd.DataFrame):
-        raise TypeError("Input must be a pandas DataFrame")
-        
-    if year and year not in df['Ano'].unique():
-        raise ValueError(f"Year {year} not found in the dataset")
-        
-    df_filtered = df[df['Ano'] == year] if year else df.copy()
+    codes, levels = zip(*(_column_codes(df[key]) for key in keys)) if len(df) else ((), ())
+    shape = tuple(len(level) for level in levels)
+    
+    if not len(df) or np.prod(shape, dtype=float) > max(len(df), 1 << 16):
+        return df.groupby(keys, observed=True, dropna=False)[value].sum()
+    
+    combined = np.ravel_multi_index(codes, shape)
+    weights = np.nan_to_num(df[value].to_numpy(dtype=float))
+    sums = np.bincount(combined, weights=weights, minlength=int(np.prod(shape)))
+    if pd.api.types.is_integer_dtype(df[value]):
+        # Colunas inteiras (centavos) continuam inteiras; as somas em float64 são exatas até 2**53
+        sums = np.rint(sums).astype(np.int64)
+    present = np.flatnonzero(np.bincount(combined, minlength=sums.size))
     
-    # Standardize GASTOS column values before filtering
-    df_filtered['GASTOS'] = df_filtered['GASTOS'].astype(str).str.strip().str.title()
-    df_filtered = df_filtered[df_filtered['GASTOS'].isin(EXPENSE_TYPES)]
+    index = pd.MultiIndex(
+        levels=[level.dropna() for level in levels],
+        codes=[
+            np.where(pd.isna(level[c]), -1, c) if level.hasnans else c
+            for level, c in zip(levels, np.unravel_index(present, shape))
+        ],
+        names=keys,
+    )
+    return pd.Series(sums[present], index=index, name=value)
 
+def _partial_metrics(df):
+    """
+    Soma Valor por GASTOS, Mes e Categoria em uma única agregação
+    
+    Todas as métricas são derivadas dessa soma agrupada, que tem uma linha por
+    combinação presente nos dados e não por lançamento. Somas de blocos
+    diferentes podem ser combinadas com _merge_partial_metrics, o que permite
+    calcular as métricas em streaming ou só com as linhas novas.
+    
+    Returns:
+        pandas.Series: Soma de Valor indexada por GASTOS, Mes e Categoria
+            (as colunas ausentes no DataFrame são omitidas do índice)
+    """
+    keys = ['GASTOS'] + [col for col in ('Mes', 'Categoria') if col in df.columns]
+    return grouped_sum(df, keys)
+
+def _merge_partial_metrics(left, right):
+    """Combina as somas parciais de dois blocos de dados"""
+    if left is None:
+        return right
+    if list(left.index.names) != list(right.index.names):
+        raise ValueError("Blocos com colunas diferentes não podem ser combinados")
+    
+    merged = pd.concat([left, right])
+    return merged.groupby(level=list(range(merged.index.nlevels)), observed=True, dropna=False, sort=False).sum()
+
+def _finalize_metrics(partial):
+    """Monta o dicionário de métricas a partir das somas parciais"""
+    expenses = partial[partial.index.get_level_values('GASTOS').isin(EXPENSE_TYPES)]
+    por_tipo = expenses.groupby(level='GASTOS', observed=True).sum()
+    por_tipo.index = por_tipo.index.astype(object)
+    
     metrics = {}
-    metrics['total_despesas'] = df_filtered['Valor'].sum()
+    metrics['total_despesas'] = expenses.sum()
 
     for tipo in EXPENSE_TYPES:
-        valor = df_filtered[df_filtered['GASTOS'] == tipo]['Valor'].sum()
+        valor = por_tipo.get(tipo, 0.0)
         metrics[f'total_{tipo.lower().replace(" ", "_")}'] = valor
         metrics[f'percentual_{tipo.lower().replace(" ", "_")}'] = (
             (valor / metrics['total_despesas']) * 100 if metrics['total_despesas'] > 0 else 0
         )
 
-    if 'Mes' in df_filtered.columns:
-        metrics['despesas_por_mes'] = df_filtered.groupby('Mes')['Valor'].sum().to_dict()
+    if 'Mes' in partial.index.names:
+        metrics['despesas_por_mes'] = expenses.groupby(level='Mes').sum().to_dict()
 
-    if 'Categoria' in df_filtered.columns:
-        metrics['despesas_por_categoria'] = df_filtered.groupby('Categoria')['Valor'].sum().to_dict()
+    if 'Categoria' in partial.index.names:
+        metrics['despesas_por_categoria'] = expenses.groupby(level='Categoria', observed=True).sum().to_dict()
 
-    return metrics
\ No newline at end of file
+    return metrics
+
+class FinancialMetricsAccumulator:
+    """
+    Acumula as métricas de calculate_financial_metrics bloco a bloco
+    
+    Cada bloco pré-processado é reduzido a somas parciais (Valor por GASTOS,
+    mês e categoria) e descartado, de modo que a memória usada depende do
+    tamanho do bloco e não do tamanho do arquivo.
+    """
+    
+    def __init__(self):
+        self._partial = None
+        self.rows = 0
+    
+    def update(self, df_chunk):
+        """
+        Incorpora um bloco de dados já pré-processado
+        
+        Args:
+            df_chunk (pandas.DataFrame): Bloco pré-processado
+        """
+        self.rows += len(df_chunk)
+        self._partial = _merge_partial_metrics(self._partial, _partial_metrics(df_chunk))
+    
+    def result(self):
+        """
+        Retorna as métricas acumuladas até agora
+        
+        Returns:
+            dict: Dicionário no mesmo formato de calculate_financial_metrics
+        """
+        if self._partial is None:
+            return _finalize_metrics(_partial_metrics(
+                pd.DataFrame(columns=['GASTOS', 'Valor', 'Mes', 'Categoria'])
+            ))
+        return _finalize_metrics(self._partial)
+
+def calculate_financial_metrics(df, year=None):
+    """
+    Calcula métricas financeiras a partir dos dados
+    
+    Args:
+        df (pandas.DataFrame): DataFrame com dados financeiros
+        year (int, optional): Ano específico para filtrar os dados
+        
+    Returns:
+        dict: Dicionário com métricas financeiras
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+        
+    if year and year not in df['Ano'].unique():
+        raise ValueError(f"Year {year} not found in the dataset")
+        
+    # Uma única agregação por GASTOS, mês e categoria; o resto sai dela
+    return _finalize_metrics(_partial_metrics(df[df['Ano'] == year] if year else df))
@@ -0,0 +1,255 @@
+import pandas as pd
+import numpy as np
+import sys
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.data_loader import (
+    read_ledger, concat_ledgers, get_partitions, get_available_years, peek_processed_data
+)
+from utils.preprocessing import preprocess_financial_data, DERIVED_COLUMNS
+from utils.schema import read_ledger_columns
+
+def _is_value_list(condition):
+    """Se a condição de filtro é uma lista de valores aceitos"""
+    return isinstance(condition, (list, tuple, set, frozenset, pd.Index, np.ndarray))
+
+def _condition_values(condition):
+    """Valores aceitos por uma condição de filtro, ou None se ela for uma função"""
+    if callable(condition):
+        return None
+    return set(condition) if _is_value_list(condition) else {condition}
+
+def _condition_mask(column, condition):
+    """Máscara booleana das linhas de `column` que satisfazem a condição"""
+    if callable(condition):
+        return np.asarray(condition(column), dtype=bool)
+    if _is_value_list(condition):
+        return column.isin(condition).to_numpy()
+    return (column == condition).to_numpy()
+
+def _read_projected(year, months, columns):
+    """
+    Lê e pré-processa apenas as colunas necessárias das partições do ano
+
+    As colunas criadas pelo pré-processamento (Mes, Ano, Cartão...) são lidas
+    pela coluna de origem (Data, Conta); colunas que não existem nos arquivos
+    são ignoradas.
+    """
+    source = {DERIVED_COLUMNS.get(col, col) for col in columns}
+    frames = []
+    for partition in get_partitions(year, months):
+        file_columns = [col for col in read_ledger_columns(partition.path) if col in source]
+        frames.append(read_ledger(partition.path, columns=file_columns))
+    return preprocess_financial_data(concat_ledgers(frames))
+
+@dataclass(frozen=True)
+class LedgerQuery:
+    """
+    Consulta preguiçosa sobre os lançamentos pré-processados
+
+    Cada método retorna uma nova consulta; nada é lido até collect() ou uma
+    agregação de groupby(). Filtros por Ano e Mes com valores fixos escolhem
+    quais anos e partições mensais são lidos, e só as colunas usadas em
+    filtros, seleção e agrupamento são lidas dos arquivos. Anos já carregados
+    por load_processed_data são consultados em memória, sem nova leitura.
+
+    Exemplo:
+        scan([2023, 2024]).filter({'Usuário': 'Ana'}).groupby('Mes').sum()
+
+    Attributes:
+        years (tuple): Anos a consultar
+        months (tuple | None): Meses a consultar; None para todos
+        filters (tuple): Pares (coluna, condição) aplicados às linhas
+        columns (tuple | None): Colunas do resultado; None para todas
+    """
+    years: tuple
+    months: tuple = None
+    filters: tuple = ()
+    columns: tuple = None
+
+    def filter(self, conditions=None, **kwargs):
+        """
+        Restringe as linhas da consulta
+
+        Args:
+            conditions (dict, optional): Condições por coluna, útil para nomes com
+                espaços (ex.: 'Mês Ano'). A condição pode ser um valor único, uma
+                lista de valores aceitos ou uma função que recebe a coluna e
+                retorna uma máscara booleana
+            **kwargs: Condições por coluna, como em `conditions`
+
+        Returns:
+            LedgerQuery: Nova consulta com os filtros acrescentados
+        """
+        conditions = {**(conditions or {}), **kwargs}
+        query = replace(self, filters=self.filters + tuple(conditions.items()))
+
+        # Valores fixos de Ano e Mes reduzem os anos e as partições a ler
+        years = _condition_values(conditions['Ano']) if 'Ano' in conditions else None
+        if years is not None:
+            query = replace(query, years=tuple(year for year in query.years if year in years))
+        months = _condition_values(conditions['Mes']) if 'Mes' in conditions else None
+        if months is not None:
+            current = set(range(1, 13) if query.months is None else query.months)
+            query = replace(query, months=tuple(sorted(int(m) for m in months if m in current)))
+        return query
+
+    def select(self, *columns):
+        """
+        Restringe as colunas do resultado
+
+        Args:
+            *columns (str): Colunas a manter
+
+        Returns:
+            LedgerQuery: Nova consulta com a seleção
+        """
+        if self.columns is not None:
+            columns = [col for col in columns if col in self.columns]
+        return replace(self, columns=tuple(columns))
+
+    def groupby(self, *keys):
+        """
+        Agrupa o resultado da consulta
+
+        Args:
+            *keys (str): Colunas de agrupamento
+
+        Returns:
+            LedgerGroupBy: Agrupamento; a consulta é executada na agregação
+        """
+        return LedgerGroupBy(self, list(keys))
+
+    def _required_columns(self):
+        """Colunas a ler: as do resultado e as dos filtros (None para todas)"""
+        if self.columns is None:
+            return None
+        required = list(self.columns)
+        for column, _ in self.filters:
+            if column not in required:
+                required.append(column)
+        return required
+
+    def _collect_year(self, year):
+        """Linhas e colunas da consulta em um ano"""
+        required = self._required_columns()
+
+        # Anos já em memória (carregados por outra página) não são relidos
+        df = peek_processed_data(year)
+        if df is None and self.months is not None:
+            df = peek_processed_data(year, self.months)
+        if df is None:
+            if required is None:
+                df = preprocess_financial_data(concat_ledgers(
+                    [read_ledger(p.path) for p in get_partitions(year, self.months)]
+                ))
+            else:
+                df = _read_projected(year, self.months, required)
+
+        if required is not None:
+            df = df[[col for col in required if col in df.columns]]
+
+        if self.filters:
+            mask = np.ones(len(df), dtype=bool)
+            for column, condition in self.filters:
+                mask &= _condition_mask(df[column], condition)
+            df = df[mask]
+
+        if self.columns is not None:
+            df = df[[col for col in self.columns if col in df.columns]]
+        return df
+
+    def collect(self):
+        """
+        Executa a consulta
+
+        Returns:
+            pandas.DataFrame: Linhas e colunas selecionadas de todos os anos
+                (vazio, sem colunas, se nenhum ano for consultado)
+        """
+        frames = []
+        # Filtros de Mes sem nenhum mês em comum não selecionam nada
+        years = self.years if self.months is None or self.months else ()
+        for year in years:
+            try:
+                frames.append(self._collect_year(year))
+            except FileNotFoundError as e:
+                print(f"Aviso: {e}")
+        if not frames:
+            return pd.DataFrame(columns=list(self.columns or []))
+        return concat_ledgers(frames).reset_index(drop=True)
+
+class LedgerGroupBy:
+    """Agrupamento de uma LedgerQuery, executado ao pedir uma agregação"""
+
+    def __init__(self, query, keys):
+        """
+        Args:
+            query (LedgerQuery): Consulta de origem
+            keys (list): Colunas de agrupamento
+        """
+        self.query = query
+        self.keys = keys
+
+    def agg(self, **aggregations):
+        """
+        Agrega colunas por grupo (mesma sintaxe de agregação nomeada do pandas)
+
+        Exemplo:
+            .agg(Total=('Valor', 'sum'), Lancamentos=('Valor', 'size'))
+
+        Args:
+            **aggregations: nome -> (coluna, função)
+
+        Returns:
+            pandas.DataFrame: Uma linha por grupo, indexada pelas chaves
+        """
+        columns = list(self.keys)
+        for column, _ in aggregations.values():
+            if column not in columns:
+                columns.append(column)
+        df = self.query.select(*columns).collect()
+        return df.groupby(self.keys, observed=True).agg(**aggregations)
+
+    def sum(self, column='Valor'):
+        """
+        Soma uma coluna por grupo
+
+        Args:
+            column (str): Coluna a somar
+
+        Returns:
+            pandas.Series: Somas indexadas pelas chaves
+        """
+        return self.agg(**{column: (column, 'sum')})[column]
+
+    def size(self):
+        """
+        Conta as linhas de cada grupo
+
+        Returns:
+            pandas.Series: Número de lançamentos indexado pelas chaves
+        """
+        df = self.query.select(*self.keys).collect()
+        return df.groupby(self.keys, observed=True).size()
+
+def scan(years=None, months=None):
+    """
+    Inicia uma consulta preguiçosa sobre os lançamentos (ver LedgerQuery)
+
+    Args:
+        years (int | list, optional): Ano ou anos; por padrão, todos os disponíveis
+        months (list, optional): Meses a consultar; por padrão, todos
+
+    Returns:
+        LedgerQuery: Consulta sem filtros sobre os anos pedidos
+    """
+    if years is None:
+        years = get_available_years()
+    elif isinstance(years, (int, np.integer)):
+        years = [years]
+    query = LedgerQuery(years=tuple(int(year) for year in years))
+    return query if months is None else query.filter(Mes=list(months))
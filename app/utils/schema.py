@@ -0,0 +1,107 @@
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from utils.preprocessing import parse_money
+from utils.dates import parse_dates
+
+# Esquema das colunas dos arquivos lgd{ano}.csv
+#   datetime: data do lançamento (AAAA-MM-DD, ver utils.dates.parse_dates)
+#   money: valor monetário no formato brasileiro (R$ 1.234,56), convertido para float64
+#          (reais) ou int64 (centavos, com MONEY_AS_CENTAVOS)
+#   float: número simples
+#   category: texto com poucos valores distintos, carregado como category
+#   text: texto livre, mantido como object
+LEDGER_SCHEMA = {
+    'Data': 'datetime',
+    'Valor': 'money',
+    'Tipo': 'category',
+    'Categoria': 'category',
+    'Conta': 'category',
+    'GASTOS': 'category',
+    'Usuário': 'category',
+    'Veículos': 'category',
+    'KM': 'float',
+    'Litros': 'float',
+    'Descrição': 'text',
+}
+
+def get_csv_dtypes(categorical=True):
+    """
+    Retorna o mapeamento de dtypes para pd.read_csv segundo LEDGER_SCHEMA
+
+    Valor, KM e Litros ficam com o tipo inferido pelo pandas e são convertidos
+    por apply_ledger_schema: se vierem como texto (R$, separador de milhar),
+    passam pela limpeza; se já forem numéricos, são mantidos.
+
+    Args:
+        categorical (bool): Se as colunas de baixa cardinalidade devem ser lidas
+            como category (do contrário, como object)
+
+    Returns:
+        dict: Mapeamento coluna -> dtype
+    """
+    dtypes = {}
+    for col, kind in LEDGER_SCHEMA.items():
+        if kind == 'category':
+            dtypes[col] = 'category' if categorical else object
+        elif kind == 'text':
+            dtypes[col] = object
+    return dtypes
+
+def apply_ledger_schema(df):
+    """
+    Converte as colunas de data e numéricas de um DataFrame recém-lido
+
+    As colunas ausentes no arquivo são ignoradas. A conversão é feita no
+    próprio DataFrame, que deve ter acabado de ser lido do CSV.
+
+    Args:
+        df (pandas.DataFrame): DataFrame lido com get_csv_dtypes()
+
+    Returns:
+        pandas.DataFrame: O mesmo DataFrame, com as colunas tipadas
+    """
+    for col, kind in LEDGER_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if kind == 'datetime':
+            df[col] = parse_dates(df[col])
+        elif kind == 'money':
+            # Inteiros lidos do CSV são reais (sem casas decimais), não centavos
+            if pd.api.types.is_integer_dtype(df[col]):
+                df[col] = df[col].astype(float)
+            df[col] = parse_money(df[col])
+        elif kind == 'float':
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+def read_ledger_csv(filepath, categorical=True, **kwargs):
+    """
+    Lê um CSV de lançamentos aplicando o esquema declarado
+
+    Args:
+        filepath (str | Path): Caminho do arquivo CSV
+        categorical (bool): Se as colunas de baixa cardinalidade devem ser category
+        **kwargs: Argumentos adicionais para pd.read_csv (ex.: usecols)
+
+    Returns:
+        pandas.DataFrame: DataFrame tipado
+    """
+    df = pd.read_csv(filepath, delimiter=',', encoding='utf-8',
+                     dtype=get_csv_dtypes(categorical), **kwargs)
+    return apply_ledger_schema(df)
+
+def read_ledger_columns(filepath):
+    """
+    Retorna as colunas de um CSV de lançamentos lendo apenas o cabeçalho
+
+    Args:
+        filepath (str | Path): Caminho do arquivo CSV
+
+    Returns:
+        list: Nomes das colunas do arquivo
+    """
+    return pd.read_csv(filepath, delimiter=',', encoding='utf-8', nrows=0).columns.tolist()
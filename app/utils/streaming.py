@@ -0,0 +1,145 @@
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from config import STREAM_CHUNKSIZE, STREAM_MIN_BYTES, CACHE_MAX_ENTRIES
+from utils.cache import LRUCache
+from utils.data_loader import get_partitions, peek_processed_data, ledger_key
+from utils.preprocessing import preprocess_financial_data, FinancialMetricsAccumulator
+from utils.schema import get_csv_dtypes, apply_ledger_schema
+
+# Resultados calculados em blocos, válidos enquanto os arquivos do ano não mudam
+_streamed_metrics = LRUCache(CACHE_MAX_ENTRIES)
+
+def should_stream(year, months=None, min_bytes=STREAM_MIN_BYTES):
+    """
+    Indica se os dados do ano devem ser lidos em blocos em vez de carregados
+
+    Só vale a leitura em blocos para anos grandes (arquivos somando ao menos
+    `min_bytes`) que ainda não estão em memória; se outra página já carregou
+    o ano, os dados em memória são usados.
+
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+        min_bytes (int): Tamanho mínimo dos arquivos do ano; 0 desativa
+
+    Returns:
+        bool: True para ler em blocos
+    """
+    if min_bytes <= 0:
+        return False
+    if sum(partition.size for partition in get_partitions(year, months)) < min_bytes:
+        return False
+    return peek_processed_data(year, months) is None
+
+def cached_per_files(cache, year, months, build):
+    """
+    Retorna build() memorizado enquanto os arquivos do ano não mudam
+
+    Para resultados calculados em blocos, que não passam pelos dados
+    pré-processados em memória (e portanto não têm LedgerVersion): a chave
+    é a identificação (caminho, tamanho, mtime) de cada partição.
+
+    Args:
+        cache (LRUCache): Cache do resultado
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+        build (callable): Função sem argumentos que calcula o resultado
+
+    Returns:
+        Resultado de build para os arquivos atuais
+    """
+    year_key = ledger_key(year, months)
+    fingerprints = tuple(partition.refreshed().fingerprint for partition in get_partitions(year, months))
+
+    cached = cache.get(year_key)
+    if cached is not None and cached[0] == fingerprints:
+        return cached[1]
+
+    value = build()
+    cache.put(year_key, (fingerprints, value))
+    return value
+
+def iter_file_chunks(filepath, chunksize=STREAM_CHUNKSIZE):
+    """
+    Lê um arquivo CSV de lançamentos em blocos pré-processados
+
+    Args:
+        filepath (str | Path): Caminho do arquivo CSV
+        chunksize (int): Número de linhas por bloco
+
+    Yields:
+        pandas.DataFrame: Bloco pré-processado
+    """
+    # Colunas de texto sempre como object: em blocos pequenos uma coluna pode vir
+    # toda vazia e seria inferida como float; category não compensa em blocos
+    # descartáveis, cujas categorias mudariam de um bloco para outro
+    reader = pd.read_csv(
+        filepath,
+        delimiter=',',
+        encoding='utf-8',
+        chunksize=chunksize,
+        dtype=get_csv_dtypes(categorical=False),
+    )
+    with reader:
+        for chunk in reader:
+            yield preprocess_financial_data(apply_ledger_schema(chunk))
+
+def iter_ledger_chunks(year, chunksize=STREAM_CHUNKSIZE, months=None):
+    """
+    Lê os dados do ano em blocos, aplicando a cada um o pré-processamento padrão
+
+    O CSV é lido diretamente (sem o cache Parquet), com no máximo `chunksize`
+    linhas em memória por vez. Cada bloco passa pelas mesmas regras de
+    preprocess_financial_data (conversão de Valor, datas e GASTOS).
+
+    Args:
+        year (int): Ano dos dados
+        chunksize (int): Número de linhas por bloco
+        months (list, optional): Meses necessários (ver load_data)
+
+    Yields:
+        pandas.DataFrame: Bloco pré-processado
+    """
+    for partition in get_partitions(year, months):
+        yield from iter_file_chunks(partition.path, chunksize)
+
+def calculate_financial_metrics_streaming(year, chunksize=STREAM_CHUNKSIZE, months=None):
+    """
+    Calcula as métricas de calculate_financial_metrics lendo o arquivo em blocos
+
+    Indicado para arquivos grandes demais para a memória: o pico de memória é
+    proporcional a `chunksize`, não ao tamanho do arquivo.
+
+    Args:
+        year (int): Ano dos dados
+        chunksize (int): Número de linhas por bloco
+        months (list, optional): Meses necessários (ver load_data)
+
+    Returns:
+        dict: Dicionário com métricas financeiras
+    """
+    accumulator = FinancialMetricsAccumulator()
+    for chunk in iter_ledger_chunks(year, chunksize, months):
+        accumulator.update(chunk)
+    return accumulator.result()
+
+def get_streamed_metrics(year, months=None):
+    """
+    Métricas de calculate_financial_metrics_streaming, memorizadas enquanto os
+    arquivos do ano não mudam
+
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+
+    Returns:
+        dict: Dicionário com métricas financeiras
+    """
+    return cached_per_files(
+        _streamed_metrics, year, months,
+        lambda: calculate_financial_metrics_streaming(year, months=months)
+    )
@@ -8,7 +8,10 @@ from pathlib import Path
 
 # Adiciona o diretório pai ao path para importar o módulo config
 sys.path.append(str(Path(__file__).parent.parent))
-from config import COLORS, DEFAULT_CURRENCY
+from config import COLORS, DEFAULT_CURRENCY, MONEY_AS_CENTAVOS, TABLE_PAGE_SIZES
+from utils.money import MONEY_COLUMNS, to_reais
+from utils.tables import page_count, page_rows
+from utils.export import EXPORT_FORMATS, export_bytes
 
 def set_page_config():
     """
@@ -77,6 +80,9 @@ def format_currency(value, precision=2):
     """
     Formata um valor como moeda (R$)
     
+    O valor está na representação interna (centavos com MONEY_AS_CENTAVOS)
+    e é convertido para reais aqui.
+    
     Args:
         value (float): Valor a ser formatado
         precision (int): Número de casas decimais
@@ -85,7 +91,7 @@ def format_currency(value, precision=2):
         str: Valor formatado como moeda
     """
     try:
-        value_float = float(value)
+        value_float = float(to_reais(value))
         return f"{DEFAULT_CURRENCY} {value_float:,.{precision}f}".replace(',', 'X').replace('.', ',').replace('X', '.')
     except (ValueError, TypeError):
         return f"{DEFAULT_CURRENCY} 0,00"
@@ -107,10 +113,128 @@ def format_percentage(value, precision=2):
     except (ValueError, TypeError):
         return "0,00%"
 
+def _as_float_array(values, convert=None):
+    """
+    Valores como float64 e a máscara dos que puderam ser convertidos
+
+    Arrays numéricos são convertidos de uma vez; arrays de objetos, valor a
+    valor, com a mesma regra de format_currency/format_percentage (float()).
+    """
+    array = np.asarray(values)
+    if array.dtype.kind in 'biuf':
+        converted = convert(array) if convert is not None else array
+        return np.asarray(converted, dtype=float), np.ones(array.shape, dtype=bool)
+
+    floats = np.zeros(array.size)
+    valid = np.zeros(array.size, dtype=bool)
+    for i, value in enumerate(array.ravel()):
+        try:
+            floats[i] = float(convert(value) if convert is not None else value)
+            valid[i] = True
+        except (ValueError, TypeError):
+            pass
+    return floats.reshape(array.shape), valid.reshape(array.shape)
+
+def _group_thousands(integers):
+    """Inteiros não negativos como texto, com '.' a cada três dígitos"""
+    text = integers.astype(str)
+    width = max(text.dtype.itemsize // 4, 1)
+    n_groups = (width - 1) // 3
+    if n_groups == 0:
+        return text
+
+    # Matriz de caracteres alinhada à direita; cada dígito vai para a sua
+    # posição no texto agrupado, e os separadores entram entre os grupos
+    chars = np.char.rjust(text, width).view(np.uint32).reshape(len(text), width)
+    out_width = width + n_groups
+    grouped = np.full((len(text), out_width), ord(' '), dtype=np.uint32)
+    from_right = np.arange(width - 1, -1, -1)
+    grouped[:, out_width - 1 - from_right - from_right // 3] = chars
+    digits = np.char.str_len(text)
+    for group in range(1, n_groups + 1):
+        grouped[digits > 3 * group, out_width - 4 * group] = ord('.')
+    return np.char.lstrip(grouped.view(f'<U{out_width}').ravel())
+
+def _format_fixed(values, precision, grouping):
+    """
+    Textos de f"{v:,.{precision}f}" (ou sem ',' se grouping=False) já no
+    padrão brasileiro ('.' nos milhares e ',' nos decimais)
+
+    O arredondamento é feito em inteiros (unidades da última casa decimal).
+    Valores a um passo de float64 do meio entre duas casas, ou grandes demais
+    para a conta ser exata, são formatados pelo Python, que decide o
+    arredondamento pelo valor exato; assim o texto é sempre igual ao da
+    formatação valor a valor.
+    """
+    if values.size == 0:
+        return np.empty(0, dtype=object)
+    scale = 10 ** precision
+    magnitude = np.abs(values) * scale
+    finite = np.isfinite(values)
+    with np.errstate(invalid='ignore'):
+        fraction = magnitude - np.floor(magnitude)
+    exact = finite & (magnitude < 2.0 ** 52) & (np.abs(fraction - 0.5) > magnitude * 4e-16)
+    units = np.where(exact, np.rint(magnitude), 0).astype(np.int64)
+
+    integer = _group_thousands(units // scale) if grouping else (units // scale).astype(str)
+    text = np.char.add(np.where(np.signbit(values), '-', ''), integer)
+    if precision > 0:
+        text = np.char.add(np.char.add(text, ','), np.char.zfill((units % scale).astype(str), precision))
+    text = text.astype(object)
+
+    spec = f"{',' if grouping else ''}.{precision}f"
+    for i in np.flatnonzero(~exact):
+        text[i] = format(float(values[i]), spec).replace(',', 'X').replace('.', ',').replace('X', '.')
+    return text
+
+def format_currency_array(values, precision=2):
+    """
+    Formata vários valores como moeda (R$) de uma vez
+
+    Versão vetorizada de format_currency, para colunas e tabelas inteiras:
+    o texto de cada valor é o mesmo de format_currency.
+
+    Args:
+        values (array-like): Valores na representação interna (Series, array
+            1-D ou 2-D, lista)
+        precision (int): Número de casas decimais
+
+    Returns:
+        numpy.ndarray: Textos (dtype object), no mesmo formato de `values`
+    """
+    floats, valid = _as_float_array(values, to_reais)
+    text = _format_fixed(floats.ravel(), precision, grouping=True)
+    text = np.char.add(f"{DEFAULT_CURRENCY} ", text.astype(str)).astype(object)
+    text[~valid.ravel()] = f"{DEFAULT_CURRENCY} 0,00"
+    return text.reshape(floats.shape)
+
+def format_percentage_array(values, precision=2):
+    """
+    Formata vários valores como percentual de uma vez
+
+    Versão vetorizada de format_percentage: o texto de cada valor é o mesmo
+    de format_percentage.
+
+    Args:
+        values (array-like): Valores (Series, array 1-D ou 2-D, lista)
+        precision (int): Número de casas decimais
+
+    Returns:
+        numpy.ndarray: Textos (dtype object), no mesmo formato de `values`
+    """
+    floats, valid = _as_float_array(values)
+    text = _format_fixed(floats.ravel(), precision, grouping=False)
+    text = np.char.add(text.astype(str), '%').astype(object)
+    text[~valid.ravel()] = "0,00%"
+    return text.reshape(floats.shape)
+
 def format_table_currency(df, columns):
     """
     Formata colunas de um DataFrame como moeda
     
+    O DataFrame recebido não é alterado; as colunas não formatadas são
+    compartilhadas com ele (copy-on-write).
+    
     Args:
         df (pandas.DataFrame): DataFrame a ser formatado
         columns (list): Lista de colunas a serem formatadas
@@ -118,14 +242,106 @@ def format_table_currency(df, columns):
     Returns:
         pandas.DataFrame: DataFrame formatado
     """
-    df_styled = df.copy()
+    df_styled = df.copy(deep=False)
     
     for col in columns:
         if col in df_styled.columns:
-            df_styled[col] = df_styled[col].apply(lambda x: format_currency(x))
+            df_styled[col] = format_currency_array(df_styled[col])
     
     return df_styled
 
+def paginated_table(df, index, columns, positions=None, money_columns=(), formatters=None,
+                    column_config=None, key="tabela", search_label="Buscar:", page_sizes=TABLE_PAGE_SIZES):
+    """
+    Exibe uma tabela grande página por página
+    
+    A ordenação e a busca vêm do índice pré-calculado (ver tables.TableIndex);
+    só as linhas da página exibida são copiadas, formatadas e enviadas ao
+    navegador. A máscara da última busca fica no st.session_state da sessão,
+    de modo que trocar de página não refaz a busca.
+    
+    Args:
+        df (pandas.DataFrame): Tabela completa (não é alterada)
+        index (TableIndex): Ordem e busca das linhas de `df`
+        columns (list): Colunas a exibir
+        positions (numpy.ndarray, optional): Posições selecionadas pelos filtros
+        money_columns (list): Colunas formatadas como moeda
+        formatters (dict, optional): Funções de formatação por coluna, aplicadas
+            a cada valor da página
+        column_config (dict, optional): Configuração das colunas do st.dataframe
+        key (str): Prefixo das chaves dos widgets
+        search_label (str): Rótulo do campo de busca
+        page_sizes (list): Opções de linhas por página
+        
+    Returns:
+        numpy.ndarray: Posições de todas as linhas selecionadas (filtros e
+            busca), na ordem da tabela
+    """
+    search_mask = None
+    if index.searchable:
+        search = st.text_input(search_label, key=f"{key}_busca")
+        # (índice, texto, máscara) da última busca desta tabela nesta sessão
+        last_index, last_search, search_mask = st.session_state.get(f"{key}_busca_mascara", (None, None, None))
+        if last_index is not index or last_search != search:
+            search_mask = index.search_mask(search)
+            st.session_state[f"{key}_busca_mascara"] = (index, search, search_mask)
+    rows = index.rows(positions, search_mask=search_mask)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Linhas por página", page_sizes, key=f"{key}_tamanho")
+    n_pages = page_count(len(rows), page_size)
+    # Filtros e buscas podem reduzir o número de páginas abaixo da página atual
+    if st.session_state.get(f"{key}_pagina", 1) > n_pages:
+        st.session_state[f"{key}_pagina"] = n_pages
+    with col2:
+        page = st.number_input("Página", min_value=1, max_value=n_pages, step=1, key=f"{key}_pagina")
+    
+    df_page = format_table_currency(df.iloc[page_rows(rows, int(page), page_size)][columns], money_columns)
+    if formatters:
+        df_page = df_page.assign(**{col: df_page[col].map(func) for col, func in formatters.items() if col in columns})
+    st.dataframe(
+        df_page,
+        column_config=column_config,
+        use_container_width=True
+    )
+    
+    if len(rows) == 0:
+        st.caption("Nenhuma linha encontrada.")
+    else:
+        start = (int(page) - 1) * page_size
+        st.caption(
+            f"Exibindo {start + 1}–{start + len(df_page)} de {len(rows)} linhas "
+            f"(página {int(page)} de {n_pages})"
+        )
+    return rows
+
+def export_button(data, file_stem, key="exportar", label="📥 Exportar"):
+    """
+    Botão de download com escolha de formato (CSV, Parquet ou Excel)
+    
+    O arquivo só é gerado quando o botão é clicado, a partir dos dados
+    numéricos (ver utils.export); as execuções da página não montam nada.
+    
+    Args:
+        data (callable): Função sem argumentos que retorna o DataFrame a exportar
+        file_stem (str): Nome do arquivo, sem extensão
+        key (str): Prefixo das chaves dos widgets
+        label (str): Rótulo do botão
+    """
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        fmt = st.selectbox("Formato", list(EXPORT_FORMATS), key=f"{key}_formato", label_visibility="collapsed")
+    extension, mime = EXPORT_FORMATS[fmt]
+    with col2:
+        st.download_button(
+            label,
+            lambda: export_bytes(data(), fmt),
+            f"{file_stem}.{extension}",
+            mime,
+            key=f"{key}_download"
+        )
+
 def create_metric_card(label, value, delta=None, is_currency=False, is_percentage=False, delta_sign=True, suffix=""):
     """
     Creates a metric card with formatted values
@@ -156,6 +372,25 @@ def create_metric_card(label, value, delta=None, is_currency=False, is_percentag
         
     st.metric(label, formatted_value, delta_text)
 
+def money_for_display(df, *columns):
+    """
+    Converte para reais as colunas monetárias (MONEY_COLUMNS) de um gráfico
+    
+    Args:
+        df (pandas.DataFrame): DataFrame com os dados do gráfico
+        *columns: Colunas usadas no gráfico
+        
+    Returns:
+        pandas.DataFrame: O próprio DataFrame, ou uma cópia rasa com as colunas
+            monetárias convertidas (ver utils.money.to_reais)
+    """
+    if not MONEY_AS_CENTAVOS:
+        return df
+    money = [col for col in columns if isinstance(col, str) and col in MONEY_COLUMNS and col in df.columns]
+    if not money:
+        return df
+    return df.assign(**{col: to_reais(df[col]) for col in money})
+
 def plot_bar_chart(df, x, y, title="", color=None, color_discrete_map=None, text_auto=True, **kwargs):
     """
     Cria um gráfico de barras usando Plotly
@@ -173,7 +408,7 @@ def plot_bar_chart(df, x, y, title="", color=None, color_discrete_map=None, text
         plotly.graph_objects.Figure: Figura do Plotly
     """
     fig = px.bar(
-        df, 
+        money_for_display(df, y), 
         x=x, 
         y=y, 
         title=title,
@@ -210,7 +445,7 @@ def plot_pie_chart(df, values, names, title="", color_discrete_map=None, **kwarg
         plotly.graph_objects.Figure: Figura do Plotly
     """
     fig = px.pie(
-        df, 
+        money_for_display(df, values), 
         values=values, 
         names=names, 
         title=title,
@@ -254,7 +489,7 @@ def plot_line_chart(df, x, y, title="", color=None, color_discrete_map=None, mar
         plotly.graph_objects.Figure: Figura do Plotly
     """
     fig = px.line(
-        df, 
+        money_for_display(df, y), 
         x=x, 
         y=y, 
         title=title,
@@ -0,0 +1,148 @@
+import pandas as pd
+import numpy as np
+
+class TableIndex:
+    """
+    Ordem e busca pré-calculadas das linhas de uma tabela grande
+
+    A tabela é ordenada uma única vez (guardando só as posições das linhas) e
+    a coluna de busca é fatorada em textos distintos. Recortes, buscas e
+    páginas viram seleções de posições: apenas as linhas da página exibida
+    são copiadas e formatadas.
+    """
+
+    def __init__(self, df, sort_by, ascending=True, search_column=None):
+        """
+        Args:
+            df (pandas.DataFrame): Tabela completa
+            sort_by (str): Coluna de ordenação
+            ascending (bool): Ordem crescente; valores ausentes ficam no fim
+            search_column (str, optional): Coluna de texto para a busca
+        """
+        self.n_rows = len(df)
+        # O índice da série ordenada são as posições (iloc) das linhas
+        self.order = (
+            df[sort_by].reset_index(drop=True)
+            .sort_values(ascending=ascending, kind='stable', na_position='last')
+            .index.to_numpy()
+        )
+
+        self.searchable = search_column is not None and search_column in df.columns
+        if self.searchable:
+            codes, uniques = pd.factorize(df[search_column])
+            self._search_codes = codes
+            self._search_texts = pd.Series(np.asarray(uniques, dtype=object)).astype(str)
+
+    def search_mask(self, text):
+        """
+        Máscara das linhas cuja coluna de busca contém `text` (sem diferenciar maiúsculas)
+
+        O índice é compartilhado entre sessões e não guarda buscas; quem quiser
+        reaproveitar a máscara entre execuções a guarda (ver
+        styling.paginated_table).
+
+        Args:
+            text (str): Texto a buscar
+
+        Returns:
+            numpy.ndarray | None: Máscara booleana das linhas, ou None se o
+                texto for vazio ou a tabela não tiver coluna de busca
+        """
+        text = (text or "").strip()
+        if not text or not self.searchable:
+            return None
+        # Cada texto distinto é testado uma vez; o código -1 (ausente) aponta para o False final
+        matched = self._search_texts.str.contains(text, case=False, regex=False).to_numpy(dtype=bool)
+        return np.append(matched, False)[self._search_codes]
+
+    def rows(self, positions=None, search=None, search_mask=None):
+        """
+        Posições das linhas a exibir, já ordenadas
+
+        Args:
+            positions (numpy.ndarray, optional): Posições selecionadas pelos
+                filtros; por padrão, todas
+            search (str, optional): Texto a buscar na coluna de busca
+            search_mask (numpy.ndarray, optional): Máscara de search_mask já
+                calculada, usada no lugar de `search`
+
+        Returns:
+            numpy.ndarray: Posições (iloc) na ordem da tabela
+        """
+        if positions is None:
+            keep = None
+        else:
+            keep = np.zeros(self.n_rows, dtype=bool)
+            keep[positions] = True
+        if search_mask is None:
+            search_mask = self.search_mask(search)
+        if search_mask is not None:
+            keep = search_mask if keep is None else keep & search_mask
+        return self.order if keep is None else self.order[keep[self.order]]
+
+def page_count(n_rows, page_size):
+    """Número de páginas para `n_rows` linhas (ao menos uma)"""
+    return max(1, -(-n_rows // page_size))
+
+def page_rows(rows, page, page_size):
+    """
+    Posições das linhas de uma página
+
+    Args:
+        rows (numpy.ndarray): Posições ordenadas (ver TableIndex.rows)
+        page (int): Página, a partir de 1
+        page_size (int): Linhas por página
+
+    Returns:
+        numpy.ndarray: Posições da página
+    """
+    start = (page - 1) * page_size
+    return rows[start:start + page_size]
+
+def top_positions(values, n, largest=True):
+    """
+    Posições dos n maiores (ou menores) valores, em ordem
+
+    Usa seleção parcial (np.argpartition): só os n escolhidos são ordenados,
+    em tempo proporcional ao número de valores e não ao custo de ordenar
+    todos. Valores ausentes (NaN) ficam de fora.
+
+    Args:
+        values (array-like): Valores a classificar
+        n (int): Quantidade de posições
+        largest (bool): True para os maiores, False para os menores
+
+    Returns:
+        numpy.ndarray: Posições, do primeiro ao n-ésimo colocado
+    """
+    values = np.asarray(values, dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    keys = -values[valid] if largest else values[valid]
+    if 0 < n < len(valid):
+        chosen = np.argpartition(keys, n - 1)[:n]
+    else:
+        chosen = np.arange(len(valid) if n > 0 else 0)
+    return valid[chosen[np.argsort(keys[chosen], kind='stable')]]
+
+def with_others(df, positions, label_column, value_column, label="Outros"):
+    """
+    Linhas escolhidas de uma tabela mais uma linha com a soma das demais
+
+    Args:
+        df (pandas.DataFrame): Tabela com uma linha por item
+        positions (numpy.ndarray): Posições (iloc) das linhas a manter
+        label_column (str): Coluna com o nome dos itens
+        value_column (str): Coluna somada na linha das demais
+        label (str): Nome da linha das demais
+
+    Returns:
+        pandas.DataFrame: Colunas label_column e value_column; a linha das
+            demais só aparece se sobrar algum item
+    """
+    kept = df.iloc[positions][[label_column, value_column]]
+    if len(positions) >= len(df):
+        return kept
+    rest = np.ones(len(df), dtype=bool)
+    rest[positions] = False
+    others = pd.DataFrame({label_column: [label], value_column: [np.nansum(df[value_column].to_numpy()[rest])]})
+    return pd.concat([kept.astype({label_column: object}), others], ignore_index=True)
@@ -0,0 +1,315 @@
+import pandas as pd
+import numpy as np
+import sys
+from pathlib import Path
+
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
+sys.path.append(str(Path(__file__).parent.parent))
+from config import CACHE_MAX_ENTRIES
+from utils.cache import LRUCache
+from utils.data_loader import cached_per_version
+from utils.tables import TableIndex
+
+# Séries de veículos por ano, válidas enquanto a versão dos dados não muda
+_vehicle_series = LRUCache(CACHE_MAX_ENTRIES)
+
+def _column(df, name):
+    """Coluna numérica como float64 (toda NaN se a coluna não existir)"""
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return df[name].to_numpy(dtype=float, na_value=np.nan)
+
+def _group_diff(groups, values):
+    """Diferença para o valor anterior do mesmo grupo (NaN no primeiro de cada grupo)"""
+    diff = np.full(len(values), np.nan)
+    if len(values) > 1:
+        diff[1:] = np.where(groups[1:] == groups[:-1], values[1:] - values[:-1], np.nan)
+    return diff
+
+def _ratio(numerator, denominator):
+    """Divisão elemento a elemento, NaN onde o denominador não é positivo"""
+    return np.divide(
+        numerator, denominator,
+        out=np.full(len(numerator), np.nan), where=denominator > 0
+    )
+
+class VehicleTimeSeries:
+    """
+    Séries temporais dos veículos: hodômetro, abastecimentos e custos
+
+    Os lançamentos de veículos são ordenados uma única vez por veículo e data.
+    Os km rodados entre leituras consecutivas do hodômetro e entre
+    abastecimentos saem de diferenças vetorizadas dentro de cada veículo;
+    leituras que voltam (hodômetro trocado ou digitado errado) não somam km.
+    O consumo de cada abastecimento é a distância desde o abastecimento
+    anterior dividida pelos litros colocados (método do tanque cheio).
+
+    Os resumos por veículo, por veículo × mês e por veículo × categoria ficam
+    pré-calculados; os filtros de veículos só escolhem linhas dessas tabelas.
+    """
+
+    def __init__(self, df):
+        """
+        Args:
+            df (pandas.DataFrame): Lançamentos pré-processados (as linhas sem
+                Veículos são ignoradas; KM e Litros são opcionais)
+        """
+        # Colunas disponíveis, para a página decidir o que exibir
+        self.has_vehicles = 'Veículos' in df.columns
+        self.has_km = 'KM' in df.columns
+        self.has_fuel = self.has_km and 'Litros' in df.columns
+        self.has_categories = 'Categoria' in df.columns
+
+        if not self.has_vehicles:
+            df = df.assign(**{'Veículos': np.nan})
+        df = df[df['Veículos'].notna().to_numpy()]
+        codes, uniques = pd.factorize(df['Veículos'])
+        self.vehicles = pd.Index(np.asarray(uniques, dtype=object), name='Veículos')
+        self.integer_money = pd.api.types.is_integer_dtype(df['Valor'])
+
+        if 'Data' in df.columns:
+            dates = df['Data'].to_numpy(dtype='datetime64[ns]')
+        else:
+            dates = np.full(len(df), np.datetime64('NaT', 'ns'))
+        # Datas inválidas (NaT) ficam no fim de cada veículo
+        date_key = np.where(np.isnat(dates), np.iinfo(np.int64).max, dates.view(np.int64))
+        order = np.lexsort((date_key, codes))
+
+        self._vehicle = codes[order]
+        self._date = dates[order]
+        self._km = _column(df, 'KM')[order]
+        self._litros = _column(df, 'Litros')[order]
+        self._valor = np.nan_to_num(_column(df, 'Valor')[order])
+
+        # Km rodados desde a leitura anterior do hodômetro do mesmo veículo
+        readings = np.flatnonzero(~np.isnan(self._km))
+        delta = _group_diff(self._vehicle[readings], self._km[readings])
+        self._km_driven = np.zeros(len(order))
+        self._km_driven[readings] = np.where(delta > 0, delta, 0)
+
+        # Abastecimentos: km desde o abastecimento anterior (com hodômetro) e km/l
+        self._fills = np.flatnonzero(self._litros > 0)
+        measured = self._fills[~np.isnan(self._km[self._fills])]
+        since_fill = _group_diff(self._vehicle[measured], self._km[measured])
+        self._km_since_fill = np.full(len(order), np.nan)
+        self._km_since_fill[measured] = np.where(since_fill > 0, since_fill, np.nan)
+
+        self._summary = self._build_summary()
+        self._build_monthly()
+        self._build_categories(df, order)
+
+        # Tabela de eficiência (veículos com abastecimentos), com a ordem (mais
+        # eficientes primeiro) e a busca por placa pré-calculadas
+        self._efficiency_rows = np.flatnonzero(self._summary['Abastecimentos'].to_numpy() > 0)
+        self.efficiency = self._summary.iloc[self._efficiency_rows][
+            ['Veículos', 'KM', 'Litros', 'Valor_Abastecimentos', 'Eficiencia', 'Custo_por_KM']
+        ].rename(columns={'Valor_Abastecimentos': 'Valor'}).reset_index(drop=True)
+        self.efficiency_index = TableIndex(self.efficiency, 'Eficiencia', ascending=False, search_column='Veículos')
+
+    def _per_vehicle(self, weights, rows=None):
+        """Soma de `weights` por veículo (nas posições `rows`, se informadas)"""
+        vehicle = self._vehicle if rows is None else self._vehicle[rows]
+        return np.bincount(vehicle, weights=weights, minlength=len(self.vehicles))
+
+    def _money(self, values):
+        """Somas de Valor, inteiras quando os valores estão em centavos"""
+        return np.rint(values).astype(np.int64) if self.integer_money else values
+
+    def _build_summary(self):
+        """Resumo por veículo, na ordem de self.vehicles"""
+        fills = self._fills
+        valid = ~np.isnan(self._km_since_fill)
+        summary = pd.DataFrame({
+            'Veículos': self.vehicles,
+            'Valor': self._money(self._per_vehicle(self._valor)),
+            'Lançamentos': np.bincount(self._vehicle, minlength=len(self.vehicles)),
+            'KM': self._per_vehicle(self._km_driven),
+            'Abastecimentos': np.bincount(self._vehicle[fills], minlength=len(self.vehicles)),
+            'Litros': self._per_vehicle(self._litros[fills], fills),
+            'Valor_Abastecimentos': self._money(self._per_vehicle(self._valor[fills], fills)),
+        })
+        # Consumo só com os abastecimentos que têm distância desde o anterior
+        km_medidos = self._per_vehicle(np.where(valid, self._km_since_fill, 0))
+        litros_medidos = self._per_vehicle(np.where(valid, self._litros, 0))
+        summary['Eficiencia'] = _ratio(km_medidos, litros_medidos)
+        summary['Custo_por_KM'] = _ratio(summary['Valor_Abastecimentos'].to_numpy(dtype=float), summary['KM'].to_numpy())
+        return summary
+
+    def _build_monthly(self):
+        """Valor, km rodados e litros por veículo × mês (meses sem data ficam de fora)"""
+        dated = np.flatnonzero(~np.isnat(self._date))
+        months = self._date[dated].astype('datetime64[M]').astype(np.int64)
+        month_codes, self._months = pd.factorize(months, sort=True)
+        n_months = len(self._months)
+
+        combined = self._vehicle[dated] * n_months + month_codes
+        size = len(self.vehicles) * n_months
+        fill = self._litros[dated] > 0
+        shape = (len(self.vehicles), n_months)
+        self._monthly_count = np.bincount(combined, minlength=size).reshape(shape)
+        self._monthly_valor = np.bincount(combined, weights=self._valor[dated], minlength=size).reshape(shape)
+        self._monthly_km = np.bincount(combined, weights=self._km_driven[dated], minlength=size).reshape(shape)
+        self._monthly_litros = np.bincount(
+            combined, weights=np.where(fill, self._litros[dated], 0), minlength=size
+        ).reshape(shape)
+
+    def _build_categories(self, df, order):
+        """Valor por veículo × categoria, sem as medições de hodômetro (Conta 'Medição')"""
+        if self.has_categories:
+            # Nomes de categoria padronizados uma vez por categoria distinta
+            codes, uniques = pd.factorize(df['Categoria'], sort=True)
+            labels = pd.Series(np.asarray(uniques, dtype=object)).str.strip().str.title()
+            label_codes, self._categories = pd.factorize(labels, sort=True)
+            codes = np.where(codes >= 0, np.append(label_codes, -1)[codes], -1)[order]
+        else:
+            codes, self._categories = np.full(len(order), -1), pd.Index([], dtype=object)
+        if 'Conta' in df.columns:
+            codes = np.where((df['Conta'] != 'Medição').to_numpy()[order], codes, -1)
+
+        n_categories = len(self._categories)
+        rows = np.flatnonzero(codes >= 0)
+        combined = self._vehicle[rows] * n_categories + codes[rows]
+        size = len(self.vehicles) * n_categories
+        shape = (len(self.vehicles), n_categories)
+        self._category_count = np.bincount(combined, minlength=size).reshape(shape)
+        self._category_valor = np.bincount(combined, weights=self._valor[rows], minlength=size).reshape(shape)
+
+    def _vehicle_index(self, vehicles):
+        """Posições dos veículos no resumo (None: todos)"""
+        if vehicles is None:
+            return np.arange(len(self.vehicles))
+        index = self.vehicles.get_indexer(list(vehicles))
+        return index[index >= 0]
+
+    def summary(self, vehicles=None):
+        """
+        Resumo por veículo
+
+        Args:
+            vehicles (list, optional): Veículos; por padrão, todos
+
+        Returns:
+            pandas.DataFrame: Uma linha por veículo, com as colunas Veículos,
+                Valor (todos os gastos), Lançamentos, KM (km rodados),
+                Abastecimentos, Litros, Valor_Abastecimentos, Eficiencia (km/l)
+                e Custo_por_KM (gasto com abastecimentos por km rodado)
+        """
+        return self._summary.iloc[self._vehicle_index(vehicles)].reset_index(drop=True)
+
+    def efficiency_positions(self, vehicles=None):
+        """
+        Posições de alguns veículos na tabela de eficiência (self.efficiency)
+
+        Args:
+            vehicles (list, optional): Veículos; None para todos
+
+        Returns:
+            numpy.ndarray | None: Posições (iloc), ou None para todos
+        """
+        if vehicles is None:
+            return None
+        return np.flatnonzero(np.isin(self._efficiency_rows, self._vehicle_index(vehicles)))
+
+    def metrics(self, vehicles=None):
+        """
+        Métricas gerais da frota
+
+        Args:
+            vehicles (list, optional): Veículos; por padrão, todos
+
+        Returns:
+            dict: total_gasto, gasto_medio (por veículo), km_total e
+                custo_por_km (todos os gastos por km rodado, 0 sem km)
+        """
+        summary = self._summary.iloc[self._vehicle_index(vehicles)]
+        total = summary['Valor'].sum()
+        km_total = summary['KM'].sum()
+        return {
+            'total_gasto': total,
+            'gasto_medio': summary['Valor'].mean(),
+            'km_total': km_total,
+            'custo_por_km': total / km_total if km_total > 0 else 0,
+        }
+
+    def monthly(self, vehicles=None):
+        """
+        Gastos, km rodados e litros por mês
+
+        Args:
+            vehicles (list, optional): Veículos; por padrão, todos
+
+        Returns:
+            pandas.DataFrame: Colunas Mês ("2024-01"), Valor, KM, Litros e
+                Custo_por_KM, apenas dos meses com lançamentos
+        """
+        index = self._vehicle_index(vehicles)
+        present = self._monthly_count[index].sum(axis=0) > 0
+        valor = self._money(self._monthly_valor[index].sum(axis=0))[present]
+        km = self._monthly_km[index].sum(axis=0)[present]
+        return pd.DataFrame({
+            'Mês': np.datetime_as_string(self._months[present].astype('datetime64[M]'), unit='M'),
+            'Valor': valor,
+            'KM': km,
+            'Litros': self._monthly_litros[index].sum(axis=0)[present],
+            'Custo_por_KM': np.nan_to_num(_ratio(valor.astype(float), km)),
+        })
+
+    def by_category(self, vehicles=None):
+        """
+        Gastos por categoria, sem as medições de hodômetro
+
+        Args:
+            vehicles (list, optional): Veículos; por padrão, todos
+
+        Returns:
+            pandas.DataFrame: Colunas Categoria (nome padronizado) e Valor,
+                do maior para o menor valor, apenas das categorias com lançamentos
+        """
+        index = self._vehicle_index(vehicles)
+        present = self._category_count[index].sum(axis=0) > 0
+        return pd.DataFrame({
+            'Categoria': np.asarray(self._categories, dtype=object)[present],
+            'Valor': self._money(self._category_valor[index].sum(axis=0))[present],
+        }).sort_values('Valor', ascending=False, kind='stable', ignore_index=True)
+
+    def fills(self, vehicles=None):
+        """
+        Abastecimentos com a distância desde o anterior e o consumo
+
+        Args:
+            vehicles (list, optional): Veículos; por padrão, todos
+
+        Returns:
+            pandas.DataFrame: Colunas Veículos, Data, KM, Litros, Valor,
+                KM_Percorridos e KM_por_Litro, por veículo e data (NaN no
+                primeiro abastecimento de cada veículo ou sem hodômetro)
+        """
+        rows = self._fills
+        if vehicles is not None:
+            rows = rows[np.isin(self._vehicle[rows], self._vehicle_index(vehicles))]
+        return pd.DataFrame({
+            'Veículos': self.vehicles[self._vehicle[rows]],
+            'Data': self._date[rows],
+            'KM': self._km[rows],
+            'Litros': self._litros[rows],
+            'Valor': self._money(self._valor[rows]),
+            'KM_Percorridos': self._km_since_fill[rows],
+            'KM_por_Litro': self._km_since_fill[rows] / self._litros[rows],
+        })
+
+def get_vehicle_series(year, months=None):
+    """
+    Retorna as séries dos veículos do ano (ver VehicleTimeSeries)
+
+    A ordenação e os resumos são feitos uma vez por versão dos dados (ver
+    data_loader.get_ledger_version) e reaproveitados em todas as execuções
+    da página.
+
+    Args:
+        year (int): Ano dos dados
+        months (list, optional): Meses necessários (ver load_data)
+
+    Returns:
+        VehicleTimeSeries: Séries dos veículos do ano
+    """
+    return cached_per_version(_vehicle_series, year, months, VehicleTimeSeries)
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils import audit, cards, catalog, comparison, cube, data_loader, streaming, vehicles
+from utils.benchmark import generate_synthetic_ledger
+from utils.cache import LRUCache
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Diretório de dados vazio, usado no lugar de DATA_PATH pelo catálogo"""
+    monkeypatch.setattr(catalog, "_catalog", catalog.DataCatalog([tmp_path], refresh_seconds=0))
+    # Nenhum ano fica em memória de um teste para outro
+    for module in (data_loader, streaming, cube, comparison, cards, audit, vehicles):
+        for value in vars(module).values():
+            if isinstance(value, LRUCache):
+                value.clear()
+    return tmp_path
+
+
+@pytest.fixture
+def ledger_years(data_dir):
+    """Arquivos lgd2023.csv e lgd2024.csv sintéticos no diretório de dados"""
+    for year, n_rows in ((2023, 1500), (2024, 2000)):
+        generate_synthetic_ledger(data_dir / f"lgd{year}.csv", n_rows, year=year, seed=year)
+    return [2023, 2024]
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils.audit import (
+    CardAuditEngine, GroupedQuantileSketch, RunningGroupStats, SKETCH_RELATIVE_ACCURACY,
+)
+
+
+def _card_frame(n_rows, seed=0):
+    """Lançamentos de cartão com poucos funcionários por categoria e alguns valores altos"""
+    rng = np.random.default_rng(seed)
+    valores = rng.lognormal(5, 0.6, n_rows)
+    valores[rng.random(n_rows) < 0.02] *= 20
+    return pd.DataFrame({
+        'Usuário': rng.choice([f"Funcionário {i}" for i in range(12)], n_rows),
+        'Categoria': rng.choice(['Viagem', 'Alimentação', 'Software', 'Hotel'], n_rows),
+        'Valor': valores.round(2),
+    })
+
+
+def test_sketch_medianas_dentro_do_erro_relativo():
+    rng = np.random.default_rng(1)
+    groups = np.repeat(np.arange(5), 2001)
+    values = rng.lognormal(np.repeat(np.arange(5), 2001), 1.0)
+    values[groups == 4] *= -1
+
+    sketch = GroupedQuantileSketch()
+    for part in np.array_split(np.arange(len(values)), 3):
+        sketch.add(groups[part], values[part])
+    median, mad = sketch.median_mad(np.arange(5))
+
+    for group in range(5):
+        exact = np.quantile(values[groups == group], 0.5)
+        assert abs(median[group] - exact) <= SKETCH_RELATIVE_ACCURACY * abs(exact)
+        exact_mad = np.quantile(np.abs(values[groups == group] - exact), 0.5)
+        assert abs(mad[group] - exact_mad) <= 3 * SKETCH_RELATIVE_ACCURACY * abs(exact)
+
+
+def test_estatisticas_em_lotes_iguais_ao_lote_unico():
+    rng = np.random.default_rng(2)
+    groups = rng.integers(0, 7, 5000)
+    values = rng.normal(100, 30, 5000)
+
+    stats = RunningGroupStats()
+    for part in np.array_split(np.arange(len(values)), 9):
+        stats.update(groups[part], values[part], groups[part].max() + 1)
+
+    for group in range(7):
+        batch = values[groups == group]
+        assert stats.count[group] == len(batch)
+        np.testing.assert_allclose(stats.mean[group], batch.mean(), rtol=1e-12)
+        np.testing.assert_allclose(stats.m2[group] / (stats.count[group] - 1), batch.var(ddof=1), rtol=1e-10)
+
+
+def test_auditoria_incremental_igual_a_recarga_completa():
+    df = _card_frame(3000)
+    full = CardAuditEngine()
+    full.update(df)
+    assert len(full.positions)
+
+    # Cortes que deixam pares abaixo de MIN_HISTORY no primeiro lote
+    for cuts in ([5], [40, 41, 2000], [400, 1500, 2999]):
+        engine = CardAuditEngine()
+        for start, end in zip([0] + cuts, cuts + [len(df)]):
+            engine.update(df.iloc[start:end])
+        np.testing.assert_array_equal(engine.positions, full.positions)
+        np.testing.assert_allclose(engine.limits, full.limits, rtol=1e-9)
+
+
+def test_auditoria_sem_categoria():
+    df = _card_frame(500).drop(columns='Categoria')
+    engine = CardAuditEngine()
+    engine.update(df)
+    assert engine.rows == 500
+    assert np.all(df['Valor'].to_numpy()[engine.positions] > engine.limits)
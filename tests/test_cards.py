@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils.audit import CardAuditEngine, get_card_audit
+from utils.benchmark import generate_synthetic_ledger
+from utils.cards import CARD_COLUMNS, get_card_spend, get_card_transactions
+from utils.data_loader import load_processed_data, peek_processed_data
+
+
+def _append_rows(path, n_rows, seed):
+    """Acrescenta lançamentos sintéticos ao fim de um CSV existente"""
+    extra = generate_synthetic_ledger(path.with_name("extra.csv"), n_rows, year=2024, seed=seed)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(extra.read_text(encoding="utf-8").split("\n", 1)[1])
+    extra.unlink()
+
+
+def test_recorte_sem_carregar_o_ano(ledger_years):
+    df_cartoes = get_card_transactions(2024)
+    # Só as colunas projetadas foram lidas; o ano não foi carregado
+    assert peek_processed_data(2024) is None
+    assert get_card_transactions(2024) is df_cartoes
+
+    df = load_processed_data(2024)
+    esperado = df.loc[df['Cartão'], CARD_COLUMNS].reset_index(drop=True)
+    assert len(df_cartoes) == len(esperado) > 0
+    pd.testing.assert_frame_equal(
+        df_cartoes.astype(object), esperado.astype(object), check_dtype=False
+    )
+
+
+def test_matriz_de_gastos_igual_aos_lancamentos(ledger_years):
+    df_cartoes = get_card_transactions(2023)
+    selection = get_card_spend(2023).select()
+    assert selection.total() == pytest.approx(df_cartoes['Valor'].sum())
+    esperado = df_cartoes.groupby('Usuário', observed=True)['Valor'].sum()
+    assert selection.by_user().to_dict() == pytest.approx(esperado.to_dict())
+    assert get_card_spend(2023) is get_card_spend(2023)
+
+
+def test_auditoria_apos_acrescimo_igual_a_recarga(data_dir, ledger_years):
+    path = data_dir / "lgd2024.csv"
+    antes = get_card_transactions(2024)
+    get_card_audit(2024)
+
+    _append_rows(path, 300, seed=7)
+    depois = get_card_transactions(2024)
+    assert depois is not antes and len(depois) > len(antes)
+    positions, limits = get_card_audit(2024)
+
+    engine = CardAuditEngine()
+    engine.update(depois)
+    np.testing.assert_array_equal(positions, engine.positions)
+    np.testing.assert_allclose(limits, engine.limits)
@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from config import EXPENSE_TYPES
+from utils.comparison import get_year_comparison
+from utils.data_loader import load_processed_data
+from utils.preprocessing import calculate_financial_metrics
+
+
+def test_comparativo_igual_as_metricas_de_cada_ano(ledger_years):
+    comparison = get_year_comparison(ledger_years)
+    totals = comparison.total_expenses()
+    table = comparison.expense_table().set_index('Métrica')
+
+    for year in ledger_years:
+        metrics = calculate_financial_metrics(load_processed_data(year))
+        assert totals[year] == pytest.approx(metrics['total_despesas'])
+        for tipo in EXPENSE_TYPES:
+            chave = tipo.lower().replace(" ", "_")
+            assert table.loc[f"Despesas {tipo}", str(year)] == pytest.approx(metrics[f'total_{chave}'])
+            assert table.loc[f"% {tipo}", str(year)] == pytest.approx(metrics[f'percentual_{chave}'])
+
+
+def test_somas_por_mes_e_categoria(ledger_years):
+    comparison = get_year_comparison(ledger_years)
+    for year in ledger_years:
+        df = load_processed_data(year)
+        by_month = comparison.by_month().set_index(['Ano', 'Mes'])['Valor'].loc[year]
+        assert by_month.to_dict() == pytest.approx(df.groupby('Mes')['Valor'].sum().to_dict())
+
+    categorias = comparison.categories[:2]
+    selected = comparison.by_category(categorias)
+    assert set(selected['Categoria']) == set(categorias)
+    esperado = sum(
+        df.loc[df['Categoria'].isin(categorias), 'Valor'].sum()
+        for df in (load_processed_data(year) for year in ledger_years)
+    )
+    assert np.isclose(selected['Valor'].sum(), esperado)
+
+
+def test_comparativo_memorizado(ledger_years):
+    assert get_year_comparison(ledger_years) is get_year_comparison(ledger_years)
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from config import EXPENSE_TYPES
+from utils.cube import LedgerCube, get_cube
+from utils.data_loader import load_processed_data
+from utils.preprocessing import calculate_financial_metrics
+
+
+def test_totais_do_cubo_iguais_as_metricas(ledger_years):
+    for year in ledger_years:
+        cube = get_cube(year)
+        df = load_processed_data(year)
+        metrics = calculate_financial_metrics(df)
+        assert cube.sum(measure='Lancamentos') == len(df)
+        assert cube.sum(where={'GASTOS': list(EXPENSE_TYPES)}) == pytest.approx(metrics['total_despesas'])
+        for tipo, valor in cube.sum(by='GASTOS', where={'GASTOS': list(EXPENSE_TYPES)}).items():
+            assert valor == pytest.approx(metrics[f'total_{tipo.lower().replace(" ", "_")}'])
+        por_mes = cube.sum(by='Mes', where={'GASTOS': list(EXPENSE_TYPES)})
+        assert por_mes.to_dict() == pytest.approx(metrics['despesas_por_mes'])
+
+
+def test_cubo_de_varios_anos_soma_os_anos(ledger_years):
+    combined = get_cube(ledger_years)
+    by_year = combined.sum(by='Ano')
+    for year in ledger_years:
+        assert by_year[year] == pytest.approx(get_cube(year).sum())
+    # Memorizado: a mesma chamada devolve o mesmo cubo
+    assert get_cube(ledger_years) is combined
+
+
+def test_anos_sem_dados_sao_omitidos(ledger_years):
+    combined = get_cube(ledger_years + [1999])
+    assert sorted(combined.sum(by='Ano').index) == ledger_years
+    with pytest.raises(ValueError):
+        get_cube([1998, 1999])
+
+
+def test_combine_igual_ao_cubo_do_todo(ledger_years):
+    df = load_processed_data(ledger_years[1])
+    whole = LedgerCube.from_frame(df)
+    parts = LedgerCube.from_frame(df.iloc[:700]).combine(LedgerCube.from_frame(df.iloc[700:]))
+    by = ['Mes', 'GASTOS', 'Conta']
+    assert parts.sum(by=by).sort_index().to_dict() == pytest.approx(whole.sum(by=by).sort_index().to_dict())
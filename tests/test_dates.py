@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from config import MONTHS
+from utils.dates import derive_date_columns, parse_dates
+
+
+def test_parse_dates_igual_ao_pandas():
+    series = pd.Series(
+        ['2024-01-31', '2024-02-29', None, 'data inválida', '2024-01-31', '2024-03-05 14:30:00', '2024-13-01'],
+        index=range(10, 17), name='Data',
+    )
+    result = parse_dates(series)
+    esperado = pd.to_datetime(series, format='mixed', errors='coerce')
+    assert result.index.equals(series.index) and result.name == 'Data'
+    assert result.dtype == 'datetime64[ns]'
+    pd.testing.assert_series_equal(result, esperado.astype('datetime64[ns]'))
+
+
+def test_colunas_derivadas_iguais_ao_dt():
+    dates = pd.Series(pd.to_datetime(['2024-12-01', '2023-01-15', None, '2024-02-10', '2023-01-20']))
+    columns = derive_date_columns(dates)
+
+    np.testing.assert_array_equal(columns['Mes'], dates.dt.month)
+    np.testing.assert_array_equal(columns['Ano'], dates.dt.year)
+    assert columns['Mes_Nome'].cat.categories.tolist() == MONTHS
+    assert columns['Mes_Nome'].tolist()[:2] == [MONTHS[11], MONTHS[0]]
+    # Períodos em ordem cronológica, não alfabética
+    assert columns['Mês Ano'].cat.categories.tolist() == [
+        f"{MONTHS[0]} 2023", f"{MONTHS[1]} 2024", f"{MONTHS[11]} 2024"
+    ]
+    assert pd.isna(columns['Mês Ano'].iloc[2])
+
+
+def test_datas_validas_tem_mes_inteiro():
+    dates = pd.Series(pd.to_datetime(['2024-05-01', '2024-06-01']))
+    assert derive_date_columns(dates)['Mes'].dtype.kind == 'i'
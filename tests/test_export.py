@@ -0,0 +1,71 @@
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils import money
+from utils.export import EXPORT_FORMATS, export_bytes
+
+
+def _frame():
+    """Tabela com ausentes no começo de colunas de texto e de números"""
+    n = 25
+    return pd.DataFrame({
+        'Data': pd.date_range('2024-01-01', periods=n, freq='D'),
+        'Categoria': pd.Categorical(np.where(np.arange(n) % 2, 'Viagem', 'Hotel')),
+        'Valor': np.arange(n) * 1.25,
+        'KM': pd.Series([None] * 12 + [float(i) for i in range(13)], dtype=object),
+        'Observação': pd.Series([None] * 12 + [f"nota {i}" for i in range(13)], dtype=object),
+    })
+
+
+def _read_back(content, fmt):
+    buffer = io.BytesIO(content)
+    if fmt == "CSV":
+        return pd.read_csv(buffer)
+    if fmt == "Parquet":
+        return pd.read_parquet(buffer)
+    return pd.read_excel(buffer, sheet_name="Dados")
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_exportacao_ida_e_volta(fmt):
+    df = _frame()
+    result = _read_back(export_bytes(df, fmt, chunksize=5), fmt)
+
+    assert list(result.columns) == list(df.columns)
+    assert len(result) == len(df)
+    np.testing.assert_allclose(result['Valor'], df['Valor'])
+    np.testing.assert_allclose(result['KM'].astype(float), df['KM'].astype(float))
+    assert result['Observação'].where(result['Observação'].notna(), None).tolist() == df['Observação'].tolist()
+    assert result['Categoria'].astype(str).tolist() == df['Categoria'].astype(str).tolist()
+    assert pd.to_datetime(result['Data']).tolist() == df['Data'].tolist()
+
+
+@pytest.mark.skipif("Parquet" not in EXPORT_FORMATS, reason="pyarrow não instalado")
+def test_parquet_com_tipos_do_dataframe_inteiro():
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(io.BytesIO(export_bytes(_frame(), "Parquet", chunksize=5)))
+    assert schema.field('KM').type == pa.float64()
+    assert schema.field('Observação').type == pa.string()
+
+
+def test_valores_em_centavos_exportados_em_reais(monkeypatch):
+    monkeypatch.setattr(money, "MONEY_AS_CENTAVOS", True)
+    df = pd.DataFrame({'Valor': np.array([123456, -1000, 5], dtype=np.int64)})
+    result = _read_back(export_bytes(df, "CSV", chunksize=2), "CSV")
+    assert result['Valor'].tolist() == [1234.56, -10.0, 0.05]
+
+
+def test_tabela_vazia():
+    df = _frame().iloc[:0]
+    for fmt in EXPORT_FORMATS:
+        result = _read_back(export_bytes(df, fmt), fmt)
+        assert list(result.columns) == list(df.columns) and result.empty
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils.benchmark import generate_synthetic_ledger
+from utils.data_loader import get_ledger_version, load_processed_data, read_ledger
+from utils.ingest import is_append, read_appended_rows, read_csv_snapshot
+from utils.preprocessing import preprocess_financial_data
+
+
+def _append_rows(path, n_rows, seed):
+    """Acrescenta lançamentos sintéticos (sem cabeçalho) ao fim de um CSV"""
+    extra = generate_synthetic_ledger(path.with_name("extra.csv"), n_rows, seed=seed)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(extra.read_text(encoding="utf-8").split("\n", 1)[1])
+    extra.unlink()
+
+
+def _same_values(left, right):
+    pd.testing.assert_frame_equal(
+        left.reset_index(drop=True).astype(object), right.reset_index(drop=True).astype(object)
+    )
+
+
+def test_linhas_acrescentadas_iguais_a_releitura(tmp_path):
+    path = generate_synthetic_ledger(tmp_path / "lgd2024.csv", 500)
+    df, state = read_csv_snapshot(path)
+    assert state.rows == 500
+
+    _append_rows(path, 120, seed=1)
+    size = path.stat().st_size
+    assert is_append(path, state, size)
+    tail, new_state = read_appended_rows(path, state, size, path.stat().st_mtime_ns)
+    assert len(tail) == 120 and new_state.rows == 620 and new_state.offset == size
+
+    full, _ = read_csv_snapshot(path)
+    _same_values(pd.concat([df.astype(object), tail.astype(object)]), full)
+
+
+def test_linha_incompleta_fica_para_depois(tmp_path):
+    path = generate_synthetic_ledger(tmp_path / "lgd2024.csv", 50)
+    _, state = read_csv_snapshot(path)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("2024-03-01,\"R$ 1,00\",Fixo")
+    tail, new_state = read_appended_rows(path, state, path.stat().st_size, path.stat().st_mtime_ns)
+    assert tail is None and new_state == state
+
+
+def test_reescrita_nao_e_acrescimo(tmp_path):
+    path = generate_synthetic_ledger(tmp_path / "lgd2024.csv", 50)
+    _, state = read_csv_snapshot(path)
+    text = path.read_text(encoding="utf-8")
+    path.write_text(text.replace("Lançamento 0", "Lançamento X") + text.split("\n", 1)[1], encoding="utf-8")
+    assert not is_append(path, state, path.stat().st_size)
+
+
+def test_ano_acrescentado_igual_a_recarga_completa(data_dir):
+    path = generate_synthetic_ledger(data_dir / "lgd2024.csv", 800)
+    antes = load_processed_data(2024)
+    versao = get_ledger_version(2024)
+
+    _append_rows(path, 200, seed=3)
+    depois = load_processed_data(2024)
+    assert len(depois) == len(antes) + 200
+    # Mesma geração: só as linhas novas foram lidas
+    assert get_ledger_version(2024).generation == versao.generation
+
+    completo = preprocess_financial_data(read_ledger(path, use_cache=False))
+    _same_values(depois, completo)
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils import money
+from utils.money import parse_brl
+
+
+def test_formatos_documentados():
+    series = pd.Series(["R$ 1.234,56", "1234,56", "-R$ 10,00", "(10,00)", "R$\xa05,00", "7"])
+    assert parse_brl(series).tolist() == [1234.56, 1234.56, -10.0, -10.0, 5.0, 7.0]
+    assert parse_brl(series, centavos=True).tolist() == [123456, 123456, -1000, -1000, 500, 700]
+
+
+def test_vazios_e_invalidos_viram_zero():
+    series = pd.Series(["", "   ", None, np.nan, "abc", "1,2,3"], dtype=object)
+    assert parse_brl(series).tolist() == [0.0] * 6
+    assert parse_brl(series, centavos=True).tolist() == [0] * 6
+
+
+def test_mais_de_duas_casas():
+    series = pd.Series(["1,234", "1,235", "-1,235", "0,005"])
+    # Em reais as casas são mantidas, como na conversão por float
+    assert parse_brl(series).tolist() == [1.234, 1.235, -1.235, 0.005]
+    # Em centavos o valor é arredondado (metade para cima, em módulo)
+    assert parse_brl(series, centavos=True).tolist() == [123, 124, -124, 1]
+
+
+def test_reais_iguais_a_conversao_por_float():
+    rng = np.random.default_rng(0)
+    centavos = rng.integers(0, 10**12, 5000)
+    text = [f"{c // 100:,}".replace(",", ".") + f",{c % 100:02d}" for c in centavos]
+    esperado = [float(t.replace(".", "").replace(",", ".")) for t in text]
+    assert parse_brl(pd.Series(text)).tolist() == esperado
+    assert parse_brl(pd.Series(text), centavos=True).tolist() == centavos.tolist()
+
+
+def test_valores_longos():
+    series = pd.Series(["12.345.678.901.234.567,89", "-12345678901234567"])
+    assert parse_brl(series).tolist() == [12345678901234567.89, -12345678901234567.0]
+    assert parse_brl(series, centavos=True).tolist() == [1234567890123456789, -1234567890123456700]
+
+
+def test_valor_fora_de_int64_em_centavos():
+    series = pd.Series(["R$ 99.999.999.999.999.999.999,99", "1,00"])
+    assert parse_brl(series).iloc[0] == pytest.approx(1e20)
+    with pytest.raises(OverflowError):
+        parse_brl(series, centavos=True)
+
+
+def test_texto_longo_nao_alarga_os_lotes(monkeypatch):
+    monkeypatch.setattr(money, "_BATCH_CHARS", 64)
+    widths = []
+    original = money._parse_unique_values
+
+    def spy(values, centavos=False):
+        widths.append(np.asarray(values, dtype=str).dtype.itemsize // 4)
+        return original(values, centavos)
+
+    monkeypatch.setattr(money, "_parse_unique_values", spy)
+    series = pd.Series([f"{i},00" for i in range(100)] + ["x" * 5000])
+    result = parse_brl(series, centavos=True)
+    assert result.tolist() == [i * 100 for i in range(100)] + [0]
+    # Só o lote do texto longo tem a largura dele
+    assert sorted(widths)[-2] <= 5 and max(widths) == 5000
+
+
+def test_entrada_categorica():
+    series = pd.Series(["R$ 1,00", "(2,50)", None, "R$ 1,00"], dtype="category", index=[10, 11, 12, 13])
+    result = parse_brl(series, centavos=True)
+    assert result.tolist() == [100, -250, 0, 100]
+    assert result.index.tolist() == [10, 11, 12, 13]
@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils.preprocessing import classify_gastos, _normalize_gastos
+
+
+def test_classify_gastos_primeiro_tipo_vence():
+    # Valores com mais de um tipo ficam com o primeiro de EXPENSE_TYPES
+    assert classify_gastos("Fixo / Variável") == "Fixo"
+    assert classify_gastos("Investimento fixo") == "Fixo"
+    assert classify_gastos("variável") == "Variável"
+    assert classify_gastos("Outro") == "Outro"
+
+
+def test_normalize_gastos_por_valor_distinto():
+    series = pd.Series(["Fixo / Variável", None, "Investimento fixo", "Fixo / Variável"])
+    result = _normalize_gastos(series)
+    assert result.iloc[[0, 2, 3]].tolist() == ["Fixo", "Fixo", "Fixo"]
+    assert pd.isna(result.iloc[1])
@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils.benchmark import generate_synthetic_ledger
+from utils.data_loader import load_processed_data, peek_processed_data
+from utils.query import scan
+
+
+def _same_values(left, right):
+    pd.testing.assert_frame_equal(
+        left.reset_index(drop=True).astype(object), right.reset_index(drop=True).astype(object)
+    )
+
+
+def _expected(years, mask, columns):
+    frames = [load_processed_data(year) for year in years]
+    return pd.concat([df.loc[mask(df), columns] for df in frames], ignore_index=True)
+
+
+def test_consulta_projetada_igual_ao_filtro_em_memoria(ledger_years):
+    usuarios = ['Funcionário 01', 'Funcionário 02']
+    query = scan(ledger_years).filter({'Usuário': usuarios}, Mes=[3, 4]).select('Data', 'Valor', 'Usuário')
+    result = query.collect()
+    # Lida dos arquivos, só com as colunas necessárias
+    assert peek_processed_data(2023) is None and peek_processed_data(2024) is None
+    assert list(result.columns) == ['Data', 'Valor', 'Usuário']
+
+    esperado = _expected(
+        ledger_years, lambda df: df['Usuário'].isin(usuarios) & df['Mes'].isin([3, 4]), ['Data', 'Valor', 'Usuário']
+    )
+    _same_values(result, esperado)
+    # Com os anos já em memória, a mesma consulta dá o mesmo resultado
+    _same_values(query.collect(), esperado)
+
+
+def test_filtro_de_ano_e_agrupamento(ledger_years):
+    query = scan().filter(Ano=2024, Cartão=True)
+    assert query.years == (2024,)
+    sums = query.groupby('Mes').sum()
+    df = load_processed_data(2024)
+    esperado = df[df['Cartão']].groupby('Mes')['Valor'].sum()
+    assert sums.to_dict() == pytest.approx(esperado.to_dict())
+    assert query.groupby('Mes').size().to_dict() == df[df['Cartão']].groupby('Mes').size().to_dict()
+
+
+def test_filtro_por_funcao_e_meses_sem_intersecao(ledger_years):
+    result = scan(2023).filter(Valor=lambda valores: valores > 1000).select('Valor').collect()
+    assert (result['Valor'] > 1000).all()
+    assert len(result) == (load_processed_data(2023)['Valor'] > 1000).sum()
+    assert scan(2023, months=[1]).filter(Mes=[2]).collect().empty
+
+
+def test_particoes_mensais(data_dir):
+    for month in (1, 2):
+        generate_synthetic_ledger(data_dir / f"lgd2025-{month:02d}.csv", 300, year=2025, seed=month)
+    fevereiro = scan(2025).filter(Mes=[2]).select('Valor', 'Mes').collect()
+    # Só a partição de fevereiro é lida; seus lançamentos de outros meses são filtrados
+    todos = pd.read_csv(data_dir / "lgd2025-02.csv")
+    assert len(fevereiro) == (pd.to_datetime(todos['Data']).dt.month == 2).sum()
+    assert (fevereiro['Mes'] == 2).all()
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils.schema import LEDGER_SCHEMA, read_ledger_columns, read_ledger_csv
+
+CSV = """Data,Valor,Tipo,Categoria,Conta,GASTOS,Usuário,Veículos,KM,Litros,Descrição
+2024-01-05,"R$ 1.234,56",Fixo,Aluguel,Itaú,Fixo,Ana,,,,Aluguel janeiro
+2024-01-06,"(10,00)",Variável,Combustível,4321,variável,Bruno,ABC0001,"12000",40.5,Posto
+2024-02-01,,,,,,,,abc,,
+"""
+
+
+def test_esquema_aplicado(tmp_path):
+    path = tmp_path / "lgd2024.csv"
+    path.write_text(CSV, encoding="utf-8")
+    df = read_ledger_csv(path)
+
+    assert read_ledger_columns(path) == list(LEDGER_SCHEMA)
+    assert df['Data'].dtype == 'datetime64[ns]'
+    assert df['Valor'].tolist() == [1234.56, -10.0, 0.0]
+    for col, kind in LEDGER_SCHEMA.items():
+        if kind == 'category':
+            assert isinstance(df[col].dtype, pd.CategoricalDtype), col
+    assert df['Descrição'].dtype == object
+    assert df['KM'].tolist()[1] == 12000.0 and pd.isna(df['KM'].iloc[2])
+
+
+def test_valor_inteiro_e_em_reais(tmp_path):
+    path = tmp_path / "lgd2024.csv"
+    path.write_text("Data,Valor\n2024-01-01,15\n2024-01-02,7\n", encoding="utf-8")
+    assert read_ledger_csv(path)['Valor'].tolist() == [15.0, 7.0]
+
+
+def test_sem_category(tmp_path):
+    path = tmp_path / "lgd2024.csv"
+    path.write_text(CSV, encoding="utf-8")
+    df = read_ledger_csv(path, categorical=False, usecols=['Data', 'Conta', 'Valor'])
+    assert set(df.columns) == {'Data', 'Conta', 'Valor'}
+    assert df['Conta'].dtype == object
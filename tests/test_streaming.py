@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils.data_loader import load_processed_data
+from utils.preprocessing import calculate_financial_metrics
+from utils.streaming import calculate_financial_metrics_streaming, iter_ledger_chunks, should_stream
+
+
+def _assert_same_metrics(left, right):
+    assert left.keys() == right.keys()
+    for key, value in right.items():
+        # Valores e dicionários (por mês, por categoria) comparados com tolerância
+        assert left[key] == pytest.approx(value), key
+
+
+def test_metricas_em_blocos_iguais_as_em_memoria(ledger_years):
+    for year in ledger_years:
+        streamed = calculate_financial_metrics_streaming(year, chunksize=333)
+        _assert_same_metrics(streamed, calculate_financial_metrics(load_processed_data(year)))
+
+
+def test_blocos_cobrem_o_arquivo(ledger_years):
+    chunks = list(iter_ledger_chunks(2024, chunksize=700))
+    assert [len(chunk) for chunk in chunks] == [700, 700, 600]
+    assert sum(chunk['Valor'].sum() for chunk in chunks) == pytest.approx(load_processed_data(2024)['Valor'].sum())
+
+
+def test_so_anos_grandes_fora_da_memoria(ledger_years):
+    assert should_stream(2023, min_bytes=1)
+    assert not should_stream(2023, min_bytes=1 << 40)
+    assert not should_stream(2023, min_bytes=0)
+    load_processed_data(2023)
+    # Já em memória: os dados carregados são usados
+    assert not should_stream(2023, min_bytes=1)
@@ -0,0 +1,61 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils.tables import TableIndex, page_count, page_rows, top_positions, with_others
+
+
+def _table():
+    return pd.DataFrame({
+        'Data': pd.to_datetime(['2024-03-01', '2024-01-15', None, '2024-02-10', '2024-01-15']),
+        'Descrição': ['Hotel Centro', 'Pedágio', 'hotel praia', None, 'Posto'],
+    })
+
+
+def test_ordem_e_busca_iguais_ao_pandas():
+    df = _table()
+    index = TableIndex(df, 'Data', ascending=False, search_column='Descrição')
+    esperado = df.reset_index(drop=True).sort_values('Data', ascending=False, kind='stable').index
+    assert index.rows().tolist() == esperado.tolist()
+    assert index.rows(search='HOTEL').tolist() == [0, 2]
+    assert index.rows(positions=np.array([1, 2, 3]), search='hotel').tolist() == [2]
+    assert index.rows(search='  ').tolist() == index.rows().tolist()
+
+
+def test_busca_sem_estado_compartilhado():
+    df = pd.DataFrame({'Data': range(2000), 'Descrição': [f"item {i % 50}" for i in range(2000)]})
+    index = TableIndex(df, 'Data', search_column='Descrição')
+
+    def search(text):
+        return text, index.rows(search=text)
+
+    textos = [f"item {i}" for i in range(50)] * 4
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for text, rows in executor.map(search, textos):
+            assert (df['Descrição'].iloc[rows].str.contains(text, regex=False)).all()
+            assert len(rows) == df['Descrição'].str.contains(text, regex=False).sum()
+
+    mask = index.search_mask('item 7')
+    assert index.rows(search_mask=mask).tolist() == index.rows(search='item 7').tolist()
+    assert not hasattr(index, '_last_search')
+
+
+def test_paginas():
+    rows = np.arange(23)
+    assert page_count(23, 10) == 3 and page_count(0, 10) == 1
+    assert page_rows(rows, 3, 10).tolist() == [20, 21, 22]
+
+
+def test_maiores_e_outros():
+    df = pd.DataFrame({'Veículos': list('ABCDE'), 'Valor': [5.0, np.nan, 9.0, 1.0, 7.0]})
+    top = top_positions(df['Valor'], 2)
+    assert top.tolist() == [2, 4]
+    assert top_positions(df['Valor'], 2, largest=False).tolist() == [3, 0]
+    resumo = with_others(df, top, 'Veículos', 'Valor')
+    assert resumo['Veículos'].tolist() == ['C', 'E', 'Outros']
+    assert resumo['Valor'].tolist() == [9.0, 7.0, 6.0]
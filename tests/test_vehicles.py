@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adiciona o diretório da aplicação ao path para importar os módulos
+sys.path.append(str(Path(__file__).parent.parent / "app"))
+from utils.data_loader import load_processed_data
+from utils.vehicles import VehicleTimeSeries, get_vehicle_series
+
+
+def _frota():
+    """Dois veículos, lançamentos fora de ordem, hodômetro que volta e uma medição"""
+    return pd.DataFrame({
+        'Veículos': ['AAA', 'AAA', 'BBB', 'AAA', 'AAA', None, 'BBB', 'AAA'],
+        'Data': pd.to_datetime([
+            '2024-01-10', '2024-01-01', '2024-01-05', '2024-02-01', '2024-01-20',
+            '2024-01-03', '2024-02-10', '2024-02-15',
+        ]),
+        'KM': [1500, 1000, 500, 2000, 1800, np.nan, 900, 1900],
+        'Litros': [np.nan, 40.0, 30.0, 50.0, np.nan, 10.0, 20.0, np.nan],
+        'Valor': [100.0, 200.0, 150.0, 250.0, 80.0, 999.0, 120.0, 60.0],
+        'Categoria': ['manutenção', 'Combustível', 'combustível ', 'Combustível', 'Pneus', 'Outros', 'Combustível', 'Medição'],
+        'Conta': ['Itaú', 'Itaú', '4321', 'Itaú', 'Itaú', 'Itaú', '4321', 'Medição'],
+    })
+
+
+def test_resumo_por_veiculo():
+    series = VehicleTimeSeries(_frota())
+    summary = series.summary().set_index('Veículos')
+
+    assert summary.loc['AAA', 'Valor'] == 690.0 and summary.loc['BBB', 'Valor'] == 270.0
+    # 1000 → 1500 → 1800 → 2000, e a leitura 1900 (volta) não soma
+    assert summary.loc['AAA', 'KM'] == 1000
+    assert summary.loc['AAA', 'Abastecimentos'] == 2 and summary.loc['AAA', 'Litros'] == 90.0
+    # Consumo: 1000 km desde o abastecimento anterior com 50 litros
+    assert summary.loc['AAA', 'Eficiencia'] == pytest.approx(20.0)
+    assert summary.loc['BBB', 'Eficiencia'] == pytest.approx(400 / 20)
+    assert summary.loc['AAA', 'Custo_por_KM'] == pytest.approx(450 / 1000)
+
+
+def test_abastecimentos_e_categorias():
+    series = VehicleTimeSeries(_frota())
+    fills = series.fills(['AAA'])
+    assert fills['Data'].tolist() == list(pd.to_datetime(['2024-01-01', '2024-02-01']))
+    assert np.isnan(fills['KM_Percorridos'].iloc[0]) and fills['KM_Percorridos'].iloc[1] == 1000
+
+    # Nomes padronizados; a medição de hodômetro não entra
+    categorias = series.by_category().set_index('Categoria')['Valor']
+    assert categorias.to_dict() == {'Combustível': 720.0, 'Manutenção': 100.0, 'Pneus': 80.0}
+
+    monthly = series.monthly(['AAA']).set_index('Mês')
+    assert monthly['Valor'].to_dict() == {'2024-01': 380.0, '2024-02': 310.0}
+
+
+def test_series_do_ano_iguais_ao_groupby(ledger_years):
+    df = load_processed_data(2024)
+    series = get_vehicle_series(2024)
+    assert get_vehicle_series(2024) is series
+
+    esperado = df.groupby('Veículos', observed=True)['Valor'].sum()
+    summary = series.summary().set_index('Veículos')['Valor']
+    assert summary.to_dict() == pytest.approx(esperado.to_dict())
+    metrics = series.metrics(['ABC0001', 'ABC0002'])
+    assert metrics['total_gasto'] == pytest.approx(esperado[['ABC0001', 'ABC0002']].sum())